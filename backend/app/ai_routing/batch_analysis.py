@@ -0,0 +1,320 @@
+"""
+Batch AI re-analysis of document routings.
+
+Runs the same extract → classify → deadline pipeline as
+/ai-routing/ai/analyze over many routings at once. Text extraction and
+analysis run in a process pool; the resulting RoutingDeadline and
+RoutingAuditLog rows are written per chunk. AI deadlines are saved with
+app.ai_routing.deadline_store, the same rule as the single endpoint: a
+re-run updates the routing's AI deadline in place instead of adding one,
+and reminders set on it are kept.
+
+CLI:
+    python -m app.ai_routing.batch_analysis --all
+    python -m app.ai_routing.batch_analysis --routing-id ROUTE-1A2B3C4D
+    python -m app.ai_routing.batch_analysis --user-id 7 --ai-flag DATE_MISSING
+    python -m app.ai_routing.batch_analysis --created-from 2026-10-01 --created-to 2026-10-18
+
+--created-from / --created-to are both inclusive days.
+"""
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.ai_routing.models import (
+    DocumentRouting,
+    RoutingAuditLog,
+    AIDecisionFlag,
+    AuditActor,
+    DocumentCategory,
+)
+from app.ai_routing.deadline_store import save_ai_deadlines
+from app.ai_routing.services import (
+    DetectedDeadline,
+    TextAnalysis,
+    analyze_text,
+    calculate_ai_flag,
+    requires_human_review,
+)
+from app.ai_routing.text_extractor import extract_text
+
+logger = logging.getLogger(__name__)
+
+BATCH_WORKERS = int(os.getenv("AI_BATCH_WORKERS", str(os.cpu_count() or 2)))
+BATCH_CHUNK_SIZE = int(os.getenv("AI_BATCH_CHUNK_SIZE", "200"))
+
+
+# =====================================================
+# WORKER (RUNS IN POOL PROCESS — NO DB ACCESS)
+# =====================================================
+def _analyze_file(
+    job: tuple[int, Optional[str], str],
+) -> tuple[int, Optional[TextAnalysis], Optional[str]]:
+    routing_pk, file_path, file_type = job
+
+    if not file_path:
+        return routing_pk, None, "AI file missing, routed to human"
+
+    if not Path(file_path).exists():
+        return routing_pk, None, "AI file not found, routed to human"
+
+    try:
+        text = extract_text(file_path, file_type)
+        return routing_pk, analyze_text(text), None
+    except Exception as e:
+        logger.exception(f"Batch analysis failed: {file_path}")
+        return routing_pk, None, f"AI analysis failed: {e}"
+
+
+# =====================================================
+# SELECTION
+# =====================================================
+def select_routings(
+    db: Session,
+    *,
+    user_id: Optional[int] = None,
+    routing_ids: Optional[List[str]] = None,
+    ai_flag: Optional[AIDecisionFlag] = None,
+    document_category: Optional[DocumentCategory] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    ai_only: bool = True,
+) -> List[int]:
+    query = db.query(DocumentRouting.id)
+
+    if user_id is not None:
+        query = query.filter(DocumentRouting.user_id == user_id)
+    if routing_ids:
+        query = query.filter(DocumentRouting.routing_id.in_(routing_ids))
+    if ai_flag:
+        query = query.filter(DocumentRouting.ai_flag == ai_flag)
+    if document_category:
+        query = query.filter(
+            DocumentRouting.document_category == document_category
+        )
+    if created_from:
+        query = query.filter(DocumentRouting.created_at >= created_from)
+    if created_to:
+        # inclusive: the whole created_to day
+        query = query.filter(
+            DocumentRouting.created_at < created_to + timedelta(days=1)
+        )
+    if ai_only:
+        query = query.filter(DocumentRouting.ai_file_path.isnot(None))
+
+    return [pk for (pk,) in query.order_by(DocumentRouting.id).all()]
+
+
+# =====================================================
+# RE-ANALYSIS
+# =====================================================
+def _chunks(items: List[int], size: int) -> Iterable[List[int]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _apply_results(
+    db: Session,
+    rows: list,
+    results: Iterable[tuple[int, Optional[TextAnalysis], Optional[str]]],
+    summary: Dict[str, int],
+):
+    categories = {row.id: row.document_category for row in rows}
+
+    routing_updates: List[dict] = []
+    best_by_routing: Dict[int, Optional[DetectedDeadline]] = {}
+    audit_rows: List[dict] = []
+
+    for routing_pk, analysis, error in results:
+        if analysis is None:
+            routing_updates.append({
+                "id": routing_pk,
+                "ai_flag": AIDecisionFlag.DATE_MISSING,
+                "confidence": None,
+                "requires_human": True,
+                "document_category": categories.get(routing_pk),
+            })
+            audit_rows.append({
+                "routing_id": routing_pk,
+                "action": "AI_ANALYSIS_SKIPPED",
+                "details": error,
+                "performed_by": AuditActor.AI,
+            })
+            summary["skipped"] += 1
+            continue
+
+        best = analysis["best_deadline"]
+        best_by_routing[routing_pk] = best
+
+        detected_date = best["deadline_date"] if best else None
+        confidence = best["confidence"] if best else None
+
+        routing_updates.append({
+            "id": routing_pk,
+            "ai_flag": calculate_ai_flag(detected_date),
+            "confidence": confidence,
+            "requires_human": requires_human_review(detected_date, confidence),
+            # AI sets the category ONLY if empty — same as the single endpoint
+            "document_category": (
+                categories.get(routing_pk) or analysis["document_category"]
+            ),
+        })
+
+        audit_rows.append({
+            "routing_id": routing_pk,
+            "action": "AI_ANALYSIS_COMPLETED",
+            "details": f"confidence={confidence} (batch)",
+            "performed_by": AuditActor.AI,
+        })
+        summary["analyzed"] += 1
+
+    if routing_updates:
+        db.bulk_update_mappings(DocumentRouting, routing_updates)
+
+    save_ai_deadlines(db, best_by_routing)
+    if audit_rows:
+        db.bulk_insert_mappings(RoutingAuditLog, audit_rows)
+
+    summary["deadlines"] += sum(1 for best in best_by_routing.values() if best)
+
+
+def reanalyze_routings(
+    db: Session,
+    routing_pks: List[int],
+    *,
+    workers: int = BATCH_WORKERS,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Re-run AI analysis for the given DocumentRouting primary keys.
+    Commits once per chunk so a crash only loses the chunk in flight.
+    """
+    summary = {
+        "total": len(routing_pks),
+        "analyzed": 0,
+        "skipped": 0,
+        "deadlines": 0,
+    }
+
+    if not routing_pks:
+        return summary
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        for chunk in _chunks(routing_pks, chunk_size):
+            rows = (
+                db.query(
+                    DocumentRouting.id,
+                    DocumentRouting.ai_file_path,
+                    DocumentRouting.file_type,
+                    DocumentRouting.document_category,
+                )
+                .filter(DocumentRouting.id.in_(chunk))
+                .all()
+            )
+            jobs = [(r.id, r.ai_file_path, r.file_type) for r in rows]
+
+            results = (
+                pool.map(_analyze_file, jobs)
+                if pool
+                else map(_analyze_file, jobs)
+            )
+
+            try:
+                _apply_results(db, rows, results, summary)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            logger.info(
+                "AI batch progress: %s/%s",
+                summary["analyzed"] + summary["skipped"],
+                summary["total"],
+            )
+    finally:
+        if pool:
+            pool.shutdown()
+
+    return summary
+
+
+def run_batch_reanalysis(routing_pks: List[int]) -> Dict[str, int]:
+    """
+    Entry point for background tasks: owns its own session.
+    """
+    db: Session = SessionLocal()
+    try:
+        return reanalyze_routings(db, routing_pks)
+    except Exception:
+        logger.exception("AI batch re-analysis failed")
+        raise
+    finally:
+        db.close()
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Re-run AI analysis for many document routings",
+    )
+    parser.add_argument("--all", action="store_true", help="every AI routing")
+    parser.add_argument("--routing-id", action="append", dest="routing_ids")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--ai-flag", type=AIDecisionFlag)
+    parser.add_argument("--document-category", type=DocumentCategory)
+    parser.add_argument("--created-from", type=date.fromisoformat)
+    parser.add_argument("--created-to", type=date.fromisoformat)
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    has_filter = any([
+        args.routing_ids,
+        args.user_id is not None,
+        args.ai_flag,
+        args.document_category,
+        args.created_from,
+        args.created_to,
+    ])
+    if not args.all and not has_filter:
+        parser.error("pass --all or at least one filter")
+
+    logging.basicConfig(level=logging.INFO)
+
+    db: Session = SessionLocal()
+    try:
+        routing_pks = select_routings(
+            db,
+            user_id=args.user_id,
+            routing_ids=args.routing_ids,
+            ai_flag=args.ai_flag,
+            document_category=args.document_category,
+            created_from=args.created_from,
+            created_to=args.created_to,
+        )
+        summary = reanalyze_routings(
+            db,
+            routing_pks,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        db.close()
+
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
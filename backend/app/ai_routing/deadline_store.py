@@ -0,0 +1,152 @@
+"""
+Persisting AI-detected deadlines.
+
+Re-running AI analysis (the single /ai/analyze endpoint or a batch)
+must not pile up one more AI deadline per run, and must never take a
+user's reminders with it: routing_reminders.deadline_id is ON DELETE
+CASCADE, so deleting a deadline deletes its reminders, their history and
+their outbox rows. The rule, per routing:
+
+    date found     the newest AI deadline (one with reminders first) is
+                   updated in place; reminders on any other AI deadline
+                   are moved onto it; the now-empty extras are deleted;
+                   PENDING history of every reminder on it is re-dated
+    nothing found  AI deadlines without reminders are deleted; ones with
+                   reminders are kept as they are
+
+Human deadlines are never touched.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.ai_routing.models import (
+    ReminderHistory,
+    ReminderStatus,
+    RoutingDeadline,
+    RoutingReminder,
+    RoutingSource,
+)
+from app.ai_routing.reminder_engine import resolve_trigger_date
+from app.ai_routing.reminder_worker import TIMEZONE
+from app.ai_routing.scheduler import notify_reminders_changed
+from app.ai_routing.services import (
+    DetectedDeadline,
+    calculate_ai_flag,
+    calculate_priority,
+)
+
+
+def _redate_reminders(
+    db: Session,
+    deadline: RoutingDeadline,
+    reminders: List[RoutingReminder],
+) -> int:
+    today = datetime.now(TIMEZONE).date()
+
+    for reminder in reminders:
+        trigger_date = resolve_trigger_date(reminder, deadline)
+
+        db.query(ReminderHistory).filter(
+            ReminderHistory.reminder_id == reminder.id,
+            ReminderHistory.status == ReminderStatus.PENDING,
+        ).update(
+            {
+                "submitted_on": deadline.deadline_date,
+                "trigger_date": trigger_date,
+                "days_remaining": max((trigger_date - today).days, 0),
+            },
+            synchronize_session=False,
+        )
+
+    return len(reminders)
+
+
+def save_ai_deadlines(
+    db: Session,
+    best_by_routing: Dict[int, Optional[DetectedDeadline]],
+) -> int:
+    """
+    Apply one analysis result per routing primary key (None = no date
+    found). Flushes but does not commit. Returns how many reminders were
+    re-dated.
+    """
+    if not best_by_routing:
+        return 0
+
+    existing: Dict[int, List[RoutingDeadline]] = defaultdict(list)
+    for deadline in (
+        db.query(RoutingDeadline)
+        .filter(
+            RoutingDeadline.routing_id.in_(list(best_by_routing)),
+            RoutingDeadline.source == RoutingSource.AI,
+        )
+        .order_by(RoutingDeadline.id)
+    ):
+        existing[deadline.routing_id].append(deadline)
+
+    reminders: Dict[int, List[RoutingReminder]] = defaultdict(list)
+    deadline_ids = [d.id for rows in existing.values() for d in rows]
+    if deadline_ids:
+        for reminder in db.query(RoutingReminder).filter(
+            RoutingReminder.deadline_id.in_(deadline_ids)
+        ):
+            reminders[reminder.deadline_id].append(reminder)
+
+    redated = 0
+    to_delete: List[int] = []
+
+    for routing_pk, best in best_by_routing.items():
+        rows = existing.get(routing_pk, [])
+
+        if best is None:
+            to_delete.extend(d.id for d in rows if not reminders.get(d.id))
+            continue
+
+        values = {
+            "label": best["label"],
+            "deadline_date": best["deadline_date"],
+            "confidence": best["confidence"],
+            "priority": calculate_priority(best["deadline_date"]),
+            "ai_flag": calculate_ai_flag(best["deadline_date"]),
+        }
+
+        if not rows:
+            db.add(RoutingDeadline(
+                routing_id=routing_pk,
+                source=RoutingSource.AI,
+                **values,
+            ))
+            continue
+
+        keep = max(rows, key=lambda d: (bool(reminders.get(d.id)), d.id))
+        for field, value in values.items():
+            setattr(keep, field, value)
+
+        kept_reminders = list(reminders.get(keep.id, []))
+        for deadline in rows:
+            if deadline is keep:
+                continue
+            for reminder in reminders.get(deadline.id, []):
+                reminder.deadline_id = keep.id
+                kept_reminders.append(reminder)
+            to_delete.append(deadline.id)
+
+        redated += _redate_reminders(db, keep, kept_reminders)
+
+    # moves are flushed first, so the database-side cascade of this
+    # DELETE finds no reminders (an ORM delete would cascade to the
+    # deadline's reminders collection as loaded before the move)
+    db.flush()
+    if to_delete:
+        db.query(RoutingDeadline).filter(
+            RoutingDeadline.id.in_(to_delete)
+        ).delete(synchronize_session=False)
+
+    if redated:
+        notify_reminders_changed(db)
+
+    return redated
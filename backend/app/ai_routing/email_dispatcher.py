@@ -0,0 +1,242 @@
+"""
+Concurrent reminder email dispatch.
+
+Sends a batch of prepared emails through a bounded thread pool so one
+slow or unreachable mailbox cannot stall the rest of a scheduler tick.
+Transient SMTP failures are retried with exponential backoff and full
+jitter; every attempt is reported back so the caller can persist it.
+An optional wall-clock deadline stops new attempts (and queued jobs)
+once it passes: those come back `deferred` for the caller to re-queue.
+
+No DB access happens here — callers build the jobs inside their session,
+end the transaction, dispatch, then write the outcomes.
+"""
+
+import logging
+import os
+import random
+import smtplib
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, TypedDict
+
+from app.email import SMTP_POOL_SIZE, send_reminder_email
+
+logger = logging.getLogger(__name__)
+
+# default: one sender per pooled SMTP session
+DISPATCH_WORKERS = int(os.getenv("REMINDER_DISPATCH_WORKERS", str(SMTP_POOL_SIZE)))
+DISPATCH_MAX_ATTEMPTS = int(os.getenv("REMINDER_DISPATCH_MAX_ATTEMPTS", "4"))
+DISPATCH_BACKOFF_BASE = float(os.getenv("REMINDER_DISPATCH_BACKOFF_BASE", "2"))
+DISPATCH_BACKOFF_MAX = float(os.getenv("REMINDER_DISPATCH_BACKOFF_MAX", "60"))
+
+
+# =====================================================
+# TYPES
+# =====================================================
+class EmailJob(TypedDict):
+    key: int  # caller's id, e.g. EmailOutbox.id
+    claim: int  # caller's claim token, handed back untouched
+    to: str
+    subject: str
+    text_body: str
+    html_body: Optional[str]
+    attachment_path: Optional[str]
+    attachment_paths: List[str]  # digests: one file per document
+
+
+class DeliveryAttempt(TypedDict):
+    attempt: int
+    success: bool
+    transient: Optional[bool]
+    error: Optional[str]
+    duration_ms: int
+    attempted_at: datetime
+
+
+class DeliveryResult(TypedDict):
+    key: int
+    claim: int
+    success: bool
+    # deadline reached before the message could be (re)tried
+    deferred: bool
+    attempts: List[DeliveryAttempt]
+
+
+def _result(
+    job: EmailJob,
+    success: bool,
+    attempts: List[DeliveryAttempt],
+    deferred: bool = False,
+) -> DeliveryResult:
+    return {
+        "key": job["key"],
+        "claim": job["claim"],
+        "success": success,
+        "deferred": deferred,
+        "attempts": attempts,
+    }
+
+
+# =====================================================
+# FAILURE CLASSIFICATION
+# =====================================================
+def is_transient_error(exc: Exception) -> bool:
+    """
+    True when retrying the same message later may succeed:
+    dropped connections, timeouts and 4xx SMTP replies.
+    Bad addresses, auth failures and 5xx replies are permanent.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+
+    if isinstance(exc, smtplib.SMTPAuthenticationError):
+        return False
+
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+
+    return isinstance(
+        exc,
+        (
+            smtplib.SMTPServerDisconnected,
+            smtplib.SMTPConnectError,
+            socket.timeout,
+            TimeoutError,
+            ConnectionError,
+        ),
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(max, base * 2^(n-1))).
+    """
+    cap = min(DISPATCH_BACKOFF_MAX, DISPATCH_BACKOFF_BASE * 2 ** (attempt - 1))
+    return random.uniform(0, cap)
+
+
+# =====================================================
+# SINGLE MESSAGE (WITH RETRY)
+# =====================================================
+def deliver(
+    job: EmailJob,
+    *,
+    send: Callable[..., None] = send_reminder_email,
+    max_attempts: int = DISPATCH_MAX_ATTEMPTS,
+    sleep: Callable[[float], None] = time.sleep,
+    deadline: Optional[float] = None,  # time.monotonic() value
+) -> DeliveryResult:
+    attempts: List[DeliveryAttempt] = []
+
+    for attempt in range(1, max_attempts + 1):
+        if deadline is not None and time.monotonic() >= deadline:
+            return _result(job, False, attempts, deferred=True)
+
+        attempted_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+
+        try:
+            send(
+                to=job["to"],
+                subject=job["subject"],
+                text_body=job["text_body"],
+                html_body=job["html_body"],
+                attachment_path=job["attachment_path"],
+                attachment_paths=job["attachment_paths"],
+            )
+        except Exception as e:
+            transient = is_transient_error(e)
+            attempts.append({
+                "attempt": attempt,
+                "success": False,
+                "transient": transient,
+                "error": f"{type(e).__name__}: {e}"[:2000],
+                "duration_ms": int((time.monotonic() - started) * 1000),
+                "attempted_at": attempted_at,
+            })
+
+            if not transient or attempt == max_attempts:
+                logger.warning(
+                    "Reminder email %s failed after %s attempt(s): %s",
+                    job["key"], attempt, e,
+                )
+                return _result(job, False, attempts)
+
+            delay = backoff_delay(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                return _result(job, False, attempts, deferred=True)
+
+            sleep(delay)
+            continue
+
+        attempts.append({
+            "attempt": attempt,
+            "success": True,
+            "transient": None,
+            "error": None,
+            "duration_ms": int((time.monotonic() - started) * 1000),
+            "attempted_at": attempted_at,
+        })
+        return _result(job, True, attempts)
+
+    # max_attempts < 1
+    return _result(job, False, attempts)
+
+
+# =====================================================
+# BATCH DISPATCH
+# =====================================================
+def dispatch_emails(
+    jobs: List[EmailJob],
+    *,
+    workers: int = DISPATCH_WORKERS,
+    send: Callable[..., None] = send_reminder_email,
+    max_attempts: int = DISPATCH_MAX_ATTEMPTS,
+    deadline: Optional[float] = None,
+) -> List[DeliveryResult]:
+    """
+    Deliver every job using at most `workers` concurrent senders.
+    Never raises for an individual message; failures are in the results.
+    No attempt starts after `deadline` (a time.monotonic() value).
+    """
+    if not jobs:
+        return []
+
+    results: List[DeliveryResult] = []
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(jobs))),
+        thread_name_prefix="reminder-mail",
+    ) as pool:
+        futures = {
+            pool.submit(
+                deliver,
+                job,
+                send=send,
+                max_attempts=max_attempts,
+                deadline=deadline,
+            ): job
+            for job in jobs
+        }
+
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # deliver() only raises on programming errors
+                logger.exception("Reminder dispatch crashed for %s", job["key"])
+                results.append(_result(job, False, [{
+                    "attempt": 1,
+                    "success": False,
+                    "transient": False,
+                    "error": f"{type(e).__name__}: {e}"[:2000],
+                    "duration_ms": 0,
+                    "attempted_at": datetime.now(timezone.utc),
+                }]))
+
+    return results
@@ -0,0 +1,88 @@
+import re
+from typing import Dict, Generic, Hashable, Iterable, List, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+# inflections matched after any keyword: agreements, taxes, submitted, filing
+KEYWORD_SUFFIXES = ("s", "es", "d", "ed", "ted", "ing")
+
+
+# ===============================
+# KEYWORD AUTOMATON
+# ===============================
+class KeywordAutomaton(Generic[K]):
+    """
+    Whole-word multi-keyword matcher built once from a keyword table.
+
+    All keywords are merged into a prefix trie and compiled into a single
+    regex, so one scan of the text finds every keyword of every key.
+    Matches start on a word boundary ("act" does not hit "contract") and
+    may end in one of KEYWORD_SUFFIXES ("contract" hits "contracts").
+    """
+
+    def __init__(self, table: Dict[K, Iterable[str]]):
+        self.keys: List[K] = list(table)
+        self.lookup: Dict[str, K] = {}
+
+        for key, keywords in table.items():
+            for keyword in keywords:
+                # first table entry wins when a keyword is listed twice
+                self.lookup.setdefault(_normalize(keyword), key)
+
+        first_chars = "".join(sorted({k[0] for k in self.lookup}))
+
+        suffixes = "|".join(sorted(KEYWORD_SUFFIXES, key=len, reverse=True))
+
+        self.pattern = re.compile(
+            r"\b(?=[" + re.escape(first_chars) + r"])"
+            + "(?P<keyword>" + _trie_to_regex(_build_trie(self.lookup)) + ")"
+            + "(?:" + suffixes + r")?\b"
+        )
+
+    def count(self, text: str) -> Dict[K, int]:
+        hits: Dict[K, int] = {key: 0 for key in self.keys}
+
+        if not text:
+            return hits
+
+        for match in self.pattern.finditer(text.lower()):
+            hits[self.lookup[_normalize(match.group("keyword"))]] += 1
+
+        return hits
+
+
+# ===============================
+# TRIE → REGEX
+# ===============================
+def _normalize(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+def _build_trie(keywords: Iterable[str]) -> dict:
+    trie: dict = {}
+
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    return trie
+
+
+def _trie_to_regex(node: dict) -> str:
+    terminal = "" in node
+    branches = [
+        (r"\s+" if ch == " " else re.escape(ch)) + _trie_to_regex(child)
+        for ch, child in sorted(node.items())
+        if ch != ""
+    ]
+
+    if not branches:
+        return ""
+
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+
+    body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if terminal else body
@@ -0,0 +1,148 @@
+"""
+Cluster-wide leader election for the reminder scheduler.
+
+Every app process runs an election job; only the process holding a
+Postgres session-level advisory lock runs reminder jobs. The lock lives
+on a dedicated connection, so if the leader dies its connection closes,
+Postgres drops the lock and the next follower poll (LEADER_POLL_SECONDS,
+well under one scheduler tick) takes over.
+
+The same connection LISTENs on wake-up channels, so any process can
+nudge the current leader with pg_notify.
+"""
+
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# any stable bigint shared by every process of this deployment
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "7262010001"))
+LEADER_POLL_SECONDS = int(os.getenv("LEADER_POLL_SECONDS", "15"))
+REMINDER_WAKE_CHANNEL = "reminder_schedule_changed"
+
+
+# =====================================================
+# ADVISORY-LOCK ELECTOR
+# =====================================================
+class LeaderElector:
+    def __init__(
+        self,
+        bind: Engine,
+        lock_key: int,
+        listen: Sequence[str] = (),
+    ):
+        self.bind = bind
+        self.lock_key = lock_key
+        self.listen = tuple(listen)
+        self._conn: Optional[Connection] = None
+        self._is_leader = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def _drop_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+
+    def poll(self) -> bool:
+        """
+        Try to become leader, or confirm we still are.
+        Called every LEADER_POLL_SECONDS by the scheduler.
+        """
+        with self._lock:
+            # no advisory locks outside Postgres (local sqlite dev):
+            # a single process is the whole cluster
+            if self.bind.dialect.name != "postgresql":
+                self._set_leader(True)
+                return True
+
+            try:
+                if self._is_leader:
+                    # lock is held as long as this connection is alive
+                    self._conn.execute(text("SELECT 1"))
+                    return True
+
+                if self._conn is None:
+                    self._conn = self.bind.connect().execution_options(
+                        isolation_level="AUTOCOMMIT"
+                    )
+
+                acquired = self._conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"),
+                    {"key": self.lock_key},
+                ).scalar()
+
+                if acquired:
+                    for channel in self.listen:
+                        self._conn.execute(text(f'LISTEN "{channel}"'))
+
+                self._set_leader(bool(acquired))
+
+            except Exception:
+                logger.exception("Leader election check failed")
+                self._drop_connection()
+                self._set_leader(False)
+
+            return self._is_leader
+
+    def pop_notifications(self) -> List[str]:
+        """
+        Payloads NOTIFY'd on the listen channels since the last call.
+        Only the leader listens; followers always get [].
+        """
+        with self._lock:
+            if not self._is_leader or self._conn is None:
+                return []
+
+            try:
+                dbapi_conn = self._conn.connection.dbapi_connection
+                dbapi_conn.poll()
+                payloads = [n.payload for n in dbapi_conn.notifies]
+                del dbapi_conn.notifies[:]
+                return payloads
+            except Exception:
+                logger.exception("Reading leader notifications failed")
+                return []
+
+    def resign(self):
+        with self._lock:
+            if self._is_leader and self._conn is not None:
+                try:
+                    self._conn.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": self.lock_key},
+                    )
+                except Exception:
+                    pass
+            self._drop_connection()
+            self._set_leader(False)
+
+    def _set_leader(self, value: bool):
+        if value != self._is_leader:
+            logger.warning(
+                "👑 Scheduler leadership %s (pid=%s)",
+                "acquired" if value else "lost",
+                os.getpid(),
+            )
+        self._is_leader = value
+
+
+elector = LeaderElector(
+    engine,
+    SCHEDULER_LOCK_KEY,
+    listen=(REMINDER_WAKE_CHANNEL,),
+)
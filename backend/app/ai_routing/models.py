@@ -9,12 +9,15 @@ from sqlalchemy import (
     Text,
     Enum,
     Float,
+    Index,
 )
 from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 import enum
 
 from app.database import Base
+from app.audit_partitions import add_default_partition
 
 
 # =====================================================
@@ -90,11 +93,26 @@ class ReminderChannel(str, enum.Enum):
 
 class ReminderStatus(str, enum.Enum):
     PENDING = "PENDING"
+    QUEUED = "QUEUED"  # email written to the outbox, not yet delivered
     SENT = "SENT"
     FAILED = "FAILED"
     SKIPPED = "SKIPPED"
 
 
+class ReminderSkipReason(str, enum.Enum):
+    NO_DEADLINE = "NO_DEADLINE"  # deadline or routing is gone
+    NO_RECIPIENTS = "NO_RECIPIENTS"
+    EXPIRED = "EXPIRED"  # older than the worker's catch-up window
+    DEACTIVATED = "DEACTIVATED"  # reminder switched off by the user
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
 # =====================================================
 # 📌 DOCUMENT ROUTING (MAIN TABLE)
 # =====================================================
@@ -233,7 +251,7 @@ class RoutingEmailRecipient(Base):
 class RoutingAuditLog(Base):
     __tablename__ = "routing_audit_logs"
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     routing_id = Column(
         Integer,
@@ -247,15 +265,25 @@ class RoutingAuditLog(Base):
 
     performed_by = Column(Enum(AuditActor,native_enum=False), nullable=False)
 
+    # partition key: must be part of the table's primary key
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
+        primary_key=True,
+    )
+
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     routing = relationship("DocumentRouting", back_populates="audits")
 
 
+add_default_partition(RoutingAuditLog.__table__)
+
+
 
 # ================= REMINDERS =================
 
@@ -312,9 +340,109 @@ class ReminderHistory(Base):
     days_remaining = Column(Integer)
     status = Column(Enum(ReminderStatus,native_enum=False), nullable=False)
  # PENDING / SENT / FAILED / SKIPPED
+    # why a row is SKIPPED (never sent); null for every other status
+    skip_reason = Column(Enum(ReminderSkipReason, native_enum=False), nullable=True)
     recipient = Column(String(255))
     channel = Column(Enum(ReminderChannel,native_enum=False), nullable=False)
 
 
     routing = relationship("DocumentRouting")
 
+    __table_args__ = (
+        # scheduler tick: PENDING rows due on a given day
+        Index("idx_reminder_history_due", "status", "trigger_date"),
+    )
+
+
+
+# ================= REMINDER DELIVERY ATTEMPTS =================
+
+class ReminderDeliveryAttempt(Base):
+    __tablename__ = "routing_reminder_delivery_attempts"
+
+    id = Column(Integer, primary_key=True)
+
+    history_id = Column(
+        Integer,
+        ForeignKey("routing_reminder_history.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    attempt = Column(Integer, nullable=False)  # 1-based
+    success = Column(Boolean, nullable=False)
+    transient = Column(Boolean, nullable=True)  # only set on failure
+    error = Column(Text, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+
+    attempted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    history = relationship("ReminderHistory", backref="delivery_attempts")
+
+
+# ================= EMAIL OUTBOX =================
+
+class EmailOutbox(Base):
+    """
+    Outgoing mail, written in the same transaction as the state change
+    that caused it and delivered later by the outbox drain worker.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+
+    history_id = Column(
+        Integer,
+        ForeignKey("routing_reminder_history.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    # digest mail: every reminder history row it covers
+    history_ids = Column(ARRAY(Integer), nullable=True)
+
+    recipient = Column(Text, nullable=False)  # comma-separated
+    subject = Column(String(500), nullable=False)
+    text_body = Column(Text, nullable=False)
+    html_body = Column(Text, nullable=True)
+    attachment_path = Column(String, nullable=True)
+    attachment_paths = Column(ARRAY(String), nullable=True)
+
+    status = Column(
+        Enum(OutboxStatus, native_enum=False),
+        default=OutboxStatus.PENDING,
+        nullable=False,
+    )
+    deliveries = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    history = relationship("ReminderHistory")
+
+    __table_args__ = (
+        # drain worker claim: PENDING rows whose next attempt is due
+        Index("idx_email_outbox_claim", "status", "next_attempt_at"),
+    )
+
+
+# ================= SCHEDULER TICKS =================
+
+class SchedulerTick(Base):
+    """
+    One reminder-worker run, whichever process ran it: the cluster-wide
+    record behind /analytics/scheduler-metrics and the health check.
+    """
+    __tablename__ = "scheduler_ticks"
+
+    id = Column(Integer, primary_key=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    duration_ms = Column(Integer, nullable=False)
+    pid = Column(Integer, nullable=False)
+
+    scanned = Column(Integer, nullable=False)
+    queued = Column(Integer, nullable=False)
+    error = Column(Text, nullable=True)  # null = tick succeeded
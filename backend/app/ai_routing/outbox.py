@@ -0,0 +1,336 @@
+"""
+Transactional email outbox.
+
+Producers call enqueue_email() inside the same DB transaction as the
+state change that causes the mail (e.g. ReminderHistory → QUEUED), so a
+crash either keeps both or neither. drain_outbox() then delivers rows in
+batches. Rows are claimed with FOR UPDATE SKIP LOCKED and leased before
+any SMTP traffic, so any number of drain workers can run side by side
+without double-claiming. Delivery is at-least-once: a worker that dies
+after sending but before recording SENT lets the lease expire and the
+row is sent again.
+
+A batch stops starting new SMTP attempts OUTBOX_SEND_BUDGET_SECONDS
+after its claim, well inside the lease, so a slow SMTP server cannot
+push a live batch past it; unsent rows go back to PENDING. Each claim
+bumps `deliveries`, which doubles as the claim token: results are only
+written while the row is still SENDING under the same token, so a
+worker whose lease was taken over cannot overwrite the new owner.
+
+CLI:
+    python -m app.ai_routing.outbox            # drain until empty
+    python -m app.ai_routing.outbox --once     # one batch
+"""
+
+import argparse
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import pytz
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.ai_routing.models import (
+    EmailOutbox,
+    OutboxStatus,
+    ReminderHistory,
+    ReminderStatus,
+    RoutingReminder,
+    ReminderDeliveryAttempt,
+)
+from app.ai_routing.email_dispatcher import (
+    DeliveryResult,
+    EmailJob,
+    backoff_delay,
+    dispatch_emails,
+)
+from app.ai_routing.scheduler_metrics import scheduler_metrics
+
+logger = logging.getLogger(__name__)
+
+TIMEZONE = pytz.timezone("Asia/Kolkata")
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+# no new SMTP attempt after this long; the margin up to the lease covers
+# one attempt already in flight (pool acquire + SMTP timeouts)
+OUTBOX_SEND_BUDGET_SECONDS = int(
+    os.getenv("OUTBOX_SEND_BUDGET_SECONDS", str(max(OUTBOX_LEASE_SECONDS - 120, 30)))
+)
+# drain rounds per row; each round already retries in-process
+OUTBOX_MAX_DELIVERIES = int(os.getenv("OUTBOX_MAX_DELIVERIES", "5"))
+OUTBOX_DRAIN_SECONDS = int(os.getenv("OUTBOX_DRAIN_SECONDS", "10"))
+
+
+# =====================================================
+# PRODUCER
+# =====================================================
+def enqueue_email(
+    db: Session,
+    *,
+    to: str,
+    subject: str,
+    text_body: str,
+    html_body: Optional[str] = None,
+    attachment_path: Optional[str] = None,
+    attachment_paths: Optional[List[str]] = None,
+    history_id: Optional[int] = None,
+    history_ids: Optional[List[int]] = None,
+) -> EmailOutbox:
+    """
+    Add an outbox row to the caller's transaction. Nothing is sent and
+    nothing is committed here.
+    """
+    row = EmailOutbox(
+        history_id=history_id,
+        history_ids=history_ids,
+        recipient=to,
+        subject=subject,
+        text_body=text_body,
+        html_body=html_body,
+        attachment_path=attachment_path,
+        attachment_paths=attachment_paths,
+        status=OutboxStatus.PENDING,
+    )
+    db.add(row)
+    return row
+
+
+# =====================================================
+# CLAIM
+# =====================================================
+def claim_batch(db: Session, limit: int = OUTBOX_BATCH_SIZE) -> List[EmailJob]:
+    """
+    Lease up to `limit` deliverable rows to this worker and commit.
+    Rows locked by another worker's claim are skipped, not waited on.
+    """
+    now = datetime.now(timezone.utc)
+
+    rows = (
+        db.query(EmailOutbox)
+        .filter(
+            or_(
+                and_(
+                    EmailOutbox.status == OutboxStatus.PENDING,
+                    EmailOutbox.next_attempt_at <= now,
+                ),
+                # lease expired: the claiming worker died mid-send
+                and_(
+                    EmailOutbox.status == OutboxStatus.SENDING,
+                    EmailOutbox.locked_until < now,
+                ),
+            )
+        )
+        .order_by(EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    lease = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    jobs: List[EmailJob] = []
+
+    for row in rows:
+        row.status = OutboxStatus.SENDING
+        row.locked_until = lease
+        row.deliveries += 1
+
+        jobs.append({
+            "key": row.id,
+            "claim": row.deliveries,
+            "to": row.recipient,
+            "subject": row.subject,
+            "text_body": row.text_body,
+            "html_body": row.html_body,
+            "attachment_path": row.attachment_path,
+            "attachment_paths": list(row.attachment_paths or []),
+        })
+
+    # releases the row locks; the lease now protects the claim
+    db.commit()
+    return jobs
+
+
+# =====================================================
+# COMPLETE
+# =====================================================
+def _history_ids(row: EmailOutbox) -> List[int]:
+    if row.history_id:
+        return [row.history_id]
+    return list(row.history_ids or [])
+
+
+def apply_delivery_results(
+    db: Session,
+    results: List[DeliveryResult],
+    today: date,
+):
+    """
+    Record each outcome on the outbox row and, for reminder mail, on its
+    ReminderHistory: SENT deactivates the reminder, a permanent failure
+    marks it FAILED. Every SMTP attempt is kept as a delivery attempt row.
+
+    A result is applied only if its claim still owns the row; results
+    for rows re-claimed after their lease expired are dropped.
+    """
+    if not results:
+        return
+
+    now = datetime.now(timezone.utc)
+    rows: Dict[int, EmailOutbox] = {
+        row.id: row
+        for row in db.query(EmailOutbox)
+        .filter(EmailOutbox.id.in_([r["key"] for r in results]))
+        # a concurrent re-claim waits for this check-and-write
+        .with_for_update()
+    }
+
+    sent_history_ids: List[int] = []
+    failed_history_ids: List[int] = []
+    attempt_rows: List[dict] = []
+
+    for result in results:
+        row = rows.get(result["key"])
+        if row is None:
+            continue
+
+        history_ids = _history_ids(row)
+        for history_id in history_ids:
+            for attempt in result["attempts"]:
+                attempt_rows.append({"history_id": history_id, **attempt})
+
+        if row.status != OutboxStatus.SENDING or row.deliveries != result["claim"]:
+            logger.warning(
+                "Outbox row %s was re-claimed after its lease expired; "
+                "dropping the stale result", row.id,
+            )
+            continue
+
+        row.locked_until = None
+
+        if result["success"]:
+            row.status = OutboxStatus.SENT
+            row.sent_at = now
+            row.last_error = None
+            sent_history_ids.extend(history_ids)
+        elif result["deferred"] and not result["attempts"]:
+            # never tried: out of send budget
+            row.status = OutboxStatus.PENDING
+            row.next_attempt_at = now
+        else:
+            last = result["attempts"][-1] if result["attempts"] else None
+            row.last_error = last["error"] if last else None
+
+            retry = result["deferred"] or (last and last["transient"])
+            if retry and row.deliveries < OUTBOX_MAX_DELIVERIES:
+                row.status = OutboxStatus.PENDING
+                row.next_attempt_at = now + timedelta(
+                    seconds=backoff_delay(row.deliveries + 1)
+                )
+            else:
+                row.status = OutboxStatus.FAILED
+                failed_history_ids.extend(history_ids)
+
+    if sent_history_ids:
+        db.query(ReminderHistory).filter(
+            ReminderHistory.id.in_(sent_history_ids)
+        ).update(
+            {"status": ReminderStatus.SENT, "sent_on": today},
+            synchronize_session=False,
+        )
+        db.query(RoutingReminder).filter(
+            RoutingReminder.id.in_(
+                db.query(ReminderHistory.reminder_id)
+                .filter(ReminderHistory.id.in_(sent_history_ids))
+            )
+        ).update({"active": False}, synchronize_session=False)
+
+    if failed_history_ids:
+        db.query(ReminderHistory).filter(
+            ReminderHistory.id.in_(failed_history_ids)
+        ).update(
+            {"status": ReminderStatus.FAILED, "sent_on": today},
+            synchronize_session=False,
+        )
+
+    if attempt_rows:
+        db.bulk_insert_mappings(ReminderDeliveryAttempt, attempt_rows)
+
+
+# =====================================================
+# DRAIN
+# =====================================================
+def drain_once(db: Session, today: date, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    deadline = time.monotonic() + OUTBOX_SEND_BUDGET_SECONDS
+
+    jobs = claim_batch(db, limit)
+    if not jobs:
+        return 0
+
+    results = dispatch_emails(jobs, deadline=deadline)
+
+    apply_delivery_results(db, results, today)
+    db.commit()
+
+    for result in results:
+        if not result["attempts"]:
+            continue
+        scheduler_metrics.record_delivery(
+            success=result["success"],
+            attempt_seconds=[a["duration_ms"] / 1000 for a in result["attempts"]],
+        )
+
+    failed = sum(1 for r in results if not r["success"])
+    if failed:
+        logger.warning("Outbox batch: %s of %s emails failed", failed, len(results))
+
+    return len(jobs)
+
+
+def drain_outbox(max_batches: Optional[int] = None) -> int:
+    """
+    Scheduler / CLI entry point: owns its own session and drains until
+    no claimable rows are left (or max_batches is reached).
+    """
+    db: Session = SessionLocal()
+    today = datetime.now(TIMEZONE).date()
+    delivered = 0
+    batches = 0
+
+    try:
+        while max_batches is None or batches < max_batches:
+            claimed = drain_once(db, today)
+            if not claimed:
+                break
+
+            delivered += claimed
+            batches += 1
+
+    except Exception:
+        logger.exception("Email outbox drain failed")
+        db.rollback()
+
+    finally:
+        db.close()
+
+    return delivered
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Deliver queued outbox emails")
+    parser.add_argument("--once", action="store_true", help="one batch only")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    print({"processed": drain_outbox(max_batches=1 if args.once else None)})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,11 @@
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 
-
-from sqlalchemy.orm import Session
-
 from app.ai_routing.models import (
     RoutingReminder,
     RoutingDeadline,
     ReminderUnit,
     ReminderDirection,
-    ReminderHistory,
-    ReminderStatus,
 )
 
 
@@ -48,36 +43,19 @@ def calculate_trigger_date(
         return base_date + delta
 
 
-def should_trigger_now(
-    *,
+def resolve_trigger_date(
     reminder: RoutingReminder,
     deadline: RoutingDeadline,
-    today: date,
-) -> bool:
+) -> date:
     """
-    Decide whether a reminder should fire (DATE-ONLY).
+    Manual override wins, otherwise deadline ± offset.
     """
+    if reminder.trigger_date_override:
+        return reminder.trigger_date_override
 
-    trigger_date = calculate_trigger_date(
+    return calculate_trigger_date(
         deadline_date=deadline.deadline_date,
         trigger_value=reminder.trigger_value,
         trigger_unit=reminder.trigger_unit,
         direction=reminder.direction,
     )
-
-    return today >= trigger_date
-
-
-def mark_reminder_sent(
-    db: Session,
-    reminder: RoutingReminder,
-    history: ReminderHistory,
-):
-    history.status = ReminderStatus.SENT
-    history.sent_on = date.today()  # ✅ correct column name
-
-    reminder.active = False
-
-    db.add(history)
-    db.add(reminder)
-    db.commit()
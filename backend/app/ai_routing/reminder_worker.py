@@ -1,72 +1,498 @@
-from datetime import datetime, date
+"""
+The reminder worker: the one engine that turns due ReminderHistory rows
+into outbox emails.
+
+Due rows are claimed in chunks with SELECT ... FOR UPDATE SKIP LOCKED
+and each chunk commits its QUEUED status together with its outbox rows.
+Concurrent workers never see each other's claimed rows, so several
+processes can drain a large backlog in parallel. The leader's scheduler
+calls process_reminders() on its own; extra workers can be started by hand.
+
+CLI:
+    python -m app.ai_routing.reminder_worker            # queue due reminders
+    python -m app.ai_routing.reminder_worker --drain    # ... and deliver them
+"""
+
+import argparse
+from datetime import datetime, date, timedelta, timezone
+from collections import defaultdict
+from typing import Dict, List, Optional
+import os
 import pytz
-from sqlalchemy.orm import Session
 
+from sqlalchemy.orm import Session, contains_eager
+import logging
+
+from app.auth.models import User
+from app.database import SessionLocal
+from app.email import public_file_url
 from app.ai_routing.models import (
-    ReminderHistory,
+    DocumentRouting,
     RoutingReminder,
+    ReminderHistory,
+    ReminderSkipReason,
     ReminderStatus,
+    SchedulerTick,
 )
-from app.ai_routing.reminder_sender import send_email
-from app.ai_routing.reminder_engine import mark_reminder_sent
-from app.database import SessionLocal
+from app.ai_routing.outbox import drain_outbox, enqueue_email
+from app.ai_routing.scheduler_metrics import TickTimer
 
+logger = logging.getLogger(__name__)
 
 TIMEZONE = pytz.timezone("Asia/Kolkata")
 
+# due rows claimed per load/queue/commit round
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "200"))
+# missed days (downtime) still delivered on the next run
+REMINDER_CATCHUP_DAYS = int(os.getenv("REMINDER_CATCHUP_DAYS", "7"))
+# one email per recipient set instead of one per reminder
+REMINDER_DIGEST_MODE = os.getenv("REMINDER_DIGEST_MODE", "false") == "true"
+# digest documents: attach | link | none
+REMINDER_DIGEST_ATTACHMENTS = os.getenv("REMINDER_DIGEST_ATTACHMENTS", "link")
+# scheduler_ticks rows older than this are pruned
+SCHEDULER_TICK_RETENTION_DAYS = int(os.getenv("SCHEDULER_TICK_RETENTION_DAYS", "30"))
 
-def process_due_reminders():
-    db: Session = SessionLocal()
-    today = datetime.now(TIMEZONE).date()
 
-    try:
-        histories = (
-            db.query(ReminderHistory)
-            .join(RoutingReminder)
-            .filter(
-                ReminderHistory.status == ReminderStatus.PENDING,
-                ReminderHistory.trigger_date <= today,
-                RoutingReminder.active.is_(True),
-            )
-            .all()
+def _due_window_start(today: date) -> date:
+    return today - timedelta(days=REMINDER_CATCHUP_DAYS)
+
+
+# =====================================================
+# EXPIRED REMINDERS (OUTSIDE THE CATCH-UP WINDOW)
+# =====================================================
+def expire_missed_reminders(db: Session, today: date) -> int:
+    """
+    PENDING rows older than the catch-up window are never loaded again;
+    mark them SKIPPED (reason EXPIRED) in one statement instead of
+    leaving them PENDING forever. Does not commit.
+    """
+    window_start = _due_window_start(today)
+
+    expired = db.query(ReminderHistory).filter(
+        ReminderHistory.status == ReminderStatus.PENDING,
+        ReminderHistory.trigger_date < window_start,
+    ).update(
+        {
+            "status": ReminderStatus.SKIPPED,
+            "skip_reason": ReminderSkipReason.EXPIRED,
+        },
+        synchronize_session=False,
+    )
+
+    if expired:
+        logger.warning(
+            "Skipped %s reminder(s) due before %s: older than the "
+            "%s-day catch-up window (REMINDER_CATCHUP_DAYS), not sent",
+            expired, window_start, REMINDER_CATCHUP_DAYS,
         )
 
-        for history in histories:
-            reminder = history.reminder
-            routing = reminder.routing
-            deadline = reminder.deadline
+    return expired
 
-            subject = f"⏰ Reminder: {routing.document_name}"
 
-            text_body = f"""
-Document: {routing.document_name}
-Deadline: {deadline.deadline_date}
-Days remaining: {history.days_remaining}
-Priority: {deadline.priority}
-Status: {routing.ai_flag}
-"""
+# =====================================================
+# DUE REMINDERS (CLAIMED, SET-BASED LOAD)
+# =====================================================
+def load_due_reminders(
+    db: Session,
+    today,
+    limit: Optional[int] = None,
+    reminder_ids: Optional[List[int]] = None,
+):
+    """
+    Everything a batch needs in a constant number of queries, however
+    many reminders are due (today, or missed within the catch-up window):
+      1. PENDING history + reminder + deadline + routing (joined)
+      2. CC recipients for those routings (selectin)
+      3. owner emails for those routings (one IN query)
+    """
+    query = (
+        # one indexed lookup (status, trigger_date) instead of scanning
+        # every active reminder and recomputing its trigger date
+        db.query(ReminderHistory)
+        .join(
+            RoutingReminder,
+            ReminderHistory.reminder_id == RoutingReminder.id,
+        )
+        .filter(
+            ReminderHistory.status == ReminderStatus.PENDING,
+            ReminderHistory.trigger_date.between(_due_window_start(today), today),
+            RoutingReminder.active.is_(True),
+        )
+    )
+
+    if reminder_ids is not None:
+        query = query.filter(ReminderHistory.reminder_id.in_(reminder_ids))
+
+    query = (
+        query
+        .order_by(ReminderHistory.trigger_date, ReminderHistory.id)
+        .limit(limit)
+        # a concurrent run (scheduler vs. an API request) skips rows
+        # this one is already queueing instead of queueing them twice
+        .with_for_update(of=ReminderHistory, skip_locked=True)
+        .options(
+            contains_eager(ReminderHistory.reminder)
+            .joinedload(RoutingReminder.deadline),
+            contains_eager(ReminderHistory.reminder)
+            .joinedload(RoutingReminder.routing)
+            .selectinload(DocumentRouting.email_recipients),
+        )
+    )
+
+    due_histories = query.all()
+
+    user_ids = {
+        h.reminder.routing.user_id
+        for h in due_histories
+        if h.reminder.routing
+    }
+
+    # columns only: loading User entities would fire its selectin
+    # routing_records relationship for every owner
+    owner_emails = dict(
+        db.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+    ) if user_ids else {}
+
+    return due_histories, owner_emails
+
+
+# =====================================================
+# DIGEST (ONE EMAIL PER RECIPIENT SET)
+# =====================================================
+def _days_label(days: int) -> str:
+    if days < 0:
+        return f"⛔ {-days} day(s) overdue"
+    if days == 0:
+        return "🚨 TODAY"
+    return f"{days} day(s)"
+
+
+def enqueue_digest(db: Session, items: List[dict]):
+    """
+    One outbox email covering every reminder in `items` (all share the
+    same recipients), with a summary table and each document attached,
+    linked, or neither per REMINDER_DIGEST_ATTACHMENTS.
+    """
+    items = sorted(
+        items,
+        key=lambda i: (i["days_to_deadline"], i["routing"].routing_id),
+    )
+    urgent = sum(1 for i in items if i["days_to_deadline"] <= 0)
+
+    subject = f"📋 Reminder digest: {len(items)} deadlines"
+    if urgent:
+        subject += f" ({urgent} due today or overdue)"
+
+    attachment_paths: List[str] = []
+    rows_html = []
+    rows_text = []
+
+    for item in items:
+        routing = item["routing"]
+        deadline = item["deadline"]
+        days = item["days_to_deadline"]
+        color = "red" if days <= 0 else "orange"
+
+        file_cell = "—"
+        if routing.ai_file_path:
+            if REMINDER_DIGEST_ATTACHMENTS == "attach":
+                attachment_paths.append(routing.ai_file_path)
+                file_cell = "attached"
+            elif REMINDER_DIGEST_ATTACHMENTS == "link":
+                url = public_file_url(routing.ai_file_path)
+                if url:
+                    file_cell = f'<a href="{url}">Download</a>'
+
+        rows_html.append(f"""
+            <tr>
+                <td>{routing.routing_id}</td>
+                <td>{routing.document_name}</td>
+                <td>{deadline.deadline_date}</td>
+                <td style="color:{color}">{_days_label(days)}</td>
+                <td>{routing.notes or "—"}</td>
+                <td>{file_cell}</td>
+            </tr>
+            """)
+        rows_text.append(
+            f"- {routing.routing_id} | {routing.document_name} | "
+            f"{deadline.deadline_date} | {_days_label(days)}"
+        )
+
+    html_body = f"""
+    <h3>📋 Upcoming Deadlines</h3>
+    <table border="1" cellpadding="6" cellspacing="0">
+        <tr>
+            <th>Routing ID</th>
+            <th>Document</th>
+            <th>Deadline</th>
+            <th>Days Left</th>
+            <th>Notes</th>
+            <th>File</th>
+        </tr>
+        {"".join(rows_html)}
+    </table>
+    """
+
+    enqueue_email(
+        db,
+        history_ids=[i["history"].id for i in items],
+        to=items[0]["to"],
+        subject=subject,
+        text_body="Upcoming deadlines:\n\n" + "\n".join(rows_text),
+        html_body=html_body,
+        attachment_paths=attachment_paths or None,
+    )
+
+
+# =====================================================
+# CORE REMINDER JOB
+# =====================================================
+def process_reminder_batch(db: Session, due_histories, owner_emails, today) -> int:
+    items: List[dict] = []
+
+    for history in due_histories:
+        reminder = history.reminder
+        deadline = reminder.deadline
+        routing = reminder.routing
 
+        if not deadline or not routing:
+            # don't leave it PENDING: the catch-up query would pick it again
+            history.status = ReminderStatus.SKIPPED
+            history.skip_reason = ReminderSkipReason.NO_DEADLINE
+            continue
+
+        # ===============================
+        # 📧 COLLECT RECIPIENTS (already loaded)
+        # ===============================
+        recipients = []
+
+        owner_email = owner_emails.get(routing.user_id)
+        if owner_email:
+            recipients.append(owner_email)
+
+        recipients.extend([c.email for c in routing.email_recipients])
+
+        recipients = sorted(set(recipients))
+        if not recipients:
+            history.status = ReminderStatus.SKIPPED
+            history.skip_reason = ReminderSkipReason.NO_RECIPIENTS
+            continue
+
+        recipient_str = ", ".join(recipients)
+
+        days_to_deadline = (deadline.deadline_date - today).days
+
+        # ===============================
+        # 📝 NOTES BLOCK
+        # ===============================
+        notes_block = ""
+        if routing.notes:
+            notes_block = f"""
+            <hr>
+            <p><b>Notes:</b></p>
+            <p>{routing.notes}</p>
+            """
+
+        # ===============================
+        # 📧 EMAIL CONTENT
+        # ===============================
+        if days_to_deadline < 0:
+            # delivered late (missed during downtime)
+            subject = f"⛔ OVERDUE: Deadline passed {-days_to_deadline} Days ago – {routing.routing_id}"
             html_body = f"""
-<h2>⏰ Deadline Reminder</h2>
-<p><b>Document:</b> {routing.document_name}</p>
-<p><b>Deadline:</b> {deadline.deadline_date}</p>
-<p><b>Days Remaining:</b> {history.days_remaining}</p>
-<p><b>Priority:</b> {deadline.priority}</p>
-<p><b>Status:</b> {routing.ai_flag}</p>
-"""
+            <h2 style="color:red">⛔ DEADLINE PASSED</h2>
+            <p><b>Document:</b> {routing.document_name}</p>
+            <p><b>Deadline:</b> {deadline.deadline_date}</p>
+            {notes_block}
+            """
+        elif days_to_deadline == 0:
+            subject = f"🚨 CRITICAL: Deadline TODAY – {routing.routing_id}"
+            html_body = f"""
+            <h2 style="color:red">🚨 CRITICAL DEADLINE TODAY</h2>
+            <p><b>Document:</b> {routing.document_name}</p>
+            <p><b>Deadline:</b> {deadline.deadline_date}</p>
+            <p style="color:red;font-weight:bold">
+                Immediate action is required.
+            </p>
+            {notes_block}
+            """
+        else:
+            subject = f"⚠️ Reminder: Deadline in {days_to_deadline} Days – {routing.routing_id}"
+            html_body = f"""
+            <h3 style="color:orange">Upcoming Deadline</h3>
+            <p><b>Document:</b> {routing.document_name}</p>
+            <p><b>Deadline:</b> {deadline.deadline_date}</p>
+            {notes_block}
+            """
 
-            send_email(
-                to=history.recipient,
-                subject=subject,
-                text_body=text_body,
-                html_body=html_body,
+        text_notes = routing.notes if routing.notes else "—"
+
+        items.append({
+            "history": history,
+            "routing": routing,
+            "deadline": deadline,
+            "days_to_deadline": days_to_deadline,
+            "to": recipient_str,
+            "subject": subject,
+            "text_body": (
+                f"Document: {routing.document_name}\n"
+                f"Deadline: {deadline.deadline_date}\n\n"
+                f"Notes:\n{text_notes}"
+            ),
+            "html_body": html_body,
+        })
+
+    # ===============================
+    # 📤 OUTBOX (same transaction as the status change)
+    # ===============================
+    if REMINDER_DIGEST_MODE:
+        groups: Dict[str, List[dict]] = defaultdict(list)
+        for item in items:
+            groups[item["to"]].append(item)
+        batches = list(groups.values())
+    else:
+        batches = [[item] for item in items]
+
+    for group in batches:
+        if len(group) == 1:
+            item = group[0]
+            enqueue_email(
+                db,
+                history_id=item["history"].id,
+                to=item["to"],
+                subject=item["subject"],
+                text_body=item["text_body"],
+                html_body=item["html_body"],
+                attachment_path=item["routing"].ai_file_path,
             )
+        else:
+            enqueue_digest(db, group)
 
-            mark_reminder_sent(db, reminder, history)
+        for item in group:
+            item["history"].status = ReminderStatus.QUEUED
+            item["history"].days_remaining = max(item["days_to_deadline"], 0)
 
-    except Exception as e:
-        db.rollback()
-        raise e
+    # history → QUEUED and its outbox row commit (or roll back) together;
+    # the outbox drain worker does the SMTP work outside this transaction
+    db.commit()
+    return len(items)
+
+
+def process_reminders() -> int:
+    """
+    Queue every due reminder (including missed days within
+    REMINDER_CATCHUP_DAYS) in claimed chunks of REMINDER_BATCH_SIZE,
+    committing per chunk, after skipping the ones older than that.
+    Safe to run in several processes at once.
+    Returns how many reminders were queued.
+    """
+    logger.warning("⏰ Scheduler tick running")
+    db: Session = SessionLocal()
+    today = datetime.now(TIMEZONE).date()
+
+
+    with TickTimer() as tick:
+        try:
+            # counted as scanned and not queued, i.e. skipped
+            tick.scanned += expire_missed_reminders(db, today)
+            db.commit()
+
+            while True:
+                due_histories, owner_emails = load_due_reminders(
+                    db, today, limit=REMINDER_BATCH_SIZE
+                )
+                if not due_histories:
+                    break
 
+                # every row leaves PENDING, so the next load moves forward
+                tick.scanned += len(due_histories)
+                tick.queued += process_reminder_batch(
+                    db, due_histories, owner_emails, today
+                )
+
+                if len(due_histories) < REMINDER_BATCH_SIZE:
+                    break
+
+        except Exception as e:
+            logger.exception("Reminder scheduler failed")
+            tick.error = f"{type(e).__name__}: {e}"
+            db.rollback()
+
+        finally:
+            db.close()
+
+    save_tick(tick)
+    return tick.queued
+
+
+def save_tick(tick: TickTimer):
+    """
+    Persist one tick so every process (not just the leader that ran it)
+    can report it. Never fails the tick itself.
+    """
+    db: Session = SessionLocal()
+    try:
+        db.add(SchedulerTick(
+            started_at=tick.started_at,
+            duration_ms=int(tick.duration * 1000),
+            pid=os.getpid(),
+            scanned=tick.scanned,
+            queued=tick.queued,
+            error=tick.error,
+        ))
+        db.query(SchedulerTick).filter(
+            SchedulerTick.started_at < datetime.now(timezone.utc)
+            - timedelta(days=SCHEDULER_TICK_RETENTION_DAYS),
+        ).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        logger.exception("Recording the scheduler tick failed")
+        db.rollback()
     finally:
         db.close()
+
+
+def queue_reminders_now(db: Session, reminder_ids: List[int]) -> int:
+    """
+    Queue only the given reminders' due history rows to the outbox.
+    For API requests that create a reminder due today: cost depends on
+    these reminders alone, never on global reminder volume.
+    """
+    if not reminder_ids:
+        return 0
+
+    today = datetime.now(TIMEZONE).date()
+    due_histories, owner_emails = load_due_reminders(
+        db, today, reminder_ids=reminder_ids
+    )
+    if not due_histories:
+        return 0
+
+    return process_reminder_batch(db, due_histories, owner_emails, today)
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Queue due reminders (safe to run as several processes)",
+    )
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="also deliver the outbox afterwards",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    summary = {"queued": process_reminders()}
+    if args.drain:
+        summary["delivered"] = drain_outbox()
+
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from fastapi import (
     UploadFile,
     File,
     Form,
+    BackgroundTasks,
 )
 from sqlalchemy.orm import Session
 from uuid import uuid4
@@ -14,11 +15,12 @@ import shutil
 from datetime import datetime
 import pytz
 
-from app.ai_routing.reminder_engine import calculate_trigger_date
-from app.ai_routing.scheduler import process_reminders
+from app.ai_routing.reminder_engine import resolve_trigger_date
+from app.ai_routing.scheduler import notify_reminders_changed
+from app.ai_routing.reminder_worker import queue_reminders_now
+from app.ai_routing.outbox import drain_outbox
 
 from app.ai_routing.models import DocumentCategory
-from app.ai_routing.services import classify_document
 
 
 
@@ -30,6 +32,8 @@ from app.auth.models import User
 from app.document.D_models import Document
 
 from app.ai_routing.text_extractor import extract_text
+from app.ai_routing.batch_analysis import select_routings, run_batch_reanalysis
+from app.ai_routing.deadline_store import save_ai_deadlines
 from app.ai_routing.models import (
     DocumentRouting,
     RoutingDeadline,
@@ -49,12 +53,15 @@ from app.ai_routing.models import (
     ReminderDirection,
     ReminderChannel,
     ReminderStatus,
+    ReminderSkipReason,
 )
 
 from app.ai_routing.schemas import (
     RoutingCreateResponse,
     AIAnalyzeRequest,
     AIAnalyzeResponse,
+    AIBatchAnalyzeRequest,
+    AIBatchAnalyzeResponse,
     RoutingHistoryResponse,
     HumanDeadlineCreate,
     ReminderCreate,
@@ -63,9 +70,8 @@ from app.ai_routing.schemas import (
 )
 from app.ai_routing.services import (
     calculate_ai_flag,
-    calculate_priority,
     requires_human_review,
-    extract_deadlines_from_text,
+    analyze_text,
 )
 
 UPLOAD_DIR = Path("uploads/ai_routing")
@@ -249,38 +255,25 @@ def analyze_with_ai(
     # ✅ CASE 3: RUN AI EXTRACTION
     # =================================================
     text = extract_text(str(file_path), routing.file_type)
-    # ===============================
-# 📄 DOCUMENT TYPE CLASSIFICATION
-# ===============================
+    analysis = analyze_text(text)
+    category_scores = analysis["category_scores"]
+
     # 📄 DOCUMENT TYPE (AI sets ONLY if empty)
     if routing.document_category is None:
-        routing.document_category = classify_document(text)
-   
-
-
-    extracted_deadlines = extract_deadlines_from_text(text)
+        routing.document_category = analysis["document_category"]
 
     detected_deadlines = []
     detected_date = None
     confidence = None
 
-    if extracted_deadlines:
-        best = max(extracted_deadlines, key=lambda x: x["confidence"])
+    best = analysis["best_deadline"]
+    if best:
         detected_date = best["deadline_date"]
         confidence = best["confidence"]
         detected_deadlines.append(best)
 
-        db.add(
-            RoutingDeadline(
-                routing=routing,
-                source=RoutingSource.AI,
-                label=best["label"],
-                deadline_date=best["deadline_date"],
-                confidence=best["confidence"],
-                priority=calculate_priority(best["deadline_date"]),
-                ai_flag=calculate_ai_flag(best["deadline_date"]),
-            )
-        )
+    # updates the AI deadline in place on a re-run; reminders are kept
+    save_ai_deadlines(db, {routing.id: best})
 
     # =================================================
     # ✅ FINAL AI DECISION (FOUND / NOT FOUND)
@@ -305,10 +298,39 @@ def analyze_with_ai(
         "ai_flag": routing.ai_flag,
         "confidence": routing.confidence,
         "requires_human": routing.requires_human,
+        "document_category": routing.document_category,
+        "category_scores": {c.value: n for c, n in category_scores.items()},
         "detected_deadlines": detected_deadlines,
         "created_at": routing.created_at,
     }
 
+# =====================================================
+# 2️⃣➕ AI BATCH RE-ANALYSIS
+# =====================================================
+@router.post("/ai/analyze/batch", response_model=AIBatchAnalyzeResponse)
+def analyze_batch_with_ai(
+    payload: AIBatchAnalyzeRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    routing_pks = select_routings(
+        db,
+        user_id=user.id,
+        routing_ids=payload.routing_ids,
+        ai_flag=payload.ai_flag,
+        document_category=payload.document_category,
+        created_from=payload.created_from,
+        created_to=payload.created_to,
+    )
+    if not routing_pks:
+        raise HTTPException(404, "No AI routings matched")
+
+    # runs after the response; results land in the routing audit log
+    background_tasks.add_task(run_batch_reanalysis, routing_pks)
+
+    return {"queued": len(routing_pks)}
+
 # =====================================================
 # 4️⃣ HISTORY
 # =====================================================
@@ -365,6 +387,7 @@ def flag_from_priority(priority: PriorityLevel) -> AIDecisionFlag:
 @router.post("/human/deadline")
 def create_human_deadline(
     payload: HumanDeadlineCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -523,13 +546,16 @@ def create_human_deadline(
             )
         )
 
+    notify_reminders_changed(db)
     db.commit()
 
     # ===============================
     # 🚀 IMMEDIATE SEND IF TODAY
     # ===============================
+    # queue just this reminder; SMTP happens after the response
     if payload.email_enabled and payload.deadline_date == today:
-        process_reminders()
+        if queue_reminders_now(db, [default_reminder.id]):
+            background_tasks.add_task(drain_outbox, max_batches=1)
 
         
 
@@ -577,6 +603,7 @@ def get_reminders(
 @router.post("/reminders")
 def create_reminder(
     payload: ReminderCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -603,22 +630,22 @@ def create_reminder(
         trigger_value=payload.trigger_value,
         trigger_unit=payload.trigger_unit,
         direction=payload.direction,
+        trigger_date_override=(
+            payload.trigger_at_override.date()
+            if payload.trigger_at_override
+            else None
+        ),
         channel=payload.channel,
         active=True,
     )
 
-    db.add(reminder)
-    db.flush()  # get reminder.id
-
     # =====================================================
-    # ✅ DATE-ONLY TRIGGER (DEFINE IT!)
+    # ✅ DATE-ONLY TRIGGER (STORED + INDEXED ON THE REMINDER)
     # =====================================================
-    trigger_date = calculate_trigger_date(
-        deadline_date=deadline.deadline_date,
-        trigger_value=payload.trigger_value,
-        trigger_unit=payload.trigger_unit,
-        direction=payload.direction,
-    )
+    trigger_date = resolve_trigger_date(reminder, deadline)
+
+    db.add(reminder)
+    db.flush()  # get reminder.id
 
     today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
     days_remaining = (trigger_date - today).days
@@ -670,12 +697,15 @@ def create_reminder(
         )
     )
 
+    notify_reminders_changed(db)
     db.commit()
 
 # 🚀 IMMEDIATE TRIGGER IF DATE MATCHES
     today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
     if trigger_date == today:
-        process_reminders()
+        # queue just this reminder; SMTP happens after the response
+        if queue_reminders_now(db, [reminder.id]):
+            background_tasks.add_task(drain_outbox, max_batches=1)
 
 
 
@@ -706,8 +736,16 @@ def update_reminder(
     reminder.trigger_value = payload.trigger_value
     reminder.trigger_unit = payload.trigger_unit
     reminder.direction = payload.direction
+    reminder.trigger_date_override = (
+        payload.trigger_at_override.date()
+        if payload.trigger_at_override
+        else None
+    )
     reminder.channel = payload.channel
 
+    trigger_date = resolve_trigger_date(reminder, reminder.deadline)
+    today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+
     # 🔁 Update only future (pending) history rows
     db.query(ReminderHistory).filter(
         ReminderHistory.reminder_id == reminder.id,
@@ -719,6 +757,8 @@ def update_reminder(
             "rule_text": f"{payload.trigger_value} "
                          f"{payload.trigger_unit.value.lower()} "
                          f"{payload.direction.value.lower()}",
+            "trigger_date": trigger_date,
+            "days_remaining": max((trigger_date - today).days, 0),
         },
         synchronize_session=False,
     )
@@ -732,6 +772,7 @@ def update_reminder(
         )
     )
 
+    notify_reminders_changed(db)
     db.commit()
     return {"message": "Reminder updated successfully"}
 
@@ -764,8 +805,10 @@ def delete_reminder(
 
 ,
     ).update(
-        {"status": ReminderStatus.SKIPPED}
-,
+        {
+            "status": ReminderStatus.SKIPPED,
+            "skip_reason": ReminderSkipReason.DEACTIVATED,
+        },
         synchronize_session=False,
     )
 
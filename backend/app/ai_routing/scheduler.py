@@ -1,173 +1,177 @@
-from datetime import datetime
-import pytz
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+import os
 
+from sqlalchemy import event, func, text
 from sqlalchemy.orm import Session
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
 
-from app.auth.models import User
 from app.database import SessionLocal
 from app.ai_routing.models import (
     RoutingReminder,
     ReminderHistory,
     ReminderStatus,
-    RoutingEmailRecipient,
 )
-from app.ai_routing.reminder_engine import calculate_trigger_date
-from app.email import send_reminder_email
+from app.ai_routing.outbox import OUTBOX_DRAIN_SECONDS, drain_outbox
+from app.ai_routing.reminder_worker import (
+    TIMEZONE,
+    _due_window_start,
+    process_reminders,
+)
+from app.ai_routing.leader import (
+    LEADER_POLL_SECONDS,
+    REMINDER_WAKE_CHANNEL,
+    elector,
+)
+from app.ai_routing.scheduler_metrics import scheduler_metrics
+from app.audit_partitions import maintain_audit_partitions
 
 scheduler = BackgroundScheduler()
 logger = logging.getLogger(__name__)
 
+REMINDER_JOB_ID = "routing_reminder_job"
+OUTBOX_DRAIN_JOB_ID = "email_outbox_drain"
+AUDIT_PARTITION_JOB_ID = "audit_partition_maintenance"
+
+# a failed run leaves its rows PENDING (due now): wait before retrying
+REMINDER_RETRY_SECONDS = int(os.getenv("REMINDER_RETRY_SECONDS", "300"))
+
 
 # =====================================================
-# CORE REMINDER JOB
+# NEXT-FIRE SCHEDULING
 # =====================================================
-def process_reminders():
-    logger.warning("⏰ Scheduler tick running")
-    db: Session = SessionLocal()
-    today = datetime.now(pytz.timezone("Asia/Kolkata")).date()
+def next_due_date(db: Session, today: date) -> Optional[date]:
+    # MIN over the (status, trigger_date) index — no per-reminder work
+    return (
+        db.query(func.min(ReminderHistory.trigger_date))
+        .join(
+            RoutingReminder,
+            ReminderHistory.reminder_id == RoutingReminder.id,
+        )
+        .filter(
+            ReminderHistory.status == ReminderStatus.PENDING,
+            ReminderHistory.trigger_date >= _due_window_start(today),
+            RoutingReminder.active.is_(True),
+        )
+        .scalar()
+    )
+
+
+def next_fire_time(db: Session) -> datetime:
+    now = datetime.now(TIMEZONE)
+    due = next_due_date(db, now.date())
+
+    if due is not None and due <= now.date():
+        return now
+
+    # reminders are date-granular: fire at the start of the due day.
+    # with nothing pending, still re-check once a day as a safety net.
+    day = due if due is not None else now.date() + timedelta(days=1)
+    return TIMEZONE.localize(datetime.combine(day, time.min))
 
 
+def schedule_next_run(after_failure: bool = False):
+    """
+    (Re)arm the one-shot reminder job at the next due instant, or no
+    sooner than REMINDER_RETRY_SECONDS from now after a failed run.
+    """
+    if not scheduler.running or not elector.is_leader:
+        return
+
+    retry_at = datetime.now(TIMEZONE) + timedelta(seconds=REMINDER_RETRY_SECONDS)
+
+    db: Session = SessionLocal()
     try:
-        reminders = (
-            db.query(RoutingReminder)
-            .filter(RoutingReminder.active.is_(True))
-            .all()
+        run_at = next_fire_time(db)
+    except Exception:
+        logger.exception("Computing next reminder run failed")
+        run_at = retry_at
+    finally:
+        db.close()
+
+    if after_failure:
+        run_at = max(run_at, retry_at)
+
+    scheduler.add_job(
+        run_reminder_job,
+        "date",
+        run_date=run_at,
+        id=REMINDER_JOB_ID,
+        replace_existing=True,
+        misfire_grace_time=None,
+        coalesce=True,
+    )
+    logger.info("Next reminder run at %s", run_at.isoformat())
+
+
+def notify_reminders_changed(db: Session):
+    """
+    Call from any process before committing a reminder/history change:
+    the leader re-computes its next run once the change is visible.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # NOTIFY is transactional: delivered only if the caller commits
+        db.execute(
+            text("SELECT pg_notify(:channel, '')"),
+            {"channel": REMINDER_WAKE_CHANNEL},
+        )
+    elif scheduler.running:
+        event.listen(
+            db,
+            "after_commit",
+            lambda session: schedule_next_run(),
+            once=True,
         )
 
-        for reminder in reminders:
-            deadline = reminder.deadline
-            routing = reminder.routing
-
-            if not deadline or not routing:
-                continue
-
-            # ===============================
-            # 📧 COLLECT RECIPIENTS
-            # ===============================
-            recipients = []
-
-            user = db.query(User).filter(User.id == routing.user_id).first()
-            if user and user.email:
-                recipients.append(user.email)
-
-            ccs = (
-                db.query(RoutingEmailRecipient)
-                .filter(RoutingEmailRecipient.routing_id == routing.id)
-                .all()
-            )
-            recipients.extend([c.email for c in ccs])
-
-            recipients = sorted(set(recipients))
-            if not recipients:
-                continue
-
-            recipient_str = ", ".join(recipients)
-
-            # ===============================
-            # 📅 TRIGGER DATE
-            # ===============================
-            trigger_date = calculate_trigger_date(
-                deadline_date=deadline.deadline_date,
-                trigger_value=reminder.trigger_value,
-                trigger_unit=reminder.trigger_unit,
-                direction=reminder.direction,
-            )
-
-            if today != trigger_date:
-                continue
-
-            # ===============================
-            # 🔎 HISTORY ROW
-            # ===============================
-            history = (
-                db.query(ReminderHistory)
-                .filter(
-                    ReminderHistory.reminder_id == reminder.id,
-                    ReminderHistory.trigger_date == trigger_date,
-                    ReminderHistory.status == ReminderStatus.PENDING,
-                )
-                .first()
-            )
-
-            if not history:
-                continue
-
-            days_to_deadline = (deadline.deadline_date - today).days
-
-            # ===============================
-            # 📝 NOTES BLOCK
-            # ===============================
-            notes_block = ""
-            if routing.notes:
-                notes_block = f"""
-                <hr>
-                <p><b>Notes:</b></p>
-                <p>{routing.notes}</p>
-                """
-
-            # ===============================
-            # 📧 EMAIL CONTENT
-            # ===============================
-            if days_to_deadline == 0:
-                subject = f"🚨 CRITICAL: Deadline TODAY – {routing.routing_id}"
-                html_body = f"""
-                <h2 style="color:red">🚨 CRITICAL DEADLINE TODAY</h2>
-                <p><b>Document:</b> {routing.document_name}</p>
-                <p><b>Deadline:</b> {deadline.deadline_date}</p>
-                <p style="color:red;font-weight:bold">
-                    Immediate action is required.
-                </p>
-                {notes_block}
-                """
-            else:
-                subject = f"⚠️ Reminder: Deadline in {days_to_deadline} Days – {routing.routing_id}"
-                html_body = f"""
-                <h3 style="color:orange">Upcoming Deadline</h3>
-                <p><b>Document:</b> {routing.document_name}</p>
-                <p><b>Deadline:</b> {deadline.deadline_date}</p>
-                {notes_block}
-                """
-
-                        # ===============================
-            # 📧 SEND EMAIL
-            # ===============================
-            try:
-                text_notes = routing.notes if routing.notes else "—"
-
-                send_reminder_email(
-                    to=recipient_str,
-                    subject=subject,
-                    text_body=(
-                        f"Document: {routing.document_name}\n"
-                        f"Deadline: {deadline.deadline_date}\n\n"
-                        f"Notes:\n{text_notes}"
-                    ),
-                    html_body=html_body,
-                    attachment_path=routing.ai_file_path,
-
-                )
-
-                history.status = ReminderStatus.SENT
-                history.sent_on = today
-                history.days_remaining = max(days_to_deadline, 0)
-                reminder.active = False
-
-            except Exception:
-                logger.exception("Email send failed")
-                history.status = ReminderStatus.FAILED
-                history.sent_on = today
-
-
-        db.commit()
 
-    except Exception:
-        logger.exception("Reminder scheduler failed")
-        db.rollback()
+def wake_outbox_drain():
+    # run this process's drain job now instead of at its next interval
+    if scheduler.running and scheduler.get_job(OUTBOX_DRAIN_JOB_ID):
+        scheduler.modify_job(
+            OUTBOX_DRAIN_JOB_ID,
+            next_run_time=datetime.now(TIMEZONE),
+        )
+
 
+# =====================================================
+# LEADER-ONLY JOBS
+# =====================================================
+def leader_election_tick():
+    was_leader = elector.is_leader
+    is_leader = elector.poll()
+
+    if not is_leader:
+        if was_leader and scheduler.get_job(REMINDER_JOB_ID):
+            scheduler.remove_job(REMINDER_JOB_ID)
+        return
+
+    # new leader: catch up on anything the old one missed.
+    # existing leader: re-arm only when someone changed reminders.
+    if not was_leader or elector.pop_notifications():
+        schedule_next_run()
+
+
+def run_reminder_job():
+    # every process keeps a scheduler alive for the election job,
+    # but only the advisory-lock holder scans and sends reminders
+    if not elector.is_leader:
+        return
+
+    failed = True
+    try:
+        if process_reminders():
+            wake_outbox_drain()
+        # process_reminders() logs and swallows its own errors
+        failed = scheduler_metrics.last_tick_failed
     finally:
-        db.close()
+        schedule_next_run(after_failure=failed)
+
+
+def run_audit_partition_job():
+    if not elector.is_leader:
+        return
+    maintain_audit_partitions()
 
 
 # =====================================================
@@ -176,10 +180,40 @@ def process_reminders():
 def start_scheduler():
     if not scheduler.running:
         scheduler.add_job(
-            process_reminders,
+            leader_election_tick,
             "interval",
-            minutes=1,
-            id="routing_reminder_job",
+            seconds=LEADER_POLL_SECONDS,
+            id="scheduler_leader_election",
+            replace_existing=True,
+        )
+        # every process drains: SKIP LOCKED claims keep them apart
+        scheduler.add_job(
+            drain_outbox,
+            "interval",
+            seconds=OUTBOX_DRAIN_SECONDS,
+            id=OUTBOX_DRAIN_JOB_ID,
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+        # next month's partitions exist weeks ahead; old ones archived
+        scheduler.add_job(
+            run_audit_partition_job,
+            "cron",
+            hour=2,
+            minute=30,
+            timezone=TIMEZONE,
+            id=AUDIT_PARTITION_JOB_ID,
             replace_existing=True,
         )
         scheduler.start()
+
+        # first election right away; a fresh leader runs missed-day
+        # catch-up immediately via schedule_next_run()
+        leader_election_tick()
+
+
+def stop_scheduler():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    elector.resign()
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# SMTP send latency buckets (seconds, upper bounds; last bucket is +Inf)
+SMTP_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+
+
+# =====================================================
+# IN-PROCESS COLLECTOR
+# =====================================================
+class SchedulerMetrics:
+    """
+    Counters for this process's reminder ticks and outbox deliveries.
+
+    Per worker only: reminder ticks run on whichever process is leader
+    and every process drains the outbox. Cluster-wide figures come from
+    the database (scheduler_ticks, delivery attempts, outbox; see
+    app.analytics.services.get_scheduler_metrics).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now(timezone.utc)
+
+        self.ticks_total = 0
+        self.ticks_failed = 0
+        self.last_tick_at: Optional[datetime] = None
+        self.last_tick_duration_seconds: Optional[float] = None
+        self.last_tick_scanned = 0
+        self.last_tick_queued = 0
+        self.last_tick_skipped = 0
+        self.last_tick_error: Optional[str] = None
+        self.last_successful_tick_at: Optional[datetime] = None
+
+        self.reminders_scanned_total = 0
+        self.reminders_queued_total = 0
+        self.reminders_skipped_total = 0
+
+        self.emails_sent_total = 0
+        self.emails_failed_total = 0
+        self.last_email_sent_at: Optional[datetime] = None
+
+        self._latency_counts: List[int] = [0] * (len(SMTP_LATENCY_BUCKETS) + 1)
+        self._latency_sum = 0.0
+
+    # ---------------- recording ----------------
+
+    def record_tick(
+        self,
+        *,
+        duration: float,
+        scanned: int,
+        queued: int,
+        error: Optional[str] = None,
+    ):
+        now = datetime.now(timezone.utc)
+        skipped = scanned - queued
+
+        with self._lock:
+            self.ticks_total += 1
+            self.last_tick_at = now
+            self.last_tick_duration_seconds = round(duration, 4)
+            self.last_tick_scanned = scanned
+            self.last_tick_queued = queued
+            self.last_tick_skipped = skipped
+            self.last_tick_error = error
+
+            self.reminders_scanned_total += scanned
+            self.reminders_queued_total += queued
+            self.reminders_skipped_total += skipped
+
+            if error:
+                self.ticks_failed += 1
+            else:
+                self.last_successful_tick_at = now
+
+    def record_delivery(self, *, success: bool, attempt_seconds: List[float]):
+        with self._lock:
+            if success:
+                self.emails_sent_total += 1
+                self.last_email_sent_at = datetime.now(timezone.utc)
+            else:
+                self.emails_failed_total += 1
+
+            for seconds in attempt_seconds:
+                self._latency_counts[bisect_left(SMTP_LATENCY_BUCKETS, seconds)] += 1
+                self._latency_sum += seconds
+
+    # ---------------- reading ----------------
+
+    @property
+    def last_tick_failed(self) -> bool:
+        return self.last_tick_error is not None
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(
+                [*map(str, SMTP_LATENCY_BUCKETS), "+Inf"],
+                self._latency_counts,
+            ):
+                cumulative += count
+                buckets.append({"le": bound, "count": cumulative})
+
+            return {
+                "pid": os.getpid(),
+                "uptime_seconds": int(
+                    (datetime.now(timezone.utc) - self.started_at).total_seconds()
+                ),
+                "ticks_total": self.ticks_total,
+                "ticks_failed": self.ticks_failed,
+                "last_tick_at": self.last_tick_at,
+                "last_tick_duration_seconds": self.last_tick_duration_seconds,
+                "last_tick_scanned": self.last_tick_scanned,
+                "last_tick_queued": self.last_tick_queued,
+                "last_tick_skipped": self.last_tick_skipped,
+                "last_tick_error": self.last_tick_error,
+                "last_successful_tick_at": self.last_successful_tick_at,
+                "reminders_scanned_total": self.reminders_scanned_total,
+                "reminders_queued_total": self.reminders_queued_total,
+                "reminders_skipped_total": self.reminders_skipped_total,
+                "emails_sent_total": self.emails_sent_total,
+                "emails_failed_total": self.emails_failed_total,
+                "last_email_sent_at": self.last_email_sent_at,
+                "smtp_latency_seconds": {
+                    "buckets": buckets,
+                    "count": cumulative,
+                    "sum": round(self._latency_sum, 4),
+                },
+            }
+
+
+scheduler_metrics = SchedulerMetrics()
+
+
+class TickTimer:
+    """
+    with TickTimer() as tick:
+        tick.scanned += ...
+        tick.queued += ...
+    records the tick (and any exception message) on exit; started_at
+    and duration are kept for persisting it afterwards.
+    """
+
+    def __init__(self, metrics: SchedulerMetrics = scheduler_metrics):
+        self.metrics = metrics
+        self.scanned = 0
+        self.queued = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.monotonic() - self._started
+        if exc and not self.error:
+            self.error = f"{exc_type.__name__}: {exc}"
+
+        self.metrics.record_tick(
+            duration=self.duration,
+            scanned=self.scanned,
+            queued=self.queued,
+            error=self.error,
+        )
+        return False
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from enum import Enum
 
 from app.ai_routing.models import (
@@ -25,6 +25,22 @@ class AIAnalyzeRequest(BaseModel):
     routing_id: str
 
 
+# =====================================================
+# AI BATCH RE-ANALYSIS
+# =====================================================
+
+class AIBatchAnalyzeRequest(BaseModel):
+    routing_ids: Optional[List[str]] = None
+    ai_flag: Optional[AIDecisionFlag] = None
+    document_category: Optional[DocumentCategory] = None
+    created_from: Optional[date] = None
+    created_to: Optional[date] = None  # inclusive
+
+
+class AIBatchAnalyzeResponse(BaseModel):
+    queued: int
+
+
 # =====================================================
 # AI DETECTED DEADLINE
 # =====================================================
@@ -45,6 +61,7 @@ class AIAnalyzeResponse(BaseModel):
     confidence: Optional[float]
     requires_human: bool
     document_category: Optional[DocumentCategory] = None
+    category_scores: Dict[str, int] = Field(default_factory=dict)
     detected_deadlines: List[AIDetectedDeadline] = Field(default_factory=list)
     created_at: datetime
 
@@ -1,5 +1,6 @@
 import re
-from datetime import date, datetime
+from bisect import bisect_left, bisect_right
+from datetime import date
 from typing import List, Optional, Dict, TypedDict
 
 from app.email import send_reminder_email
@@ -11,6 +12,7 @@ from app.ai_routing.models import (
     RoutingSource,
 )
 from app.ai_routing.models import DocumentCategory
+from app.ai_routing.keyword_automaton import KeywordAutomaton
 
 
 
@@ -22,6 +24,105 @@ CONFIDENCE_THRESHOLD: float = 0.85
 DEADLINE_NEAR_DAYS = 5
 DEADLINE_CRITICAL_DAYS = 1
 
+# keywords this many characters either side of a date label it
+LABEL_WINDOW_CHARS = 60
+
+MONTHS: Dict[str, int] = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+LABEL_KEYWORDS: Dict[str, DeadlineLabel] = {
+    "submit": DeadlineLabel.SUBMISSION,
+    "submitted": DeadlineLabel.SUBMISSION,
+    "submission": DeadlineLabel.SUBMISSION,
+    "expire": DeadlineLabel.EXPIRY,
+    "expires": DeadlineLabel.EXPIRY,
+    "expired": DeadlineLabel.EXPIRY,
+    "expiry": DeadlineLabel.EXPIRY,
+    "expiration": DeadlineLabel.EXPIRY,
+    "renew": DeadlineLabel.RENEWAL,
+    "renewal": DeadlineLabel.RENEWAL,
+    "renewed": DeadlineLabel.RENEWAL,
+    "hearing": DeadlineLabel.HEARING,
+    "filing": DeadlineLabel.FILING,
+    "valid till": DeadlineLabel.VALID_TILL,
+    "valid until": DeadlineLabel.VALID_TILL,
+    "due": DeadlineLabel.DUE,
+}
+
+# tie-break order when two labels score the same
+LABEL_PRIORITY: List[DeadlineLabel] = [
+    DeadlineLabel.SUBMISSION,
+    DeadlineLabel.EXPIRY,
+    DeadlineLabel.RENEWAL,
+    DeadlineLabel.HEARING,
+    DeadlineLabel.FILING,
+    DeadlineLabel.VALID_TILL,
+    DeadlineLabel.DUE,
+]
+
+
+CATEGORY_KEYWORDS: Dict[DocumentCategory, List[str]] = {
+    DocumentCategory.AGREEMENT: [
+        "agreement",
+        "contract",
+        "hereby agree",
+        "terms and conditions",
+        "party of the first part",
+        "party of the second part",
+    ],
+    DocumentCategory.LEGAL: [
+        "court",
+        "legal",
+        "plaintiff",
+        "defendant",
+        "section",
+        "act",
+        "law",
+        "jurisdiction",
+    ],
+    DocumentCategory.SUBMISSION: [
+        "submit",
+        "submission",
+        "apply",
+        "application",
+        "filing",
+        "filed on",
+    ],
+    DocumentCategory.INVOICE: [
+        "invoice",
+        "amount due",
+        "total payable",
+        "gst",
+        "tax",
+        "bill number",
+    ],
+    DocumentCategory.POLICY: [
+        "policy",
+        "guidelines",
+        "compliance",
+        "procedure",
+        "framework",
+    ],
+    DocumentCategory.NOTICE: [
+        "notice",
+        "hereby informed",
+        "intimation",
+        "this is to notify",
+    ],
+}
+
 
 # =====================================================
 # TYPES
@@ -33,6 +134,44 @@ class DetectedDeadline(TypedDict):
     confidence: float
 
 
+class TextAnalysis(TypedDict):
+    document_category: DocumentCategory
+    category_scores: Dict[DocumentCategory, int]
+    deadlines: List[DetectedDeadline]
+    best_deadline: Optional[DetectedDeadline]
+
+
+# =====================================================
+# COMPILED SCANNERS
+# =====================================================
+
+# dd/mm/yyyy | dd Month yyyy | Month dd, yyyy — one alternation, one pass.
+# Branches start on a digit or a month initial so the scanner skips
+# everything else cheaply; month names are validated against MONTHS.
+_DATE_RE = re.compile(
+    r"\b(?:"
+    r"(?P<d>\d{1,2})(?:"
+    r"[/-](?P<nm>\d{1,2})[/-](?P<ny>\d{2,4})"
+    r"|\s+(?P<dm>[A-Za-z]{3,9})\s+(?P<dy>\d{4})"
+    r")"
+    r"|(?P<mm>[JFMASONDjfmasond][A-Za-z]{2,8})\s+(?P<md>\d{1,2}),\s*(?P<my>\d{4})"
+    r")\b"
+)
+
+_LABEL_KEYWORD_RE = re.compile(
+    r"\b(?=[SsEeRrHhFfVvDd])(?:"
+    + "|".join(
+        re.escape(k).replace(r"\ ", r"\s+")
+        for k in sorted(LABEL_KEYWORDS, key=len, reverse=True)
+    )
+    + r")\b",
+    re.IGNORECASE,
+)
+_LONGEST_KEYWORD = max(len(k) for k in LABEL_KEYWORDS)
+
+_CATEGORY_AUTOMATON = KeywordAutomaton(CATEGORY_KEYWORDS)
+
+
 # =====================================================
 # DATE UTILITIES
 # =====================================================
@@ -97,128 +236,173 @@ def requires_human_review(
 # =====================================================
 
 def extract_deadlines_from_text(text: str) -> List[DetectedDeadline]:
+    """
+    Single pass over the text with one compiled scanner. Each date is
+    parsed from the month table and labelled from the keywords around it.
+    """
     results: List[DetectedDeadline] = []
 
     if not text:
         return results
 
-    text_lower = text.lower()
-
-    patterns = [
-        (r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b", ["%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y"]),
-        (r"\b(\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})\b", ["%d %b %Y", "%d %B %Y"]),
-        (r"\b([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})\b", ["%b %d, %Y", "%B %d, %Y"]),
-    ]
-
-    for pattern, formats in patterns:
-        for match in re.findall(pattern, text):
-            for fmt in formats:
-                try:
-                    parsed = datetime.strptime(
-                        match.replace("-", "/"), fmt
-                    ).date()
-
-                    # ✅ SMART LABEL DETECTION
-                    label = DeadlineLabel.DUE
-
-                    if "submit" in text_lower or "submission" in text_lower:
-                        label = DeadlineLabel.SUBMISSION
-                    elif "expire" in text_lower or "expiry" in text_lower:
-                        label = DeadlineLabel.EXPIRY
-                    elif "renew" in text_lower:
-                        label = DeadlineLabel.RENEWAL
-                    elif "hearing" in text_lower:
-                        label = DeadlineLabel.HEARING
-
-                    results.append({
-                        "deadline_date": parsed,
-                        "label": label,
-                        "confidence": 0.9 if "%Y" in fmt else 0.7,
-                    })
-                    break
-
-                except ValueError:
-                    continue
+    keyword_hits: Optional[List[tuple[int, int, DeadlineLabel]]] = None
+    keyword_starts: List[int] = []
+
+    for match in _DATE_RE.finditer(text):
+        parsed = _parse_date_match(match)
+        if parsed is None:
+            continue
+
+        # keywords are only collected once a real date shows up
+        if keyword_hits is None:
+            keyword_hits = [
+                (
+                    kw.start(),
+                    kw.end(),
+                    LABEL_KEYWORDS[" ".join(kw.group(0).lower().split())],
+                )
+                for kw in _LABEL_KEYWORD_RE.finditer(text)
+            ]
+            keyword_starts = [hit[0] for hit in keyword_hits]
+
+        deadline_date, confidence = parsed
+
+        results.append({
+            "deadline_date": deadline_date,
+            "label": _label_near(
+                match.start(),
+                match.end(),
+                keyword_hits,
+                keyword_starts,
+            ),
+            "confidence": confidence,
+        })
 
     return results
 
 
+def _parse_date_match(match: re.Match) -> Optional[tuple[date, float]]:
+    day = int(match.group("d") or match.group("md"))
+
+    if match.group("nm"):
+        month = int(match.group("nm"))
+        year_text = match.group("ny")
+
+        if len(year_text) == 4:
+            year, confidence = int(year_text), 0.9
+        elif len(year_text) == 2:
+            # same pivot as strptime("%y")
+            year = int(year_text)
+            year += 1900 if year >= 69 else 2000
+            confidence = 0.7
+        else:
+            return None
+    else:
+        month_name = match.group("dm") or match.group("mm")
+        month = MONTHS.get(month_name.lower())
+        year = int(match.group("dy") or match.group("my"))
+        confidence = 0.9
+
+    if not month:
+        return None
+
+    try:
+        return date(year, month, day), confidence
+    except ValueError:
+        return None
+
+
+def _label_near(
+    start: int,
+    end: int,
+    keyword_hits: List[tuple[int, int, DeadlineLabel]],
+    keyword_starts: List[int],
+) -> DeadlineLabel:
+    lo = bisect_left(
+        keyword_starts, start - LABEL_WINDOW_CHARS - _LONGEST_KEYWORD
+    )
+    hi = bisect_right(keyword_starts, end + LABEL_WINDOW_CHARS)
+
+    scores: Dict[DeadlineLabel, float] = {}
+
+    for kw_start, kw_end, label in keyword_hits[lo:hi]:
+        if kw_end <= start:
+            distance = start - kw_end
+            weight = 1.0
+        else:
+            # "due on <date>" reads far more often than "<date> is due"
+            distance = max(kw_start - end, 0)
+            weight = 0.5
+
+        if distance > LABEL_WINDOW_CHARS:
+            continue
+
+        scores[label] = scores.get(label, 0.0) + weight * (
+            1.0 - distance / (LABEL_WINDOW_CHARS + 1)
+        )
+
+    if not scores:
+        return DeadlineLabel.DUE
+
+    return max(
+        scores,
+        key=lambda label: (scores[label], -LABEL_PRIORITY.index(label)),
+    )
+
+
 # =====================================================
 # 📄 DOCUMENT TYPE CLASSIFICATION
 # =====================================================
 
-def classify_document(text: str) -> DocumentCategory:
-    if not text:
-        return DocumentCategory.OTHER
+def score_document_categories(text: str) -> Dict[DocumentCategory, int]:
+    return _CATEGORY_AUTOMATON.count(text)
 
-    text_lower = text.lower()
 
-    # AGREEMENT / CONTRACT
-    if any(k in text_lower for k in [
-        "agreement",
-        "contract",
-        "hereby agree",
-        "terms and conditions",
-        "party of the first part",
-        "party of the second part",
-    ]):
-        return DocumentCategory.AGREEMENT
+def classify_document_with_scores(
+    text: str,
+) -> tuple[DocumentCategory, Dict[DocumentCategory, int]]:
+    scores = score_document_categories(text)
 
-    # LEGAL
-    if any(k in text_lower for k in [
-        "court",
-        "legal",
-        "plaintiff",
-        "defendant",
-        "section",
-        "act",
-        "law",
-        "jurisdiction",
-    ]):
-        return DocumentCategory.LEGAL
+    # most keyword hits wins; ties keep the CATEGORY_KEYWORDS order
+    best = max(
+        _CATEGORY_AUTOMATON.keys,
+        key=lambda c: (scores[c], -_CATEGORY_AUTOMATON.keys.index(c)),
+    )
 
-    # SUBMISSION
-    if any(k in text_lower for k in [
-        "submit",
-        "submission",
-        "apply",
-        "application",
-        "filing",
-        "filed on",
-    ]):
-        return DocumentCategory.SUBMISSION
+    if scores[best] == 0:
+        return DocumentCategory.OTHER, scores
 
-    # INVOICE
-    if any(k in text_lower for k in [
-        "invoice",
-        "amount due",
-        "total payable",
-        "gst",
-        "tax",
-        "bill number",
-    ]):
-        return DocumentCategory.INVOICE
+    return best, scores
 
-    # POLICY
-    if any(k in text_lower for k in [
-        "policy",
-        "guidelines",
-        "compliance",
-        "procedure",
-        "framework",
-    ]):
-        return DocumentCategory.POLICY
 
-    # NOTICE
-    if any(k in text_lower for k in [
-        "notice",
-        "hereby informed",
-        "intimation",
-        "this is to notify",
-    ]):
-        return DocumentCategory.NOTICE
+def classify_document(text: str) -> DocumentCategory:
+    return classify_document_with_scores(text)[0]
+
+
+# =====================================================
+# 🤖 FULL TEXT ANALYSIS (CLASSIFY + DEADLINES)
+# =====================================================
+
+def analyze_text(text: str) -> TextAnalysis:
+    """
+    Pure (DB-free) AI pass over extracted text, shared by the single
+    analyze endpoint and the batch re-analysis workers.
+    """
+    category, scores = classify_document_with_scores(text)
+    deadlines = extract_deadlines_from_text(text)
+
+    best = (
+        max(deadlines, key=lambda d: d["confidence"])
+        if deadlines
+        else None
+    )
 
-    return DocumentCategory.OTHER
+    return {
+        "document_category": category,
+        "category_scores": scores,
+        "deadlines": deadlines,
+        "best_deadline": best,
+    }
 
 
 # =====================================================
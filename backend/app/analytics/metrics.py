@@ -1,5 +1,5 @@
-from typing import List, Tuple, Dict
-from datetime import date
+from typing import List, Tuple, Dict, Optional
+from datetime import date, datetime
 
 
 # =====================================================
@@ -98,18 +98,75 @@ def build_audit_logs(logs) -> Dict:
 # 🩺 SYSTEM HEALTH
 # =====================================================
 
-def build_system_health(status_map: Dict[str, bool]) -> Dict:
+def build_system_health(
+    status_map: Dict[str, bool],
+    details: Optional[Dict[str, str]] = None,
+) -> Dict:
+    details = details or {}
     return {
         "services": [
             {
                 "service": service,
                 "status": "OK" if ok else "FAIL",
+                "detail": details.get(service),
             }
             for service, ok in status_map.items()
         ]
     }
 
 
+# =====================================================
+# ⏱️ SCHEDULER METRICS
+# =====================================================
+
+def build_scheduler_cluster(
+    window_hours: int,
+    tick_totals,
+    latest_tick,
+    last_successful_tick_at: Optional[datetime],
+    emails_sent,
+) -> Dict:
+    return {
+        "window_hours": window_hours,
+        "ticks_total": tick_totals.ticks_total,
+        "ticks_failed": tick_totals.ticks_failed,
+        "last_tick_at": latest_tick.started_at if latest_tick else None,
+        "last_tick_duration_seconds": (
+            latest_tick.duration_ms / 1000 if latest_tick else None
+        ),
+        "last_tick_pid": latest_tick.pid if latest_tick else None,
+        "last_tick_error": latest_tick.error if latest_tick else None,
+        "last_successful_tick_at": last_successful_tick_at,
+        "reminders_scanned_total": tick_totals.scanned,
+        "reminders_queued_total": tick_totals.queued,
+        "reminders_skipped_total": tick_totals.scanned - tick_totals.queued,
+        "emails_sent_total": emails_sent.sent,
+        "last_email_sent_at": emails_sent.last_sent_at,
+    }
+
+
+def build_scheduler_metrics(
+    process: Dict,
+    is_leader: bool,
+    cluster: Dict,
+    overdue_pending: int,
+    outbox_rows: List[Tuple[str, int]],
+    stale_outbox: int,
+) -> Dict:
+    return {
+        "process": {**process, "is_leader": is_leader},
+        "cluster": cluster,
+        "backlog": {
+            "overdue_pending_reminders": overdue_pending,
+            "outbox": {
+                status.value: count
+                for status, count in outbox_rows
+            },
+            "stale_outbox_emails": stale_outbox,
+        },
+    }
+
+
 # =====================================================
 # 📄 DOCUMENT CODE ANALYTICS (NEW)
 # =====================================================
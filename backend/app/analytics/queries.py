@@ -1,15 +1,21 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
 
 from app.auth.models import OCRHistory, AIDocument
 from app.document.D_models import Document, AuditLog
+from app.audit_partitions import AUDIT_DEFAULT_WINDOW_DAYS, window_start
 from app.ai_routing.models import (
     DocumentRouting,
     RoutingDeadline,
     ReminderHistory,
+    ReminderSkipReason,
     ReminderStatus,
+    RoutingReminder,
+    EmailOutbox,
+    OutboxStatus,
+    SchedulerTick,
 )
 
 
@@ -119,8 +125,89 @@ def failed_reminders_today(db: Session, user_id: int) -> int:
     ).count()
 
 def latest_audit_logs(db: Session, user_id: int, limit: int = 50):
-    return db.query(AuditLog).filter(
-        AuditLog.performed_by == user_id
-    ).order_by(
+    query = db.query(AuditLog).filter(AuditLog.performed_by == user_id)
+
+    # live feed: recent partitions only
+    since = window_start(AUDIT_DEFAULT_WINDOW_DAYS)
+    if since:
+        query = query.filter(AuditLog.created_at >= since)
+
+    return query.order_by(
         AuditLog.created_at.desc()
     ).limit(limit).all()
+
+
+# =====================================================
+# ⏰ SCHEDULER BACKLOG (CLUSTER-WIDE)
+# =====================================================
+
+def overdue_pending_reminders(db: Session, today: date) -> int:
+    # PENDING rows whose day has passed: the scheduler is behind.
+    # every tick queues the ones within the catch-up window and skips
+    # the older ones, so this stays above zero only while ticks fail
+    return db.query(ReminderHistory.id).join(
+        RoutingReminder,
+        ReminderHistory.reminder_id == RoutingReminder.id,
+    ).filter(
+        ReminderHistory.status == ReminderStatus.PENDING,
+        ReminderHistory.trigger_date < today,
+        RoutingReminder.active.is_(True),
+    ).count()
+
+def expired_reminders(db: Session) -> int:
+    # never sent: their day fell outside the catch-up window (downtime)
+    return db.query(ReminderHistory.id).filter(
+        ReminderHistory.status == ReminderStatus.SKIPPED,
+        ReminderHistory.skip_reason == ReminderSkipReason.EXPIRED,
+    ).count()
+
+def outbox_by_status(db: Session):
+    return db.query(
+        EmailOutbox.status.label("status"),
+        func.count(EmailOutbox.id).label("count"),
+    ).filter(
+        EmailOutbox.status != OutboxStatus.SENT,
+    ).group_by(
+        EmailOutbox.status
+    ).all()
+
+def stale_outbox_emails(db: Session, older_than_minutes: int) -> int:
+    # due for delivery but nobody has picked them up
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=older_than_minutes)
+    return db.query(EmailOutbox.id).filter(
+        EmailOutbox.status == OutboxStatus.PENDING,
+        EmailOutbox.next_attempt_at < cutoff,
+    ).count()
+
+def tick_totals(db: Session, since: datetime):
+    failed = SchedulerTick.error.isnot(None)
+    return db.query(
+        func.count(SchedulerTick.id).label("ticks_total"),
+        func.count(SchedulerTick.id).filter(failed).label("ticks_failed"),
+        func.coalesce(func.sum(SchedulerTick.scanned), 0).label("scanned"),
+        func.coalesce(func.sum(SchedulerTick.queued), 0).label("queued"),
+    ).filter(
+        SchedulerTick.started_at >= since,
+    ).one()
+
+def latest_tick(db: Session):
+    return db.query(SchedulerTick).order_by(
+        SchedulerTick.started_at.desc(),
+        SchedulerTick.id.desc(),
+    ).first()
+
+def last_successful_tick_at(db: Session):
+    return db.query(func.max(SchedulerTick.started_at)).filter(
+        SchedulerTick.error.is_(None),
+    ).scalar()
+
+def emails_sent(db: Session, since: datetime):
+    # outbox rows, not delivery attempts: a digest is one email
+    # but has an attempt row per reminder it covers
+    return db.query(
+        func.count(EmailOutbox.id).label("sent"),
+        func.max(EmailOutbox.sent_at).label("last_sent_at"),
+    ).filter(
+        EmailOutbox.status == OutboxStatus.SENT,
+        EmailOutbox.sent_at >= since,
+    ).one()
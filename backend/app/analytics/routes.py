@@ -13,6 +13,7 @@ from app.analytics.schemas import (
     ReminderAnalyticsResponse,
     AuditLogResponse,
     SystemHealthResponse,
+    SchedulerMetricsResponse,
     AIAnalyticsResponse,
     DocumentCodeAnalyticsResponse
 )
@@ -26,6 +27,7 @@ from app.analytics.services import (
     get_reminder_analytics,
     get_audit_live_feed,
     get_system_health,
+    get_scheduler_metrics,
     get_doccode_analytics,
 )
 
@@ -96,6 +98,14 @@ def system_health(
 ):
     return get_system_health(db)
 
+
+@router.get("/scheduler-metrics", response_model=SchedulerMetricsResponse)
+def scheduler_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return get_scheduler_metrics(db)
+
 # =====================================================
 # 📄 DOCUMENT CODE ANALYTICS
 # =====================================================
@@ -94,12 +94,80 @@ class AuditLogResponse(BaseModel):
 class ServiceStatusItem(BaseModel):
     service: str
     status: str
+    detail: str | None = None
 
 
 class SystemHealthResponse(BaseModel):
     services: List[ServiceStatusItem]
 
 
+# =========================
+# SCHEDULER METRICS
+# =========================
+
+class LatencyBucket(BaseModel):
+    le: str
+    count: int
+
+
+class LatencyHistogram(BaseModel):
+    buckets: List[LatencyBucket]
+    count: int
+    sum: float
+
+
+class SchedulerProcessMetrics(BaseModel):
+    # the worker that answered this request only; see SchedulerClusterMetrics
+    pid: int
+    is_leader: bool
+    uptime_seconds: int
+    ticks_total: int
+    ticks_failed: int
+    last_tick_at: datetime | None
+    last_tick_duration_seconds: float | None
+    last_tick_scanned: int
+    last_tick_queued: int
+    last_tick_skipped: int
+    last_tick_error: str | None
+    last_successful_tick_at: datetime | None
+    reminders_scanned_total: int
+    reminders_queued_total: int
+    reminders_skipped_total: int
+    emails_sent_total: int
+    emails_failed_total: int
+    last_email_sent_at: datetime | None
+    smtp_latency_seconds: LatencyHistogram
+
+
+class SchedulerClusterMetrics(BaseModel):
+    # every process, from scheduler_ticks / email_outbox, last window_hours
+    window_hours: int
+    ticks_total: int
+    ticks_failed: int
+    last_tick_at: datetime | None
+    last_tick_duration_seconds: float | None
+    last_tick_pid: int | None
+    last_tick_error: str | None
+    last_successful_tick_at: datetime | None
+    reminders_scanned_total: int
+    reminders_queued_total: int
+    reminders_skipped_total: int
+    emails_sent_total: int
+    last_email_sent_at: datetime | None
+
+
+class SchedulerBacklog(BaseModel):
+    overdue_pending_reminders: int
+    outbox: Dict[str, int]
+    stale_outbox_emails: int
+
+
+class SchedulerMetricsResponse(BaseModel):
+    process: SchedulerProcessMetrics
+    cluster: SchedulerClusterMetrics
+    backlog: SchedulerBacklog
+
+
 # =========================
 # DOCUMENT CODE ANALYTICS ✅ REQUIRED
 # =========================
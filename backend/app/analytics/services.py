@@ -1,6 +1,16 @@
+import os
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from app.doccode.models import DocumentCode
 from app.analytics import queries, metrics
+from app.ai_routing.leader import elector
+from app.ai_routing.reminder_worker import TIMEZONE
+from app.ai_routing.scheduler_metrics import scheduler_metrics
+
+# outbox rows due longer than this mean email delivery is stuck
+STALE_OUTBOX_MINUTES = int(os.getenv("STALE_OUTBOX_MINUTES", "15"))
+# cluster-wide scheduler totals cover this many past hours
+SCHEDULER_METRICS_WINDOW_HOURS = int(os.getenv("SCHEDULER_METRICS_WINDOW_HOURS", "24"))
 
 def get_overview_kpis(db: Session, user_id: int):
     total_docs = queries.total_documents(db, user_id)
@@ -65,15 +75,61 @@ def get_audit_live_feed(db: Session, user_id: int, limit: int = 50):
     logs = queries.latest_audit_logs(db, user_id, limit)
     return metrics.build_audit_logs(logs)
 
+def get_scheduler_metrics(db: Session):
+    today = datetime.now(TIMEZONE).date()
+    since = datetime.now(timezone.utc) - timedelta(
+        hours=SCHEDULER_METRICS_WINDOW_HOURS
+    )
+
+    cluster = metrics.build_scheduler_cluster(
+        window_hours=SCHEDULER_METRICS_WINDOW_HOURS,
+        tick_totals=queries.tick_totals(db, since),
+        latest_tick=queries.latest_tick(db),
+        last_successful_tick_at=queries.last_successful_tick_at(db),
+        emails_sent=queries.emails_sent(db, since),
+    )
+
+    return metrics.build_scheduler_metrics(
+        process=scheduler_metrics.snapshot(),
+        is_leader=elector.is_leader,
+        cluster=cluster,
+        overdue_pending=queries.overdue_pending_reminders(db, today),
+        outbox_rows=queries.outbox_by_status(db),
+        stale_outbox=queries.stale_outbox_emails(db, STALE_OUTBOX_MINUTES),
+    )
+
+
 def get_system_health(db: Session):
+    today = datetime.now(TIMEZONE).date()
+
+    # scheduler is behind if yesterday's (or older) reminders are still
+    # PENDING, or if the last tick crashed — on whichever process ran it
+    overdue = queries.overdue_pending_reminders(db, today)
+    last_tick = queries.latest_tick(db)
+    scheduler_ok = (
+        overdue == 0
+        and not (last_tick and last_tick.error)
+    )
+
+    # reminders skipped unsent because they fell outside the catch-up
+    # window (REMINDER_CATCHUP_DAYS) while the scheduler was down
+    expired = queries.expired_reminders(db)
+
+    # email is unhealthy when due outbox rows are not being delivered
+    email_ok = queries.stale_outbox_emails(db, STALE_OUTBOX_MINUTES) == 0
+
     status_map = {
         "OCR Engine": True,
         "AI Engine": True,
-        "Scheduler": True,
-        "Email Service": True,
+        "Scheduler": scheduler_ok,
+        "Email Service": email_ok,
     }
 
-    return metrics.build_system_health(status_map)
+    return metrics.build_system_health(status_map, details={
+        "Scheduler": (
+            f"{overdue} overdue pending, {expired} expired unsent reminder(s)"
+        ),
+    })
 
 
 # =====================================================
@@ -0,0 +1,122 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from email import base64mime
+from email.message import EmailMessage, MIMEPart
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, int]  # (absolute path, mtime_ns, size)
+
+
+# =====================================================
+# ENCODED ATTACHMENT CACHE
+# =====================================================
+class AttachmentCache:
+    """
+    LRU cache of base64-encoded attachment bodies.
+
+    Keyed by (path, mtime, size), so an edited or replaced file is
+    re-read automatically. Total cached bytes stay under `max_bytes`;
+    files larger than `max_item_bytes` are encoded but never cached.
+    """
+
+    def __init__(self, max_bytes: int, max_item_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(path: str) -> Optional[CacheKey]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def encoded(self, path: str, key: CacheKey) -> str:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        with open(path, "rb") as f:
+            body = base64mime.body_encode(f.read())
+
+        if len(body) <= self.max_item_bytes:
+            self._store(key, body)
+
+        return body
+
+    def _store(self, key: CacheKey, body: str):
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = body
+            self._size += len(body)
+
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# =====================================================
+# MESSAGE HELPER
+# =====================================================
+def attach_cached(
+    msg: EmailMessage,
+    cache: AttachmentCache,
+    path: str,
+    *,
+    maintype: str = "application",
+    subtype: str = "octet-stream",
+) -> bool:
+    """
+    Attach `path` to `msg` using the cached encoding.
+    Returns False when the file does not exist.
+    """
+    key = cache.key_for(path)
+    if key is None:
+        return False
+
+    part = MIMEPart(policy=msg.policy)
+    part["Content-Type"] = f"{maintype}/{subtype}"
+    part["Content-Transfer-Encoding"] = "base64"
+    part.add_header(
+        "Content-Disposition",
+        "attachment",
+        filename=os.path.basename(path),
+    )
+    part.set_payload(cache.encoded(path, key))
+
+    if msg.get_content_maintype() != "multipart" or msg.get_content_subtype() != "mixed":
+        msg.make_mixed()
+    msg.attach(part)
+
+    return True
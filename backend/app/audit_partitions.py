@@ -0,0 +1,270 @@
+"""
+Monthly range partitions for the audit tables.
+
+Each table in PARTITIONED_TABLES is partitioned by its event time into
+`<table>_pYYYYMM` partitions plus a `<table>_default` catch-all.
+
+    ensure_audit_partitions()   create this month + AUDIT_PARTITION_PREMAKE_MONTHS
+    archive_audit_partitions()  detach partitions older than
+                                AUDIT_RETENTION_MONTHS, COPY them to
+                                gzip'd CSV in AUDIT_ARCHIVE_DIR, drop them
+
+The scheduler runs both daily on the elected leader; startup runs
+ensure_audit_partitions() so a fresh database can take inserts.
+
+CLI:
+    python -m app.audit_partitions            # ensure only
+    python -m app.audit_partitions --archive  # ensure + archive
+"""
+
+import argparse
+import gzip
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import DDL, Table, event, text
+from sqlalchemy.engine import Connection
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# table -> partition key
+PARTITIONED_TABLES = {
+    "audit_logs": "created_at",
+    "qr_physical_scan_logs": "scanned_at",
+    "qr_physical_audit_logs": "created_at",
+    "routing_audit_logs": "created_at",
+}
+
+AUDIT_PARTITION_PREMAKE_MONTHS = int(os.getenv("AUDIT_PARTITION_PREMAKE_MONTHS", "2"))
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "12"))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "archive/audit")
+# default look-back of per-document audit endpoints (0 = full history)
+AUDIT_DEFAULT_WINDOW_DAYS = int(os.getenv("AUDIT_DEFAULT_WINDOW_DAYS", "90"))
+
+# serialises partition DDL between workers starting together
+AUDIT_PARTITION_LOCK_KEY = 7262010002
+
+
+# =====================================================
+# MODEL HOOK
+# =====================================================
+def add_default_partition(table: Table):
+    """
+    create_all() makes the partitioned parent; give it a DEFAULT
+    partition so inserts work before the first monthly one exists.
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {table.name}_default "
+            f"PARTITION OF {table.name} DEFAULT"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+def window_start(days: Optional[int]) -> Optional[datetime]:
+    """
+    Lower time bound for audit reads: filtering on the partition key
+    lets Postgres skip older partitions entirely.
+    """
+    if not days:
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+# =====================================================
+# MONTH HELPERS
+# =====================================================
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _partition_month(table: str, name: str) -> Optional[date]:
+    suffix = name[len(table) + 2:]
+    if not name.startswith(f"{table}_p") or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def _is_partitioned(conn: Connection, table: str) -> bool:
+    return bool(conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :t"
+        ),
+        {"t": table},
+    ).scalar())
+
+
+def _attached_partitions(conn: Connection, table: str) -> List[str]:
+    return conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :t"
+        ),
+        {"t": table},
+    ).scalars().all()
+
+
+# =====================================================
+# CREATE
+# =====================================================
+def _create_month(conn: Connection, table: str, column: str, month: date):
+    name = partition_name(table, month)
+    start, end = month, add_months(month, 1)
+
+    # build standalone, pull matching rows out of DEFAULT, then attach:
+    # attaching fails while DEFAULT still holds rows for the range
+    conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    conn.execute(
+        text(
+            f"WITH moved AS ("
+            f" DELETE FROM {table}_default"
+            f" WHERE {column} >= :start AND {column} < :end RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    conn.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info("Created audit partition %s", name)
+
+
+def ensure_audit_partitions(
+    today: Optional[date] = None,
+    months_ahead: int = AUDIT_PARTITION_PREMAKE_MONTHS,
+) -> List[str]:
+    """Create missing monthly partitions. Returns the names created."""
+    if engine.dialect.name != "postgresql":
+        return []
+
+    first = month_start(today or datetime.now(timezone.utc).date())
+    created: List[str] = []
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": AUDIT_PARTITION_LOCK_KEY},
+        )
+
+        for table, column in PARTITIONED_TABLES.items():
+            if not _is_partitioned(conn, table):
+                logger.warning("%s is not partitioned; run the migrations", table)
+                continue
+
+            existing = set(_attached_partitions(conn, table))
+            if f"{table}_default" not in existing:
+                conn.execute(text(
+                    f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"
+                ))
+
+            for offset in range(months_ahead + 1):
+                month = add_months(first, offset)
+                if partition_name(table, month) not in existing:
+                    _create_month(conn, table, column, month)
+                    created.append(partition_name(table, month))
+
+    return created
+
+
+# =====================================================
+# RETENTION
+# =====================================================
+def _copy_out(conn: Connection, name: str, path: str):
+    tmp_path = path + ".tmp"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        with gzip.open(tmp_path, "wb") as f:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", f)
+    finally:
+        cursor.close()
+    os.replace(tmp_path, path)
+
+
+def archive_audit_partitions(
+    today: Optional[date] = None,
+    retention_months: int = AUDIT_RETENTION_MONTHS,
+    archive_dir: str = AUDIT_ARCHIVE_DIR,
+) -> List[str]:
+    """
+    Detach, archive and drop partitions whose whole month is older than
+    the retention window. Returns the archived file paths.
+    """
+    if engine.dialect.name != "postgresql" or retention_months <= 0:
+        return []
+
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived: List[str] = []
+
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as conn:
+            if not _is_partitioned(conn, table):
+                continue
+            names = sorted(_attached_partitions(conn, table))
+
+        for name in names:
+            month = _partition_month(table, name)
+            if month is None or month >= cutoff:
+                continue
+
+            path = os.path.join(archive_dir, f"{name}.csv.gz")
+
+            # one partition per transaction: a failure leaves it attached
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                _copy_out(conn, name, path)
+                conn.execute(text(f"DROP TABLE {name}"))
+
+            logger.info("Archived audit partition %s to %s", name, path)
+            archived.append(path)
+
+    return archived
+
+
+def maintain_audit_partitions():
+    """Scheduler entry point."""
+    try:
+        ensure_audit_partitions()
+        archive_audit_partitions()
+    except Exception:
+        logger.exception("Audit partition maintenance failed")
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Maintain audit log partitions")
+    parser.add_argument("--archive", action="store_true", help="also archive old partitions")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    result = {"created": ensure_audit_partitions()}
+    if args.archive:
+        result["archived"] = archive_audit_partitions()
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
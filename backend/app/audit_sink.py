@@ -0,0 +1,203 @@
+"""
+Buffered audit-log writer.
+
+High-volume, low-stakes events (views, opens, downloads, QR scans) are
+queued in-process and written by a background thread in multi-row
+INSERTs every AUDIT_FLUSH_EVENTS events or AUDIT_FLUSH_MS milliseconds,
+whichever comes first, on their own connection — so the request
+transaction no longer carries an audit INSERT.
+
+Security-relevant actions (edits, deletes, revokes, logins) keep using
+Durability.SYNC: the row is added to the caller's session and commits
+or rolls back with the change it records.
+
+Buffered rows are lost if the process is killed hard; a normal shutdown
+calls audit_sink.stop(), which flushes what is queued.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BUFFERING = os.getenv("AUDIT_BUFFERING", "true") == "true"
+AUDIT_FLUSH_EVENTS = int(os.getenv("AUDIT_FLUSH_EVENTS", "200"))
+AUDIT_FLUSH_MS = int(os.getenv("AUDIT_FLUSH_MS", "500"))
+# oldest events are dropped beyond this (database down for a long time)
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "50000"))
+
+# event time is taken when the event happens, not when it is flushed
+TIMESTAMP_COLUMNS = ("created_at", "scanned_at", "downloaded_at")
+
+
+class Durability:
+    SYNC = "sync"          # same transaction as the request
+    BUFFERED = "buffered"  # queued, written within AUDIT_FLUSH_MS
+
+
+# =====================================================
+# SINK
+# =====================================================
+class AuditSink:
+    def __init__(
+        self,
+        bind: Engine,
+        flush_events: int,
+        flush_ms: int,
+        max_queue: int,
+    ):
+        self.bind = bind
+        self.flush_events = flush_events
+        self.flush_interval = flush_ms / 1000
+        self.max_queue = max_queue
+
+        self._queue: Deque[Tuple[type, Dict]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.written = 0
+        self.dropped = 0
+
+    # ---------------- producer ----------------
+
+    def record(self, model: type, values: Dict):
+        columns = model.__table__.c
+        for name in TIMESTAMP_COLUMNS:
+            if name in columns and values.get(name) is None:
+                values[name] = datetime.now(timezone.utc)
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append((model, values))
+            pending = len(self._queue)
+
+        self._ensure_started()
+        if pending >= self.flush_events:
+            self._wake.set()
+
+    # ---------------- writer ----------------
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name="audit-sink",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything queued so far. Returns rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._queue)
+                self._queue.clear()
+
+            if not batch:
+                return 0
+
+            # one executemany per table and column set
+            groups: Dict[Tuple, List[Dict]] = {}
+            for model, values in batch:
+                key = (model.__table__, tuple(sorted(values)))
+                groups.setdefault(key, []).append(values)
+
+            written = 0
+            for (table, _), rows in groups.items():
+                written += self._insert(table, rows)
+
+            self.written += written
+            return written
+
+    def _insert(self, table, rows: List[Dict]) -> int:
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(insert(table), rows)
+            return len(rows)
+        except Exception:
+            logger.exception(
+                "Audit batch insert into %s failed; retrying row by row",
+                table.name,
+            )
+
+        # e.g. one row points at a document deleted since it was queued
+        written = 0
+        for row in rows:
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(insert(table), row)
+                written += 1
+            except Exception as e:
+                self.dropped += 1
+                logger.warning("Dropping audit row for %s: %s", table.name, e)
+        return written
+
+    def stop(self):
+        """Stop the writer thread and flush what is left."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "written": self.written,
+                "dropped": self.dropped,
+            }
+
+
+audit_sink = AuditSink(
+    engine,
+    flush_events=AUDIT_FLUSH_EVENTS,
+    flush_ms=AUDIT_FLUSH_MS,
+    max_queue=AUDIT_QUEUE_MAX,
+)
+
+
+# =====================================================
+# HELPER
+# =====================================================
+def audit(
+    db: Session,
+    model: type,
+    durability: str = Durability.SYNC,
+    **values,
+):
+    """
+    Record an audit row. SYNC adds it to `db` (the caller commits);
+    BUFFERED hands it to the background writer.
+    """
+    if durability == Durability.BUFFERED and AUDIT_BUFFERING:
+        audit_sink.record(model, values)
+    else:
+        db.add(model(**values))
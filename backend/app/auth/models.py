@@ -7,7 +7,8 @@ from sqlalchemy import (
     ForeignKey,
     Boolean,
     CheckConstraint,
-    DateTime
+    DateTime,
+    Index,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,6 +16,7 @@ from sqlalchemy.dialects.postgresql import ARRAY
 
 
 from app.database import Base
+from app.search.vectors import search_vector_column
 
 
 # =======================
@@ -120,6 +122,8 @@ class OCRHistory(Base):
     filename = Column(String(255), nullable=False)
     extracted_text = Column(Text, nullable=False)
 
+    search_vector = search_vector_column(("filename", "A"), ("extracted_text", "B"))
+
     user_id = Column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -134,6 +138,10 @@ class OCRHistory(Base):
 
     user = relationship("User", back_populates="ocr_histories")
 
+    __table_args__ = (
+        Index("idx_ocr_history_search", "search_vector", postgresql_using="gin"),
+    )
+
 
 # =======================
 # AI DOCUMENT
@@ -146,6 +154,7 @@ class AIDocument(Base):
             "language IN ('english', 'hindi')",
             name="check_ai_language"
         ),
+        Index("idx_ai_documents_search", "search_vector", postgresql_using="gin"),
     )
 
     id = Column(Integer, primary_key=True)
@@ -166,6 +175,8 @@ class AIDocument(Base):
     summary = Column(Text, nullable=True)
     tags = Column(ARRAY(Text), nullable=True)
 
+    search_vector = search_vector_column(("file_name", "A"), ("summary", "B"))
+
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
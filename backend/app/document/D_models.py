@@ -16,6 +16,8 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime, timezone
 from app.database import Base
+from app.audit_partitions import add_default_partition
+from app.search.vectors import search_vector_column
 from app.auth.models import User
 
 
@@ -58,9 +60,19 @@ class Document(Base):
 
     is_deleted = Column(Boolean, default=False, nullable=False)
 
+    # maintained counters (bumped with the event, never recounted)
+    view_count = Column(Integer, default=0, server_default="0", nullable=False)
+    shared_open_count = Column(Integer, default=0, server_default="0", nullable=False)
+    download_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # last DocumentVersion.version_number handed out
+    version_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    search_vector = search_vector_column(("file_name", "A"), ("content", "B"))
+
     __table_args__ = (
         Index("idx_tracking_id", "tracking_id"),
         Index("idx_document_deleted", "is_deleted"),
+        Index("idx_documents_search", "search_vector", postgresql_using="gin"),
     )
 
     # ================= RELATIONSHIPS =================
@@ -135,9 +147,14 @@ class DocumentVersion(Base):
     )
 
     version_number = Column(Integer, nullable=False)
+    # full text on snapshot versions, NULL on delta versions
     content = Column(Text)
     diff = Column(Text)
 
+    # see app.document.version_store
+    is_snapshot = Column(Boolean, server_default="false", nullable=False)
+    delta = Column(Text)
+
     stored_file_name = Column(String)
     summary = Column(Text)
     tags = Column(ARRAY(String))
@@ -219,7 +236,7 @@ class DocumentAccess(Base):
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     module = Column(String(50), nullable=False)
     action = Column(String(50), nullable=False)
@@ -240,16 +257,28 @@ class AuditLog(Base):
     extra_data = Column(Text)
     client_info = Column(Text)
 
+    # partition key: must be part of the table's primary key
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
         nullable=False,
+        primary_key=True,
     )
 
+    __table_args__ = (
+        Index("idx_audit_logs_doc_time", "document_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # rows are still addressed by id alone
+    __mapper_args__ = {"primary_key": [id]}
+
     document = relationship("Document", back_populates="audit_logs")
     performed_by_user = relationship("User", foreign_keys=[performed_by])
 
 
+add_default_partition(AuditLog.__table__)
+
+
 # =====================================================
 # LIVE VIEWERS
 # =====================================================
@@ -0,0 +1,347 @@
+"""
+Line diff engine for document versions.
+
+Lines are interned to ints first, so every comparison is an int compare
+regardless of line length. Common prefix/suffix are trimmed, lines that
+are unique on both sides anchor a patience split (longest increasing
+subsequence), and whatever is left between anchors goes through Myers'
+O(ND) greedy diff. Regions whose edit distance exceeds
+DIFF_MAX_EDIT_DISTANCE are reported as a single replace block instead
+of being searched further.
+
+diff_opcodes() returns SequenceMatcher-style opcodes and works on any
+sequence of hashables, so the same engine refines replaced lines word
+by word.
+"""
+
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+DIFF_MAX_EDIT_DISTANCE = int(os.getenv("DIFF_MAX_EDIT_DISTANCE", "2000"))
+DIFF_CACHE_MAX_BYTES = int(os.getenv("DIFF_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+Opcode = Tuple[str, int, int, int, int]
+Match = Tuple[int, int]
+
+_WORD_RE = re.compile(r"\s+|\w+|[^\w\s]", re.UNICODE)
+
+
+# =====================================================
+# MATCHING
+# =====================================================
+def _patience_anchors(
+    a: List[int], alo: int, ahi: int,
+    b: List[int], blo: int, bhi: int,
+) -> List[Match]:
+    """Lines unique in both ranges, longest run kept in order on both sides."""
+    count_a = Counter(a[alo:ahi])
+    count_b = Counter(b[blo:bhi])
+
+    pos_b: Dict[int, int] = {}
+    for j in range(blo, bhi):
+        if count_b[b[j]] == 1 and count_a[b[j]] == 1:
+            pos_b[b[j]] = j
+
+    pairs = [(i, pos_b[a[i]]) for i in range(alo, ahi) if a[i] in pos_b]
+    if not pairs:
+        return []
+
+    # longest increasing subsequence of j (patience sorting)
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev: List[int] = [-1] * len(pairs)
+
+    for idx, (_, j) in enumerate(pairs):
+        pile = bisect_left(tails, j)
+        if pile == len(tails):
+            tails.append(j)
+            tail_idx.append(idx)
+        else:
+            tails[pile] = j
+            tail_idx[pile] = idx
+        prev[idx] = tail_idx[pile - 1] if pile else -1
+
+    anchors: List[Match] = []
+    idx = tail_idx[-1]
+    while idx != -1:
+        anchors.append(pairs[idx])
+        idx = prev[idx]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(
+    a: List[int], alo: int, ahi: int,
+    b: List[int], blo: int, bhi: int,
+    out: List[Match],
+):
+    n, m = ahi - alo, bhi - blo
+    max_d = min(n + m, DIFF_MAX_EDIT_DISTANCE)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)  # v[k + offset]: furthest x on diagonal k
+    trace: List[List[int]] = []
+
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1 + offset] < v[k + 1 + offset]):
+                x = v[k + 1 + offset]
+            else:
+                x = v[k - 1 + offset] + 1
+            y = x - k
+
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[k + offset] = x
+
+            if x >= n and y >= m:
+                out.extend(_myers_backtrack(trace, d, n, m, alo, blo))
+                return
+
+        # diagonals -d..d after step d
+        trace.append(v[offset - d:offset + d + 1])
+
+    # too far apart: leave the region as one replace block
+
+
+def _myers_backtrack(
+    trace: List[List[int]], depth: int, n: int, m: int, alo: int, blo: int,
+) -> List[Match]:
+    x, y = n, m
+    matches: List[Match] = []
+
+    for d in range(depth, 0, -1):
+        vp = trace[d - 1]
+        k = x - y
+
+        if k == -d or (k != d and vp[k - 1 + d - 1] < vp[k + 1 + d - 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+
+        prev_x = vp[prev_k + d - 1]
+        prev_y = prev_x - prev_k
+
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+
+        x, y = prev_x, prev_y
+
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((alo + x, blo + y))
+
+    matches.reverse()
+    return matches
+
+
+def _match(
+    a: List[int], alo: int, ahi: int,
+    b: List[int], blo: int, bhi: int,
+    out: List[Match],
+):
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        out.append((alo, blo))
+        alo += 1
+        blo += 1
+
+    tail: List[Match] = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        tail.append((ahi, bhi))
+
+    if alo < ahi and blo < bhi:
+        anchors = _patience_anchors(a, alo, ahi, b, blo, bhi)
+
+        if anchors:
+            i0, j0 = alo, blo
+            for i, j in anchors:
+                _match(a, i0, i, b, j0, j, out)
+                out.append((i, j))
+                i0, j0 = i + 1, j + 1
+            _match(a, i0, ahi, b, j0, bhi, out)
+        else:
+            _myers(a, alo, ahi, b, blo, bhi, out)
+
+    out.extend(reversed(tail))
+
+
+# =====================================================
+# OPCODES
+# =====================================================
+def diff_opcodes(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Opcode]:
+    """
+    ("equal" | "replace" | "delete" | "insert", i1, i2, j1, j2) blocks
+    covering both sequences, as difflib.SequenceMatcher.get_opcodes().
+    """
+    ids: Dict[Hashable, int] = {}
+    ha = [ids.setdefault(x, len(ids)) for x in a]
+    hb = [ids.setdefault(x, len(ids)) for x in b]
+
+    matches: List[Match] = []
+    _match(ha, 0, len(ha), hb, 0, len(hb), matches)
+
+    opcodes: List[List] = []
+    i = j = 0
+
+    for mi, mj in matches + [(len(ha), len(hb))]:
+        if i < mi or j < mj:
+            if i < mi and j < mj:
+                tag = "replace"
+            elif i < mi:
+                tag = "delete"
+            else:
+                tag = "insert"
+            opcodes.append([tag, i, mi, j, mj])
+
+        if mi < len(ha):
+            last = opcodes[-1] if opcodes else None
+            if last and last[0] == "equal" and last[2] == mi and last[4] == mj:
+                last[2] += 1
+                last[4] += 1
+            else:
+                opcodes.append(["equal", mi, mi + 1, mj, mj + 1])
+
+        i, j = mi + 1, mj + 1
+
+    return [tuple(op) for op in opcodes]
+
+
+# =====================================================
+# TEXT DIFF
+# =====================================================
+def _word_changes(old_line: str, new_line: str) -> List[List[str]]:
+    a = _WORD_RE.findall(old_line)
+    b = _WORD_RE.findall(new_line)
+    changes: List[List[str]] = []
+
+    def emit(op: str, text: str):
+        if not text:
+            return
+        if changes and changes[-1][0] == op:
+            changes[-1][1] += text
+        else:
+            changes.append([op, text])
+
+    for tag, i1, i2, j1, j2 in diff_opcodes(a, b):
+        if tag == "equal":
+            emit("=", "".join(a[i1:i2]))
+            continue
+        emit("-", "".join(a[i1:i2]))
+        emit("+", "".join(b[j1:j2]))
+
+    return changes
+
+
+def text_diff(old_text: str, new_text: str, words: bool = False) -> Dict:
+    """
+    ndiff-style lines ("  ", "- ", "+ ") plus a summary; with `words`,
+    replaced lines are also paired up and diffed word by word.
+    """
+    a = old_text.splitlines()
+    b = new_text.splitlines()
+
+    diff: List[str] = []
+    word_diff: List[Dict] = []
+    added = removed = 0
+
+    for tag, i1, i2, j1, j2 in diff_opcodes(a, b):
+        if tag == "equal":
+            diff.extend("  " + line for line in a[i1:i2])
+            continue
+
+        diff.extend("- " + line for line in a[i1:i2])
+        diff.extend("+ " + line for line in b[j1:j2])
+        removed += i2 - i1
+        added += j2 - j1
+
+        if words and tag == "replace":
+            for offset in range(min(i2 - i1, j2 - j1)):
+                word_diff.append({
+                    "old_line": i1 + offset + 1,
+                    "new_line": j1 + offset + 1,
+                    "changes": _word_changes(a[i1 + offset], b[j1 + offset]),
+                })
+
+    result = {
+        "diff": diff,
+        "summary": {
+            "lines_added": added,
+            "lines_removed": removed,
+            "total_changes": added + removed,
+        },
+    }
+    if words:
+        result["word_diff"] = word_diff
+    return result
+
+
+# =====================================================
+# RESULT CACHE
+# =====================================================
+class DiffCache:
+    """
+    LRU of text_diff() results, bounded by the characters of their diff
+    lines. Keyed by version pair, which never changes once written.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Hashable, Tuple[Dict, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, result: Dict):
+        size = sum(len(line) for line in result["diff"])
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = (result, size)
+            self._size += size
+
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+diff_cache = DiffCache(DIFF_CACHE_MAX_BYTES)
@@ -8,16 +8,18 @@ from fastapi import (
     Request,
     
 )
-from sqlalchemy import func
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from pathlib import Path
 
 from typing import Optional
 from uuid import uuid4
-import difflib
+import io
 
 
 from app.database import get_db
+from app.audit_sink import Durability, audit
+from app.audit_partitions import AUDIT_DEFAULT_WINDOW_DAYS, window_start
 from app.auth.models import User
 from app.document.D_models import (
     Document,
@@ -26,11 +28,16 @@ from app.document.D_models import (
     DocumentShareLink,
     DocumentDownloadLog,
 )
-from fastapi.responses import FileResponse
-import tempfile
+from app.document.version_store import add_version, version_content
+from app.document.diff_engine import diff_cache, text_diff
+from app.document.render_cache import (
+    cached_file_response,
+    render_cache,
+    render_key,
+    streaming_render_response,
+)
+from app.document.pdf_stream import stream_pdf
 from docx import Document as DocxDocument
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from datetime import datetime, timezone
 
 from app.auth.utils import (
@@ -55,6 +62,34 @@ router = APIRouter(prefix="/documents", tags=["Documents"])
 UPLOAD_DIR = Path("uploads/documents")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+
+# =====================================================
+# DOCUMENT COUNTERS
+# =====================================================
+def bump_document_counters(db: Session, document_id: int, **increments: int):
+    """
+    Atomic `col = col + n` on Document, returning the new values.
+    A Core UPDATE, so it does not touch last_updated_at.
+    """
+    columns = [getattr(Document, name) for name in increments]
+
+    return db.execute(
+        update(Document)
+        .where(Document.id == document_id)
+        .values({col: col + n for col, n in zip(columns, increments.values())})
+        .returning(*columns)
+    ).one()
+
+# =====================================================
+# EXPORT RENDERERS
+# =====================================================
+def render_docx(content: str, path: str):
+    doc = DocxDocument()
+    for line in content.splitlines():
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
 # =====================================================
 # LIVE VIEWERS (WEBSOCKET STORAGE)
 # =====================================================
@@ -226,20 +261,23 @@ def open_shared_document(
     link.opened_count += 1  
     link.last_opened_at = now
 
+    bump_document_counters(db, document.id, shared_open_count=1)
+
     watermark = {
         "text": f"Shared | {request.client.host} | {now.isoformat()}",
         "opacity": 0.15,
     }
 
 
-    db.add(
-        AuditLog(
-            module="documents",
-            action="open_shared",
-            event_type="view",
-            document_id=document.id,
-            client_info=build_client_info(request),
-        )
+    audit(
+        db,
+        AuditLog,
+        Durability.BUFFERED,
+        module="documents",
+        action="open_shared",
+        event_type="view",
+        document_id=document.id,
+        client_info=build_client_info(request),
     )
 
     db.commit()
@@ -265,8 +303,16 @@ def list_documents(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    documents = (
-        db.query(Document)
+    rows = (
+        db.query(
+            Document.id,
+            Document.file_name,
+            Document.tracking_id,
+            Document.file_type,
+            Document.last_updated_at,
+            # maintained counter: no per-document aggregation
+            Document.shared_open_count.label("total_opens"),
+        )
         .filter(
             Document.is_deleted == False,
             Document.owner_id == current_user.id,
@@ -275,26 +321,17 @@ def list_documents(
         .all()
     )
 
-    result = []
-
-    for d in documents:
-        shared_opens = (
-            db.query(DocumentShareLink)
-            .filter(DocumentShareLink.document_id == d.id)
-            .with_entities(func.coalesce(func.sum(DocumentShareLink.opened_count), 0))
-            .scalar()
-        )
-
-        result.append({
-            "id": d.id,
-            "file_name": d.file_name,
-            "tracking_id": d.tracking_id,
-            "file_type": d.file_type,
-            "last_updated_at": d.last_updated_at,
-            "total_opens": shared_opens or 0,
-        })
-
-    return result
+    return [
+        {
+            "id": r.id,
+            "file_name": r.file_name,
+            "tracking_id": r.tracking_id,
+            "file_type": r.file_type,
+            "last_updated_at": r.last_updated_at,
+            "total_opens": int(r.total_opens or 0),
+        }
+        for r in rows
+    ]
 
 
 # =====================================================
@@ -321,34 +358,19 @@ def preview_document(
 
     document.last_viewed_by = current_user.id
 
-    db.add(
-        AuditLog(
-            module="documents",
-            action="view",
-            event_type="view",
-            document_id=document.id,
-            performed_by=current_user.id,
-            client_info=build_client_info(request),
-        )
-    )
-    owner_views = (
-        db.query(AuditLog)
-        .filter(
-            AuditLog.document_id == document.id,
-            AuditLog.action == "view",
-        )
-        .count()
-    )
-
-# Shared link opens
-    shared_opens = (
-        db.query(DocumentShareLink)
-        .filter(DocumentShareLink.document_id == document.id)
-        .with_entities(func.coalesce(func.sum(DocumentShareLink.opened_count), 0))
-        .scalar()
+    audit(
+        db,
+        AuditLog,
+        Durability.BUFFERED,
+        module="documents",
+        action="view",
+        event_type="view",
+        document_id=document.id,
+        performed_by=current_user.id,
+        client_info=build_client_info(request),
     )
-
-    total_opens = owner_views + (shared_opens or 0)
+    counts = bump_document_counters(db, document.id, view_count=1)
+    total_opens = counts.view_count + document.shared_open_count
 
     db.commit()
 
@@ -390,29 +412,7 @@ def update_document(
     previous_content = document.content or ""
     document.content = content.strip()
 
-    version_number = (
-        db.query(DocumentVersion)
-        .filter(DocumentVersion.document_id == document.id)
-        .count()
-        + 1
-    )
-
-    diff_text = "\n".join(
-        difflib.ndiff(
-            previous_content.splitlines(),
-            document.content.splitlines(),
-        )
-    )
-
-    db.add(
-        DocumentVersion(
-            document_id=document.id,
-            version_number=version_number,
-            content=document.content,
-            diff=diff_text,
-            created_by=current_user.id,
-        )
-    )
+    add_version(db, document, previous_content, created_by=current_user.id)
 
     db.add(
         AuditLog(
@@ -460,14 +460,16 @@ def track_download(
 
     check_access(current_user, document, "view")
 
-    db.add(
-        DocumentDownloadLog(
-            document_id=document.id,
-            downloaded_by=current_user.id,
-            format=format,
-            client_info=build_client_info(request),
-        )
+    audit(
+        db,
+        DocumentDownloadLog,
+        Durability.BUFFERED,
+        document_id=document.id,
+        downloaded_by=current_user.id,
+        format=format,
+        client_info=build_client_info(request),
     )
+    bump_document_counters(db, document.id, download_count=1)
 
     db.commit()
     return {"status": "logged"}
@@ -547,29 +549,7 @@ def edit_shared_document(
     document.content = content.strip()
 
     # 🔹 Create version
-    version_number = (
-        db.query(DocumentVersion)
-        .filter(DocumentVersion.document_id == document.id)
-        .count()
-        + 1
-    )
-
-    diff_text = "\n".join(
-        difflib.ndiff(
-            previous_content.splitlines(),
-            document.content.splitlines(),
-        )
-    )
-
-    db.add(
-        DocumentVersion(
-            document_id=document.id,
-            version_number=version_number,
-            content=document.content,
-            diff=diff_text,
-            created_by=link.created_by,  # shared editor
-        )
-    )
+    add_version(db, document, previous_content, created_by=link.created_by)  # shared editor
 
     # 🔹 Audit log
     db.add(
@@ -612,53 +592,34 @@ def download_shared_document(
         raise HTTPException(status_code=404, detail="Document not found")
 
     # 🔹 Audit log
-    db.add(
-        AuditLog(
-            module="documents",
-            action="shared_download",
-            event_type="download",
-            document_id=document.id,
-            client_info=build_client_info(request),
-        )
+    audit(
+        db,
+        AuditLog,
+        Durability.BUFFERED,
+        module="documents",
+        action="shared_download",
+        event_type="download",
+        document_id=document.id,
+        client_info=build_client_info(request),
     )
     db.commit()
 
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=f".{format}")
+    # a document's text only changes with a new version
+    key = render_key(document.id, document.version_count, format)
+    content = document.content or ""
+    filename = f"{document.file_name}.{format}"
 
-
-
-    # ---------- DOCX ----------
     if format == "docx":
-        doc = DocxDocument()
-        for line in (document.content or "").splitlines():
-            doc.add_paragraph(line)
-
-        tmp.close()
-        doc.save(tmp.name)
-
-        return FileResponse(
-            tmp.name,
-            filename=f"{document.file_name}.docx",
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        )
+        path = render_cache.get_or_render(key, lambda out: render_docx(content, out))
+        return cached_file_response(key, path, filename)
 
-    # ---------- PDF ----------
-    c = canvas.Canvas(tmp.name, pagesize=A4)
-    text = c.beginText(40, 800)
+    # PDFs are paginated and streamed page by page on a miss
+    path = render_cache.lookup(key)
+    if path:
+        return cached_file_response(key, path, filename)
 
-    for line in (document.content or "").splitlines():
-        text.textLine(line)
-
-    c.drawText(text)
-    c.showPage()
-    c.save()
-    tmp.close()
-
-    return FileResponse(
-        tmp.name,
-        filename=f"{document.file_name}.pdf",
-        media_type="application/pdf",
-    )
+    lines = (line.rstrip("\r\n") for line in io.StringIO(content))
+    return streaming_render_response(key, stream_pdf(lines), filename)
 
 
 @router.post("/share/{token}/revoke")
@@ -717,6 +678,7 @@ def list_versions(
 def version_diff(
     doc_id: int,
     version_id: int,
+    words: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -752,35 +714,32 @@ def version_diff(
         .first()
     )
 
-    old_text = prev_version.content if prev_version else ""
-    new_text = version.content or ""
-
-    diff = list(difflib.ndiff(
-        old_text.splitlines(),
-        new_text.splitlines(),
-    ))
+    # versions never change, so a pair's diff can be reused as-is
+    key = (
+        doc_id,
+        prev_version.version_number if prev_version else None,
+        version.version_number,
+        words,
+    )
+    result = diff_cache.get(key)
 
-    # 🔹 Summary
-    added = [l for l in diff if l.startswith("+ ")]
-    removed = [l for l in diff if l.startswith("- ")]
-
-    summary = {
-        "lines_added": len(added),
-        "lines_removed": len(removed),
-        "total_changes": len(added) + len(removed),
-    }
+    if result is None:
+        old_text = version_content(db, prev_version) if prev_version else ""
+        new_text = version_content(db, version)
+        result = text_diff(old_text, new_text, words=words)
+        diff_cache.put(key, result)
 
     return {
         "previous_version": prev_version.version_number if prev_version else None,
         "current_version": version.version_number,
-        "diff": diff,
-        "summary": summary,
+        **result,
     }
 
 
 @router.get("/{doc_id}/audit-logs")
 def get_document_audit_logs(
     doc_id: int,
+    days: int = AUDIT_DEFAULT_WINDOW_DAYS,  # 0 = full history
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -799,12 +758,14 @@ def get_document_audit_logs(
             detail="Only owner can view audit logs",
         )
 
-    logs = (
-        db.query(AuditLog)
-        .filter(AuditLog.document_id == doc_id)
-        .order_by(AuditLog.created_at.desc())
-        .all()
-    )
+    query = db.query(AuditLog).filter(AuditLog.document_id == doc_id)
+
+    # bounded on the partition key, so older months are never scanned
+    since = window_start(days)
+    if since:
+        query = query.filter(AuditLog.created_at >= since)
+
+    logs = query.order_by(AuditLog.created_at.desc()).all()
 
     return [
         {
@@ -0,0 +1,259 @@
+"""
+Streaming plain-text → PDF writer.
+
+reportlab's canvas keeps every page in memory until save(), so a long
+document is fully built before the first byte can be sent. This writer
+lays text out one page at a time, emits each page's objects as soon as
+the page is full, and only keeps object offsets and the set of glyphs
+used; the font, page tree and xref table are written at the end (PDF
+allows objects in any order).
+
+Text is set in Noto Sans Devanagari (Latin + Hindi), embedded as a
+CIDFontType2 with Identity-H encoding. As with the rest of the app's PDF
+exports, glyphs are not shaped, so conjuncts render as their components.
+"""
+
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.ttfonts import TTFontFile
+
+FONT_PATH = Path(__file__).resolve().parent.parent / "fonts" / "NotoSansDevanagari-Regular.ttf"
+
+PDF_FONT_SIZE = 11
+PDF_LEADING = 15
+PDF_MARGIN = 40
+
+# fixed object numbers; pages take 2 objects each from FIRST_PAGE_OBJ
+CATALOG_OBJ = 1
+PAGES_OBJ = 2
+FONT_OBJ = 3
+CID_FONT_OBJ = 4
+DESCRIPTOR_OBJ = 5
+FONT_FILE_OBJ = 6
+TO_UNICODE_OBJ = 7
+FIRST_PAGE_OBJ = 8
+
+
+# =====================================================
+# FONT
+# =====================================================
+@lru_cache(maxsize=1)
+def _font():
+    ttf = TTFontFile(str(FONT_PATH))
+    raw = FONT_PATH.read_bytes()
+    return ttf, len(raw), zlib.compress(raw)
+
+
+def _font_name(ttf) -> str:
+    name = ttf.name
+    return name.decode("latin-1") if isinstance(name, bytes) else name
+
+
+# =====================================================
+# LAYOUT
+# =====================================================
+def _text_width(text: str, widths: Dict[int, float], default: float) -> float:
+    return sum(widths.get(ord(ch), default) for ch in text) * PDF_FONT_SIZE / 1000
+
+
+def _wrap(line: str, max_width: float, widths: Dict[int, float], default: float) -> List[str]:
+    """Greedy word wrap; words wider than the line are broken by character."""
+    line = line.replace("\t", "    ").rstrip()
+    if _text_width(line, widths, default) <= max_width:
+        return [line]
+
+    rows: List[str] = []
+    current = ""
+
+    for word in line.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if _text_width(candidate, widths, default) <= max_width:
+            current = candidate
+            continue
+
+        if current:
+            rows.append(current)
+            current = ""
+
+        while _text_width(word, widths, default) > max_width:
+            cut = 1
+            while cut < len(word) and _text_width(word[:cut + 1], widths, default) <= max_width:
+                cut += 1
+            rows.append(word[:cut])
+            word = word[cut:]
+        current = word
+
+    rows.append(current)
+    return rows
+
+
+# =====================================================
+# WRITER
+# =====================================================
+def _stream_obj(num: int, data: bytes, extra: str = "") -> bytes:
+    body = zlib.compress(data)
+    return (
+        f"{num} 0 obj\n<< /Length {len(body)} /Filter /FlateDecode {extra}>>\nstream\n".encode()
+        + body
+        + b"\nendstream\nendobj\n"
+    )
+
+
+def _obj(num: int, body: str) -> bytes:
+    return f"{num} 0 obj\n{body}\nendobj\n".encode()
+
+
+def stream_pdf(lines: Iterable[str]) -> Iterator[bytes]:
+    """
+    Yield a complete PDF for `lines`, one page's bytes at a time.
+    """
+    ttf, raw_len, font_data = _font()
+    widths = ttf.charWidths
+    default = ttf.defaultWidth or 0
+    cmap = ttf.charToGlyph
+
+    page_w, page_h = A4
+    max_width = page_w - 2 * PDF_MARGIN
+    rows_per_page = max(1, int((page_h - 2 * PDF_MARGIN) // PDF_LEADING))
+
+    offsets: Dict[int, int] = {}
+    used: Dict[int, float] = {}      # gid -> width (1/1000 em)
+    to_unicode: Dict[int, str] = {}  # gid -> char
+    page_objs: List[int] = []
+    pos = 0
+
+    def emit(num: int, data: bytes) -> bytes:
+        nonlocal pos
+        offsets[num] = pos
+        pos += len(data)
+        return data
+
+    def encode(row: str) -> str:
+        gids = []
+        for ch in row:
+            gid = cmap.get(ord(ch), 0)
+            used.setdefault(gid, widths.get(ord(ch), default))
+            to_unicode.setdefault(gid, ch)
+            gids.append(f"{gid:04X}")
+        return "".join(gids)
+
+    def page(rows: List[str]) -> bytes:
+        content_num = FIRST_PAGE_OBJ + 2 * len(page_objs)
+        page_num = content_num + 1
+        page_objs.append(page_num)
+
+        ops = [
+            "BT",
+            f"/F1 {PDF_FONT_SIZE} Tf",
+            f"{PDF_LEADING} TL",
+            f"{PDF_MARGIN} {page_h - PDF_MARGIN - PDF_FONT_SIZE:.2f} Td",
+        ]
+        ops.extend(f"<{encode(row)}> Tj T*" for row in rows)
+        ops.append("ET")
+
+        return emit(content_num, _stream_obj(content_num, "\n".join(ops).encode())) + emit(
+            page_num,
+            _obj(
+                page_num,
+                f"<< /Type /Page /Parent {PAGES_OBJ} 0 R "
+                f"/MediaBox [0 0 {page_w:.2f} {page_h:.2f}] "
+                f"/Resources << /Font << /F1 {FONT_OBJ} 0 R >> >> "
+                f"/Contents {content_num} 0 R >>",
+            ),
+        )
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    pos += len(header)
+    yield header
+
+    rows: List[str] = []
+    for line in lines:
+        for row in _wrap(line, max_width, widths, default):
+            rows.append(row)
+            if len(rows) == rows_per_page:
+                yield page(rows)
+                rows = []
+
+    if rows or not page_objs:
+        yield page(rows)
+
+    # ---------- trailer objects ----------
+    name = _font_name(ttf)
+    w_array = " ".join(f"{gid} [{width:.0f}]" for gid, width in sorted(used.items()))
+    bbox = " ".join(f"{v:.0f}" for v in ttf.bbox)
+
+    cmap_lines = [
+        "/CIDInit /ProcSet findresource begin",
+        "12 dict begin",
+        "begincmap",
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        "/CMapName /Adobe-Identity-UCS def",
+        "/CMapType 2 def",
+        "1 begincodespacerange <0000> <FFFF> endcodespacerange",
+    ]
+    mappings = sorted(to_unicode.items())
+    for start in range(0, len(mappings), 100):
+        chunk = mappings[start:start + 100]
+        cmap_lines.append(f"{len(chunk)} beginbfchar")
+        cmap_lines.extend(
+            f"<{gid:04X}> <{ch.encode('utf-16-be').hex().upper()}>" for gid, ch in chunk
+        )
+        cmap_lines.append("endbfchar")
+    cmap_lines += ["endcmap", "CMapName currentdict /CMap defineresource pop", "end", "end"]
+
+    kids = " ".join(f"{num} 0 R" for num in page_objs)
+
+    tail = b"".join([
+        emit(PAGES_OBJ, _obj(
+            PAGES_OBJ,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(page_objs)} >>",
+        )),
+        emit(FONT_OBJ, _obj(
+            FONT_OBJ,
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{name} "
+            f"/Encoding /Identity-H /DescendantFonts [{CID_FONT_OBJ} 0 R] "
+            f"/ToUnicode {TO_UNICODE_OBJ} 0 R >>",
+        )),
+        emit(CID_FONT_OBJ, _obj(
+            CID_FONT_OBJ,
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{name} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {DESCRIPTOR_OBJ} 0 R /DW {default:.0f} "
+            f"/W [{w_array}] /CIDToGIDMap /Identity >>",
+        )),
+        emit(DESCRIPTOR_OBJ, _obj(
+            DESCRIPTOR_OBJ,
+            f"<< /Type /FontDescriptor /FontName /{name} /Flags {ttf.flags} "
+            f"/FontBBox [{bbox}] /ItalicAngle {ttf.italicAngle} "
+            f"/Ascent {ttf.ascent:.0f} /Descent {ttf.descent:.0f} "
+            f"/CapHeight {ttf.capHeight:.0f} /StemV {ttf.stemV} "
+            f"/FontFile2 {FONT_FILE_OBJ} 0 R >>",
+        )),
+    ])
+
+    # font program is already deflated once per process
+    font_file = (
+        f"{FONT_FILE_OBJ} 0 obj\n<< /Length {len(font_data)} /Filter /FlateDecode "
+        f"/Length1 {raw_len} >>\nstream\n".encode()
+        + font_data
+        + b"\nendstream\nendobj\n"
+    )
+    tail += emit(FONT_FILE_OBJ, font_file)
+    tail += emit(TO_UNICODE_OBJ, _stream_obj(TO_UNICODE_OBJ, "\n".join(cmap_lines).encode()))
+    tail += emit(CATALOG_OBJ, _obj(
+        CATALOG_OBJ,
+        f"<< /Type /Catalog /Pages {PAGES_OBJ} 0 R >>",
+    ))
+
+    size = FIRST_PAGE_OBJ + 2 * len(page_objs)
+    xref = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+    xref.extend(f"{offsets[num]:010d} 00000 n \n" for num in range(1, size))
+
+    yield tail + "".join(xref).encode() + (
+        f"trailer\n<< /Size {size} /Root {CATALOG_OBJ} 0 R >>\n"
+        f"startxref\n{pos}\n%%EOF\n"
+    ).encode()
@@ -0,0 +1,237 @@
+"""
+On-disk cache of rendered DOCX / PDF exports.
+
+A document's text only changes when a new version is saved, so a render
+is keyed by (document id, version, format, renderer version) and never
+goes stale; bumping a format's RENDERER_VERSIONS entry when its renderer
+changes output retires every old file of that format. Files live in
+RENDER_CACHE_DIR (outside the source tree and the public uploads mount,
+created on first write) and the
+directory is held under RENDER_CACHE_MAX_BYTES by evicting the least
+recently served files; a hit touches the file's mtime so LRU order is
+shared by every worker process.
+
+Renders are written to a temp file in the same directory and renamed
+into place, so concurrent misses for one key never serve a partial file.
+"""
+
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+RENDER_CACHE_DIR = os.getenv(
+    "RENDER_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "docroute-renders"),
+)
+RENDER_CACHE_MAX_BYTES = int(
+    os.getenv("RENDER_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+# e.g. "/_render_cache/" behind an nginx `internal` location aliased to
+# RENDER_CACHE_DIR: nginx then sends the file itself with sendfile()
+RENDER_CACHE_ACCEL_REDIRECT = os.getenv("RENDER_CACHE_ACCEL_REDIRECT", "")
+
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+# bump a format's entry whenever its renderer's output changes
+RENDERER_VERSIONS = {
+    "docx": 1,
+    "pdf": 2,  # streamed page-by-page writer
+}
+
+RenderKey = Tuple[int, int, str, int]  # (document_id, version, format, renderer)
+
+
+def render_key(document_id: int, version: int, fmt: str) -> RenderKey:
+    return (document_id, version, fmt, RENDERER_VERSIONS[fmt])
+
+
+# =====================================================
+# CACHE
+# =====================================================
+class RenderCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._locks: Dict[RenderKey, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def file_name(key: RenderKey) -> str:
+        document_id, version, fmt, renderer = key
+        return f"{document_id}-v{version}-r{renderer}.{fmt}"
+
+    def path_for(self, key: RenderKey) -> str:
+        return os.path.join(self.directory, self.file_name(key))
+
+    def _key_lock(self, key: RenderKey) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _temp_file(self, key: RenderKey) -> Tuple[int, str]:
+        os.makedirs(self.directory, exist_ok=True)
+        return tempfile.mkstemp(
+            dir=self.directory,
+            prefix=".render-",
+            suffix=f".{key[2]}",
+        )
+
+    def lookup(self, key: RenderKey) -> Optional[str]:
+        path = self.path_for(key)
+        return path if self._touch(path) else None
+
+    def get_or_render(self, key: RenderKey, render: Callable[[str], None]) -> str:
+        """
+        Path of the cached render for `key`; on a miss `render(path)`
+        writes it first.
+        """
+        path = self.path_for(key)
+
+        if self._touch(path):
+            return path
+
+        # one render per key in this process; other processes may race,
+        # which only costs a duplicate render
+        with self._key_lock(key):
+            if self._touch(path):
+                return path
+
+            fd, tmp_path = self._temp_file(key)
+            os.close(fd)
+
+            try:
+                render(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+        with self._locks_guard:
+            self._locks.pop(key, None)
+
+        self.evict()
+        return path
+
+    def stream_into(self, key: RenderKey, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass `chunks` through to the caller while writing them to the
+        cache. The file is published only once the last chunk is out; a
+        client that disconnects midway leaves nothing behind.
+        """
+        fd, tmp_path = self._temp_file(key)
+        complete = False
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+
+            os.replace(tmp_path, self.path_for(key))
+            complete = True
+        finally:
+            if not complete:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        self.evict()
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _entries(self) -> List[os.DirEntry]:
+        # finished renders only: in-progress temp files start with "."
+        try:
+            with os.scandir(self.directory) as it:
+                return [
+                    entry for entry in it
+                    if entry.is_file() and not entry.name.startswith(".")
+                ]
+        except FileNotFoundError:
+            # nothing rendered yet
+            return []
+
+    def evict(self):
+        """Delete least recently served renders until under max_bytes."""
+        entries = []
+        total = 0
+
+        for entry in self._entries():
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self) -> dict:
+        files = 0
+        size = 0
+        for entry in self._entries():
+            files += 1
+            size += entry.stat().st_size
+        return {"files": files, "bytes": size, "max_bytes": self.max_bytes}
+
+
+render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES)
+
+
+# =====================================================
+# RESPONSE
+# =====================================================
+def _content_disposition(filename: str) -> str:
+    return f"attachment; filename*=utf-8''{quote(filename)}"
+
+
+def cached_file_response(key: RenderKey, path: str, filename: str) -> Response:
+    media_type = MEDIA_TYPES[key[2]]
+
+    if RENDER_CACHE_ACCEL_REDIRECT:
+        response = Response(media_type=media_type)
+        response.headers["X-Accel-Redirect"] = (
+            RENDER_CACHE_ACCEL_REDIRECT.rstrip("/") + "/" + RenderCache.file_name(key)
+        )
+        response.headers["Content-Disposition"] = _content_disposition(filename)
+        return response
+
+    return FileResponse(path, filename=filename, media_type=media_type)
+
+
+def streaming_render_response(
+    key: RenderKey,
+    chunks: Iterable[bytes],
+    filename: str,
+) -> StreamingResponse:
+    """Send a render as it is produced, caching it on the way out."""
+    return StreamingResponse(
+        render_cache.stream_into(key, chunks),
+        media_type=MEDIA_TYPES[key[2]],
+        headers={"Content-Disposition": _content_disposition(filename)},
+    )
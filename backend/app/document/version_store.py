@@ -0,0 +1,253 @@
+"""
+Document version storage.
+
+Every VERSION_SNAPSHOT_INTERVAL-th version (and always version 1) keeps
+its full text in `content`; the versions in between only keep `delta`,
+a compact forward line delta against the version before it. Any version
+is rebuilt by replaying deltas from the nearest snapshot, and rebuilt
+texts are kept in an in-process LRU so neighbouring reads are cheap.
+
+Delta format (JSON list, applied to the previous version's lines):
+    n        copy the next n lines
+    -n       skip the next n lines
+    [...]    insert these lines
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.document.D_models import Document, DocumentVersion
+from app.document.diff_engine import diff_opcodes
+
+VERSION_SNAPSHOT_INTERVAL = int(os.getenv("VERSION_SNAPSHOT_INTERVAL", "10"))
+VERSION_CACHE_MAX_BYTES = int(
+    os.getenv("VERSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+
+CacheKey = Tuple[int, int]  # (document_id, version_number)
+
+
+# =====================================================
+# LINE DELTAS
+# =====================================================
+def make_delta(old: str, new: str) -> str:
+    a = old.split("\n")
+    b = new.split("\n")
+    ops: List = []
+
+    for tag, i1, i2, j1, j2 in diff_opcodes(a, b):
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(-(i2 - i1))
+        if j2 > j1:
+            ops.append(b[j1:j2])
+
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    lines = base.split("\n")
+    out: List[str] = []
+    pos = 0
+
+    for op in json.loads(delta):
+        if isinstance(op, list):
+            out.extend(op)
+        elif op > 0:
+            out.extend(lines[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+
+    return "\n".join(out)
+
+
+# =====================================================
+# RECONSTRUCTED CONTENT CACHE
+# =====================================================
+class VersionContentCache:
+    """
+    LRU of rebuilt version texts, bounded by total characters.
+    Versions never change once written, so entries need no invalidation.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def peek(self, key: CacheKey) -> Optional[str]:
+        # lookup without touching LRU order or hit counters
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: CacheKey, content: str):
+        if len(content) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = content
+            self._size += len(content)
+
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+version_cache = VersionContentCache(VERSION_CACHE_MAX_BYTES)
+
+
+# =====================================================
+# WRITE
+# =====================================================
+def is_snapshot_number(version_number: int) -> bool:
+    return VERSION_SNAPSHOT_INTERVAL <= 1 or version_number % VERSION_SNAPSHOT_INTERVAL == 1
+
+
+def add_version(
+    db: Session,
+    document: Document,
+    previous_content: str,
+    created_by: Optional[int],
+) -> DocumentVersion:
+    """
+    Record `document.content` as the document's next version.
+    `previous_content` is the text of the version before it.
+    Nothing is committed here.
+    """
+    expected_number = (document.version_count or 0) + 1
+
+    # row-locked increment: concurrent saves of one document serialise
+    # here and each gets its own number
+    version_number = db.execute(
+        update(Document)
+        .where(Document.id == document.id)
+        .values(version_count=Document.version_count + 1)
+        .returning(Document.version_count)
+    ).scalar_one()
+
+    content = document.content or ""
+    version = DocumentVersion(
+        document_id=document.id,
+        version_number=version_number,
+        created_by=created_by,
+    )
+
+    delta = None
+    # if another save got in between, `previous_content` is not the text
+    # of version_number - 1 and this version is stored as a snapshot
+    if version_number == expected_number and not is_snapshot_number(version_number):
+        delta = make_delta(previous_content, content)
+        # a rewrite can produce a delta bigger than the text itself
+        if len(delta) >= len(content):
+            delta = None
+
+    if delta is None:
+        version.is_snapshot = True
+        version.content = content
+    else:
+        version.delta = delta
+
+    db.add(version)
+    return version
+
+
+# =====================================================
+# READ
+# =====================================================
+def version_content(db: Session, version: DocumentVersion) -> str:
+    """
+    Full text of `version`, replayed from the nearest snapshot
+    (or the nearest cached version after it).
+    """
+    if version.is_snapshot or version.delta is None:
+        return version.content or ""
+
+    doc_id = version.document_id
+    number = version.version_number
+
+    cached = version_cache.get((doc_id, number))
+    if cached is not None:
+        return cached
+
+    snapshot_number = (
+        db.query(func.max(DocumentVersion.version_number))
+        .filter(
+            DocumentVersion.document_id == doc_id,
+            DocumentVersion.is_snapshot.is_(True),
+            DocumentVersion.version_number < number,
+        )
+        .scalar()
+    )
+    if snapshot_number is None:
+        raise ValueError(f"No snapshot for document {doc_id} version {number}")
+
+    start, content = snapshot_number, None
+    for n in range(number - 1, snapshot_number, -1):
+        content = version_cache.peek((doc_id, n))
+        if content is not None:
+            start = n + 1
+            break
+
+    rows = (
+        db.query(
+            DocumentVersion.content,
+            DocumentVersion.delta,
+        )
+        .filter(
+            DocumentVersion.document_id == doc_id,
+            DocumentVersion.version_number >= start,
+            DocumentVersion.version_number <= number,
+        )
+        .order_by(DocumentVersion.version_number)
+        .all()
+    )
+
+    for row in rows:
+        if row.delta is None:
+            content = row.content or ""
+        else:
+            content = apply_delta(content, row.delta)
+
+    version_cache.put((doc_id, number), content)
+    return content
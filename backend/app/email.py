@@ -1,10 +1,13 @@
 from dotenv import load_dotenv
 import os
-import smtplib
-import ssl
+import threading
 from email.message import EmailMessage
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
+from urllib.parse import quote
+
+from app.attachment_cache import AttachmentCache, attach_cached
+from app.smtp_pool import SMTPConnectionPool
 
 # Load .env only locally
 if os.getenv("RENDER") is None:
@@ -16,6 +19,71 @@ SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FROM_EMAIL = os.getenv("SMTP_FROM")
 
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true") == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "20"))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "3"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(
+    os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100")
+)
+
+# encoded attachments reused across messages and ticks
+ATTACHMENT_CACHE_MAX_BYTES = int(
+    os.getenv("ATTACHMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+ATTACHMENT_CACHE_MAX_ITEM_BYTES = int(
+    os.getenv("ATTACHMENT_CACHE_MAX_ITEM_BYTES", str(16 * 1024 * 1024))
+)
+# files above this size are linked instead of attached (0 = always attach)
+ATTACHMENT_LINK_THRESHOLD_BYTES = int(
+    os.getenv("ATTACHMENT_LINK_THRESHOLD_BYTES", str(10 * 1024 * 1024))
+)
+
+attachment_cache = AttachmentCache(
+    ATTACHMENT_CACHE_MAX_BYTES,
+    ATTACHMENT_CACHE_MAX_ITEM_BYTES,
+)
+
+# where this API is reachable from a mail client (links to /uploads files)
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL", "http://localhost:8000").rstrip("/")
+UPLOAD_ROOT = Path(os.getenv("UPLOAD_DIR", "uploads"))
+
+
+def public_file_url(path: str) -> Optional[str]:
+    """
+    Download URL for a file served by the /uploads static mount,
+    or None when the file lives outside it.
+    """
+    try:
+        relative = Path(path).resolve().relative_to(UPLOAD_ROOT.resolve())
+    except ValueError:
+        return None
+    return f"{PUBLIC_API_URL}/uploads/{quote(relative.as_posix())}"
+
+
+# =====================================================
+# SHARED SMTP POOL
+# =====================================================
+_smtp_pool: Optional[SMTPConnectionPool] = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _smtp_pool
+
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool(
+                SMTP_HOST,
+                SMTP_PORT,
+                SMTP_USERNAME,
+                SMTP_PASSWORD,
+                size=SMTP_POOL_SIZE,
+                max_messages=SMTP_MAX_MESSAGES_PER_CONNECTION,
+                timeout=SMTP_TIMEOUT,
+                starttls=SMTP_STARTTLS,
+            )
+        return _smtp_pool
+
 
 def send_reminder_email(
     to: str,
@@ -23,10 +91,48 @@ def send_reminder_email(
     text_body: str,
     html_body: Optional[str] = None,
     pdf_path: Optional[str] = None,
+    attachment_path: Optional[str] = None,
+    attachment_paths: Optional[List[str]] = None,
 ):
     if not SMTP_USERNAME or not SMTP_PASSWORD or not FROM_EMAIL:
         raise RuntimeError("SMTP credentials not configured")
 
+    # ===============================
+    # 📎 ATTACH OR LINK
+    # ===============================
+    attachments = []  # (path, subtype)
+    links = []  # (filename, url)
+
+    if pdf_path:
+        attachments.append((pdf_path, "pdf"))
+
+    # routing files (PDF / DOCX) — scheduler passes these
+    # (one for a single reminder, several for a digest)
+    for path in [attachment_path, *(attachment_paths or [])]:
+        if not path or not Path(path).exists():
+            continue
+
+        url = None
+        if (
+            ATTACHMENT_LINK_THRESHOLD_BYTES
+            and Path(path).stat().st_size > ATTACHMENT_LINK_THRESHOLD_BYTES
+        ):
+            url = public_file_url(path)
+
+        if url:
+            links.append((Path(path).name, url))
+        else:
+            attachments.append((path, "octet-stream"))
+
+    if links:
+        text_body += "\n\nDownload:\n" + "\n".join(
+            f"- {name}: {url}" for name, url in links
+        )
+        if html_body:
+            html_body += "<hr><p><b>Download:</b></p><ul>" + "".join(
+                f'<li><a href="{url}">{name}</a></li>' for name, url in links
+            ) + "</ul>"
+
     msg = EmailMessage()
     msg["From"] = FROM_EMAIL
     msg["To"] = to
@@ -37,22 +143,10 @@ def send_reminder_email(
     if html_body:
         msg.add_alternative(html_body, subtype="html")
 
-    if pdf_path and Path(pdf_path).exists():
-        with open(pdf_path, "rb") as f:
-            msg.add_attachment(
-                f.read(),
-                maintype="application",
-                subtype="pdf",
-                filename=Path(pdf_path).name,
-            )
-
-    context = ssl.create_default_context()
+    for path, subtype in attachments:
+        attach_cached(msg, attachment_cache, path, subtype=subtype)
 
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=20) as server:
-        server.ehlo()
-        server.starttls(context=context)
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.send_message(msg)
+    get_smtp_pool().send(msg)
 
 
 def send_email(to: str, subject: str, body: str):
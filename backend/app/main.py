@@ -16,9 +16,12 @@ from app.qr_tracking.routes import router as qr_router
 from app.ai_routing.routes import router as ai_routing_router
 from app.analytics.routes import router as analytics_router
 from app.doccode.routes import router as doccode_router
+from app.search.routes import router as search_router
 from fastapi.staticfiles import StaticFiles
 
-from app.ai_routing.scheduler import start_scheduler
+from app.ai_routing.scheduler import start_scheduler, stop_scheduler
+from app.audit_sink import audit_sink
+from app.audit_partitions import ensure_audit_partitions
 
 app = FastAPI(title="DocRoute-RT Backend", version="1.0.0")
 
@@ -26,11 +29,20 @@ app = FastAPI(title="DocRoute-RT Backend", version="1.0.0")
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    ensure_audit_partitions()
 
+    # safe in every worker: only the elected leader runs reminder jobs
     if os.getenv("RUN_SCHEDULER", "true") == "true":
         start_scheduler()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_scheduler()
+    # buffered view / scan events still in memory
+    audit_sink.stop()
+
+
 app.add_middleware(
     SessionMiddleware,
     secret_key=os.getenv("SESSION_SECRET"),
@@ -42,7 +54,7 @@ app.add_middleware(
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
-    "https://your-vercel-app.vercel.app"]
+    "https://your-vercel-app.vercel.app"],
  # change later
     allow_credentials=True,
     allow_methods=["*"],
@@ -63,6 +75,7 @@ app.include_router(qr_router)
 app.include_router(ai_routing_router)
 app.include_router(analytics_router)
 app.include_router(doccode_router)
+app.include_router(search_router)
 
 
 @app.get("/")
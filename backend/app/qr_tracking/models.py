@@ -16,6 +16,7 @@ from uuid import uuid4
 import enum
 
 from app.database import Base
+from app.audit_partitions import add_default_partition
 
 
 # =====================================================
@@ -158,7 +159,7 @@ class QRPhysicalCode(Base):
 class QRPhysicalScanLog(Base):
     __tablename__ = "qr_physical_scan_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     document_id = Column(
         Integer,
@@ -175,11 +176,13 @@ class QRPhysicalScanLog(Base):
     region = Column(String(100), nullable=True)
     city = Column(String(100), nullable=True)
 
+    # partition key: must be part of the table's primary key
     scanned_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
         nullable=False,
         index=True,
+        primary_key=True,
     )
 
     document = relationship(
@@ -193,7 +196,12 @@ class QRPhysicalScanLog(Base):
             "scanned_by IN ('public','owner')",
             name="ck_qr_scan_role",
         ),
+        {"postgresql_partition_by": "RANGE (scanned_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+add_default_partition(QRPhysicalScanLog.__table__)
 
 
 # =====================================================
@@ -202,7 +210,7 @@ class QRPhysicalScanLog(Base):
 class QRPhysicalAuditLog(Base):
     __tablename__ = "qr_physical_audit_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     document_id = Column(
         Integer,
@@ -216,11 +224,13 @@ class QRPhysicalAuditLog(Base):
     ip_address = Column(String(64), nullable=True)
     user_agent = Column(Text, nullable=True)
 
+    # partition key: must be part of the table's primary key
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=func.now(),
         nullable=False,
         index=True,
+        primary_key=True,
     )
 
     document = relationship(
@@ -235,7 +245,12 @@ class QRPhysicalAuditLog(Base):
             "document_id",
             "created_at",
         ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+add_default_partition(QRPhysicalAuditLog.__table__)
 
 
 # =====================================================
@@ -22,6 +22,8 @@ from fastapi import Query
 
 
 from app.database import get_db
+from app.audit_sink import Durability, audit
+from app.audit_partitions import AUDIT_DEFAULT_WINDOW_DAYS, window_start
 from app.qr_tracking.models import (
     QRPhysicalDocument,
     QRPhysicalCode,
@@ -212,7 +214,10 @@ def scan_qr(token: str, request: Request, db: Session = Depends(get_db)):
     location = get_location_from_ip(ip) if ip else {}
 
     # ✅ LOG PUBLIC SCAN
-    db.add(QRPhysicalScanLog(
+    audit(
+        db,
+        QRPhysicalScanLog,
+        Durability.BUFFERED,
         document_id=document.id,
         scanned_by="public",
         ip_address=ip,
@@ -220,13 +225,15 @@ def scan_qr(token: str, request: Request, db: Session = Depends(get_db)):
         country=location.get("country"),
         region=location.get("region"),
         city=location.get("city"),
-    ))
+    )
 
-    db.add(QRPhysicalAuditLog(
+    audit(
+        db,
+        QRPhysicalAuditLog,
+        Durability.BUFFERED,
         document_id=document.id,
         action="QR_PUBLIC_SCAN",
-    ))
-
+    )
     db.commit()
 
     # 🔒 STRICT MODE
@@ -251,6 +258,7 @@ def scan_qr(token: str, request: Request, db: Session = Depends(get_db)):
 @router.get("/history/{doc_id}", response_model=list[QRScanLogResponse])
 def scan_history(
     doc_id: int,
+    days: int = AUDIT_DEFAULT_WINDOW_DAYS,  # 0 = full history
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),  # ✅ ADD
 ):
@@ -261,12 +269,13 @@ def scan_history(
 
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
-    return (
-        db.query(QRPhysicalScanLog)
-        .filter(QRPhysicalScanLog.document_id == doc_id)
-        .order_by(QRPhysicalScanLog.scanned_at.desc())
-        .all()
-    )
+    query = db.query(QRPhysicalScanLog).filter(QRPhysicalScanLog.document_id == doc_id)
+
+    since = window_start(days)
+    if since:
+        query = query.filter(QRPhysicalScanLog.scanned_at >= since)
+
+    return query.order_by(QRPhysicalScanLog.scanned_at.desc()).all()
 
 
 # =====================================================
@@ -275,6 +284,7 @@ def scan_history(
 @router.get("/audit/{doc_id}", response_model=list[QRAuditLogResponse])
 def audit_logs(
     doc_id: int,
+    days: int = AUDIT_DEFAULT_WINDOW_DAYS,  # 0 = full history
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -286,12 +296,13 @@ def audit_logs(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    return (
-        db.query(QRPhysicalAuditLog)
-        .filter(QRPhysicalAuditLog.document_id == doc_id)
-        .order_by(QRPhysicalAuditLog.created_at.desc())
-        .all()
-    )
+    query = db.query(QRPhysicalAuditLog).filter(QRPhysicalAuditLog.document_id == doc_id)
+
+    since = window_start(days)
+    if since:
+        query = query.filter(QRPhysicalAuditLog.created_at >= since)
+
+    return query.order_by(QRPhysicalAuditLog.created_at.desc()).all()
 
 
 # =====================================================
@@ -441,7 +452,10 @@ def owner_login(
     location = get_location_from_ip(ip) if ip else {}
 
     # ✅ LOG OWNER SCAN
-    db.add(QRPhysicalScanLog(
+    audit(
+        db,
+        QRPhysicalScanLog,
+        Durability.BUFFERED,
         document_id=document.id,
         scanned_by="owner",
         ip_address=ip,
@@ -449,7 +463,7 @@ def owner_login(
         country=location.get("country"),
         region=location.get("region"),
         city=location.get("city"),
-    ))
+    )
 
     # ✅ AUDIT LOG
     db.add(QRPhysicalAuditLog(
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.auth.utils import get_current_user
+from app.auth.models import User
+
+from app.search.schemas import SearchResponse
+from app.search.services import SEARCH_MAX_PAGE_SIZE, SOURCES, search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResponse)
+def search_everything(
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[str] = Query(None, description="comma-separated: document,ocr,ai"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    kinds = None
+    if types:
+        kinds = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = set(kinds) - set(SOURCES)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown search types: {', '.join(sorted(unknown))}",
+            )
+
+    return search(db, current_user.id, q.strip(), kinds, page, page_size)
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+# =========================
+# SEARCH
+# =========================
+
+class SearchHit(BaseModel):
+    type: str            # document | ocr | ai
+    id: int
+    title: str
+    snippet: Optional[str] = None  # HTML-escaped, matches wrapped in <mark>
+    rank: float
+    created_at: datetime
+
+
+class SearchResponse(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    has_more: bool
+    results: List[SearchHit]
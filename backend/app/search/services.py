@@ -0,0 +1,172 @@
+"""
+Full-text search over documents, OCR history and AI summaries.
+
+Each source has a generated, GIN-indexed `search_vector` column (see
+app.search.vectors). A search is one UNION ALL over the sources the user
+can read, ranked by ts_rank_cd and paginated in SQL; ts_headline — which
+re-parses the text and is the expensive part — then runs only for the
+rows on the returned page.
+"""
+
+import html
+import os
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.auth.models import AIDocument, OCRHistory
+from app.document.D_models import Document, DocumentAccess
+from app.search.vectors import SEARCH_CONFIGS
+
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "50"))
+SEARCH_HEADLINE_OPTIONS = os.getenv(
+    "SEARCH_HEADLINE_OPTIONS",
+    "MaxWords=35, MinWords=15, MaxFragments=2",
+)
+
+# ts_headline markers; replaced with <mark> after escaping the text
+_START, _STOP = "\u0002", "\u0003"
+
+# type -> (model, title column, body column)
+SOURCES = {
+    "document": (Document, Document.file_name, Document.content),
+    "ocr": (OCRHistory, OCRHistory.filename, OCRHistory.extracted_text),
+    "ai": (AIDocument, AIDocument.file_name, AIDocument.summary),
+}
+
+
+# =====================================================
+# QUERY
+# =====================================================
+def build_tsquery(q: str):
+    """websearch syntax ("quoted phrase", or, -not) in every config."""
+    queries = [
+        func.websearch_to_tsquery(cast(config, REGCONFIG), q)
+        for config in SEARCH_CONFIGS
+    ]
+    tsquery = queries[0]
+    for other in queries[1:]:
+        tsquery = tsquery.op("||")(other)
+    return tsquery
+
+
+def _visible(kind: str, user_id: int):
+    if kind == "document":
+        shared = select(DocumentAccess.document_id).where(
+            DocumentAccess.user_id == user_id,
+            DocumentAccess.revoked_at.is_(None),
+        )
+        return and_(
+            Document.is_deleted.is_(False),
+            or_(Document.owner_id == user_id, Document.id.in_(shared)),
+        )
+
+    model = SOURCES[kind][0]
+    return model.user_id == user_id
+
+
+def _ranked(kind: str, tsquery, user_id: int):
+    model, title, _ = SOURCES[kind]
+    return (
+        select(
+            literal(kind).label("type"),
+            model.id.label("id"),
+            title.label("title"),
+            func.ts_rank_cd(model.search_vector, tsquery).label("rank"),
+            model.created_at.label("created_at"),
+        )
+        .where(model.search_vector.op("@@")(tsquery))
+        .where(_visible(kind, user_id))
+    )
+
+
+# =====================================================
+# SNIPPETS
+# =====================================================
+def _mark(headline: Optional[str]) -> Optional[str]:
+    if not headline:
+        return None
+    return (
+        html.escape(headline)
+        .replace(_START, "<mark>")
+        .replace(_STOP, "</mark>")
+    )
+
+
+def _snippets(db: Session, kind: str, ids: Iterable[int], tsquery) -> Dict[int, str]:
+    model, _, body = SOURCES[kind]
+    options = f"StartSel={_START}, StopSel={_STOP}, {SEARCH_HEADLINE_OPTIONS}"
+
+    rows = db.execute(
+        select(
+            model.id,
+            # english stems Latin words to match the english query
+            # terms and leaves Devanagari as-is for the simple ones
+            func.ts_headline(
+                cast("english", REGCONFIG),
+                func.coalesce(body, ""),
+                tsquery,
+                options,
+            ),
+        ).where(model.id.in_(list(ids)))
+    ).all()
+
+    return {row_id: _mark(headline) for row_id, headline in rows}
+
+
+# =====================================================
+# SEARCH
+# =====================================================
+def search(
+    db: Session,
+    user_id: int,
+    q: str,
+    types: Optional[List[str]] = None,
+    page: int = 1,
+    page_size: int = 20,
+):
+    kinds = [k for k in SOURCES if not types or k in types]
+    page_size = min(page_size, SEARCH_MAX_PAGE_SIZE)
+    tsquery = build_tsquery(q)
+
+    hits = union_all(*(_ranked(k, tsquery, user_id) for k in kinds)).subquery()
+
+    # one extra row tells us whether there is a next page
+    rows = db.execute(
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.created_at.desc(), hits.c.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size + 1)
+    ).mappings().all()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    by_kind: Dict[str, List[int]] = {}
+    for row in rows:
+        by_kind.setdefault(row["type"], []).append(row["id"])
+
+    snippets = {
+        kind: _snippets(db, kind, ids, tsquery)
+        for kind, ids in by_kind.items()
+    }
+
+    return {
+        "query": q,
+        "page": page,
+        "page_size": page_size,
+        "has_more": has_more,
+        "results": [
+            {
+                "type": row["type"],
+                "id": row["id"],
+                "title": row["title"],
+                "snippet": snippets[row["type"]].get(row["id"]),
+                "rank": row["rank"],
+                "created_at": row["created_at"],
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,35 @@
+"""
+Generated `tsvector` columns for full-text search.
+
+Every field is indexed twice: with the `english` config (stemming, stop
+words) and with `simple` (lower-casing only), which is what Hindi text
+gets since Postgres ships no Hindi dictionary. Queries OR both configs
+together (see app.search.services.build_tsquery).
+"""
+
+from typing import Tuple
+
+from sqlalchemy import Column, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+SEARCH_CONFIGS = ("english", "simple")
+
+
+def tsvector_expression(*fields: Tuple[str, str]) -> str:
+    """SQL for the weighted vector of (column, weight) pairs."""
+    return " || ".join(
+        f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+        for column, weight in fields
+        for config in SEARCH_CONFIGS
+    )
+
+
+def search_vector_column(*fields: Tuple[str, str]):
+    # deferred: never loaded with the row, only used in WHERE / ORDER BY
+    return deferred(
+        Column(
+            TSVECTOR,
+            Computed(tsvector_expression(*fields), persisted=True),
+        )
+    )
@@ -0,0 +1,186 @@
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from email.message import EmailMessage
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================================
+# POOLED CONNECTION
+# =====================================================
+class PooledSMTPConnection:
+    """
+    One authenticated SMTP session plus the bookkeeping the pool needs
+    to decide when it must be health-checked or retired.
+    """
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+# =====================================================
+# CONNECTION POOL
+# =====================================================
+class SMTPConnectionPool:
+    """
+    Small pool of reused, authenticated SMTP connections.
+
+    - connections are opened lazily, up to `size`
+    - idle connections older than `healthcheck_after` seconds get a NOOP
+      before reuse and are replaced if the server dropped them
+    - a connection is retired after `max_messages` sends
+    - a send that fails on a dead connection is retried once on a fresh one
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        *,
+        size: int = 3,
+        max_messages: int = 100,
+        timeout: float = 20,
+        starttls: bool = True,
+        healthcheck_after: float = 30,
+        acquire_timeout: float = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.starttls = starttls
+        self.healthcheck_after = healthcheck_after
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: "queue.LifoQueue[PooledSMTPConnection]" = queue.LifoQueue()
+        self._open = 0
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    # ---------------- connection lifecycle ----------------
+
+    def _connect(self) -> PooledSMTPConnection:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls(context=self._ssl_context)
+                server.ehlo()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        return PooledSMTPConnection(server)
+
+    def _is_healthy(self, conn: PooledSMTPConnection) -> bool:
+        if time.monotonic() - conn.last_used < self.healthcheck_after:
+            return True
+        try:
+            return conn.server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _discard(self, conn: PooledSMTPConnection):
+        conn.close()
+        with self._lock:
+            self._open -= 1
+
+    def _acquire(self) -> PooledSMTPConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+        with self._lock:
+            can_open = self._open < self.size
+            if can_open:
+                self._open += 1
+
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        # pool exhausted: wait for another sender to hand one back
+        conn = self._idle.get(timeout=self.acquire_timeout)
+        if self._is_healthy(conn):
+            return conn
+
+        self._discard(conn)
+        return self._acquire()
+
+    def _release(self, conn: PooledSMTPConnection):
+        conn.last_used = time.monotonic()
+
+        if conn.messages_sent >= self.max_messages:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    # ---------------- public API ----------------
+
+    def send(self, msg: EmailMessage):
+        conn = self._acquire()
+
+        try:
+            conn.server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+            # stale session — one retry on a brand new connection
+            logger.warning("SMTP connection dropped, reconnecting")
+            self._discard(conn)
+            conn = self._acquire()
+            try:
+                conn.server.send_message(msg)
+            except Exception:
+                self._discard(conn)
+                raise
+        except smtplib.SMTPRecipientsRefused:
+            # message-level failure, the session itself is fine
+            conn.messages_sent += 1
+            self._release(conn)
+            raise
+        except Exception:
+            self._discard(conn)
+            raise
+
+        conn.messages_sent += 1
+        self._release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
@@ -0,0 +1,75 @@
+"""document view / open / download counters
+
+Revision ID: 08752d6102c1
+Revises: 82a329daa826
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08752d6102c1'
+down_revision: Union[str, Sequence[str], None] = '82a329daa826'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTERS = ("view_count", "shared_open_count", "download_count")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in COUNTERS:
+        op.add_column(
+            "documents",
+            sa.Column(name, sa.Integer(), server_default="0", nullable=False),
+        )
+
+    # one-time backfill from the history the counters replace
+    op.execute(
+        """
+        UPDATE documents d
+        SET view_count = v.n
+        FROM (
+            SELECT document_id, COUNT(*) AS n
+            FROM audit_logs
+            WHERE action = 'view'
+            GROUP BY document_id
+        ) v
+        WHERE v.document_id = d.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE documents d
+        SET shared_open_count = s.n
+        FROM (
+            SELECT document_id, SUM(opened_count) AS n
+            FROM document_share_links
+            GROUP BY document_id
+        ) s
+        WHERE s.document_id = d.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE documents d
+        SET download_count = l.n
+        FROM (
+            SELECT document_id, COUNT(*) AS n
+            FROM document_download_logs
+            GROUP BY document_id
+        ) l
+        WHERE l.document_id = d.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(COUNTERS):
+        op.drop_column("documents", name)
@@ -0,0 +1,54 @@
+"""reminder trigger date column + due index
+
+Revision ID: 210a79136141
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '210a79136141'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "routing_reminders",
+        sa.Column("trigger_date", sa.Date(), nullable=True),
+    )
+    op.create_index(
+        "ix_routing_reminders_trigger_date",
+        "routing_reminders",
+        ["trigger_date"],
+    )
+    op.create_index(
+        "idx_reminder_history_due",
+        "routing_reminder_history",
+        ["status", "trigger_date"],
+    )
+
+    # backfill from the trigger date already stored on pending history
+    op.execute(
+        """
+        UPDATE routing_reminders r
+        SET trigger_date = COALESCE(r.trigger_date_override, h.trigger_date)
+        FROM routing_reminder_history h
+        WHERE h.reminder_id = r.id
+          AND h.status = 'PENDING'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_reminder_history_due", table_name="routing_reminder_history")
+    op.drop_index("ix_routing_reminders_trigger_date", table_name="routing_reminders")
+    op.drop_column("routing_reminders", "trigger_date")
@@ -0,0 +1,152 @@
+"""document versions: periodic snapshots + forward deltas
+
+Revision ID: 460e83b00149
+Revises: 08752d6102c1
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+import difflib
+import json
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '460e83b00149'
+down_revision: Union[str, Sequence[str], None] = '08752d6102c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# must match app.document.version_store at the time of this revision
+SNAPSHOT_INTERVAL = int(os.getenv("VERSION_SNAPSHOT_INTERVAL", "10"))
+
+
+def _make_delta(old: str, new: str) -> str:
+    a = old.split("\n")
+    b = new.split("\n")
+    ops = []
+
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(-(i2 - i1))
+        if j2 > j1:
+            ops.append(b[j1:j2])
+
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def _apply_delta(base: str, delta: str) -> str:
+    lines = base.split("\n")
+    out = []
+    pos = 0
+
+    for op_ in json.loads(delta):
+        if isinstance(op_, list):
+            out.extend(op_)
+        elif op_ > 0:
+            out.extend(lines[pos:pos + op_])
+            pos += op_
+        else:
+            pos -= op_
+
+    return "\n".join(out)
+
+
+def _document_ids(bind):
+    return bind.execute(
+        sa.text("SELECT DISTINCT document_id FROM document_versions")
+    ).scalars().all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "document_versions",
+        sa.Column("is_snapshot", sa.Boolean(), server_default="false", nullable=False),
+    )
+    op.add_column("document_versions", sa.Column("delta", sa.Text(), nullable=True))
+
+    # compact existing history, one document at a time
+    bind = op.get_bind()
+    for document_id in _document_ids(bind):
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, version_number, content FROM document_versions "
+                "WHERE document_id = :doc ORDER BY version_number, id"
+            ),
+            {"doc": document_id},
+        ).all()
+
+        previous = None
+        for row in rows:
+            content = row.content or ""
+            delta = None
+
+            snapshot = (
+                previous is None
+                or SNAPSHOT_INTERVAL <= 1
+                or row.version_number % SNAPSHOT_INTERVAL == 1
+            )
+            if not snapshot:
+                delta = _make_delta(previous, content)
+                if len(delta) >= len(content):
+                    delta = None
+
+            if delta is None:
+                bind.execute(
+                    sa.text(
+                        "UPDATE document_versions "
+                        "SET is_snapshot = true, diff = NULL WHERE id = :id"
+                    ),
+                    {"id": row.id},
+                )
+            else:
+                bind.execute(
+                    sa.text(
+                        "UPDATE document_versions "
+                        "SET content = NULL, delta = :delta, diff = NULL WHERE id = :id"
+                    ),
+                    {"id": row.id, "delta": delta},
+                )
+
+            previous = content
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Restores full content on every row. The old ndiff text in `diff`
+    is not rebuilt.
+    """
+    bind = op.get_bind()
+    for document_id in _document_ids(bind):
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, content, delta FROM document_versions "
+                "WHERE document_id = :doc ORDER BY version_number, id"
+            ),
+            {"doc": document_id},
+        ).all()
+
+        content = ""
+        for row in rows:
+            if row.delta is None:
+                content = row.content or ""
+                continue
+
+            content = _apply_delta(content, row.delta)
+            bind.execute(
+                sa.text("UPDATE document_versions SET content = :content WHERE id = :id"),
+                {"id": row.id, "content": content},
+            )
+
+    op.drop_column("document_versions", "delta")
+    op.drop_column("document_versions", "is_snapshot")
@@ -0,0 +1,69 @@
+"""full-text search vectors
+
+Revision ID: 5c1e7b9a04d3
+Revises: 9dbfe398b5ae
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7b9a04d3'
+down_revision: Union[str, Sequence[str], None] = '9dbfe398b5ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table: (index, [(column, weight)]) — mirrors the models' search_vector
+TABLES = {
+    "documents": ("idx_documents_search", [("file_name", "A"), ("content", "B")]),
+    "ocr_history": ("idx_ocr_history_search", [("filename", "A"), ("extracted_text", "B")]),
+    "ai_documents": ("idx_ai_documents_search", [("file_name", "A"), ("summary", "B")]),
+}
+
+
+# inlined from app.search.vectors so the revision never changes under us
+def _expression(fields) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{config}', coalesce({column}, '')), '{weight}')"
+        for column, weight in fields
+        for config in ("english", "simple")
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # adding a STORED generated column rewrites the table once
+    for table, (_, fields) in TABLES.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(_expression(fields), persisted=True),
+            ),
+        )
+
+    # building the indexes does not block writes
+    with op.get_context().autocommit_block():
+        for table, (index, _) in TABLES.items():
+            op.create_index(
+                index,
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (index, _) in TABLES.items():
+        op.drop_index(index, table_name=table, if_exists=True)
+        op.drop_column(table, "search_vector")
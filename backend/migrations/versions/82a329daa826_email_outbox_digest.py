@@ -0,0 +1,37 @@
+"""email outbox digest columns
+
+Revision ID: 82a329daa826
+Revises: 84e050030a27
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82a329daa826'
+down_revision: Union[str, Sequence[str], None] = '84e050030a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "email_outbox",
+        sa.Column("history_ids", postgresql.ARRAY(sa.Integer()), nullable=True),
+    )
+    op.add_column(
+        "email_outbox",
+        sa.Column("attachment_paths", postgresql.ARRAY(sa.String()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("email_outbox", "attachment_paths")
+    op.drop_column("email_outbox", "history_ids")
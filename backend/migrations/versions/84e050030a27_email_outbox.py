@@ -0,0 +1,66 @@
+"""email outbox
+
+Revision ID: 84e050030a27
+Revises: 93ddfbd4d962
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '84e050030a27'
+down_revision: Union[str, Sequence[str], None] = '93ddfbd4d962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "history_id",
+            sa.Integer(),
+            sa.ForeignKey("routing_reminder_history.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("recipient", sa.Text(), nullable=False),
+        sa.Column("subject", sa.String(500), nullable=False),
+        sa.Column("text_body", sa.Text(), nullable=False),
+        sa.Column("html_body", sa.Text(), nullable=True),
+        sa.Column("attachment_path", sa.String(), nullable=True),
+        sa.Column("status", sa.String(7), nullable=False),
+        sa.Column("deliveries", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_email_outbox_history_id", "email_outbox", ["history_id"])
+    op.create_index(
+        "idx_email_outbox_claim",
+        "email_outbox",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_email_outbox_claim", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_history_id", table_name="email_outbox")
+    op.drop_table("email_outbox")
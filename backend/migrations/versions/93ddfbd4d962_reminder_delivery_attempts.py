@@ -0,0 +1,56 @@
+"""reminder delivery attempts
+
+Revision ID: 93ddfbd4d962
+Revises: 210a79136141
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93ddfbd4d962'
+down_revision: Union[str, Sequence[str], None] = '210a79136141'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "routing_reminder_delivery_attempts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "history_id",
+            sa.Integer(),
+            sa.ForeignKey("routing_reminder_history.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("attempt", sa.Integer(), nullable=False),
+        sa.Column("success", sa.Boolean(), nullable=False),
+        sa.Column("transient", sa.Boolean(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column(
+            "attempted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_routing_reminder_delivery_attempts_history_id",
+        "routing_reminder_delivery_attempts",
+        ["history_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_routing_reminder_delivery_attempts_history_id",
+        table_name="routing_reminder_delivery_attempts",
+    )
+    op.drop_table("routing_reminder_delivery_attempts")
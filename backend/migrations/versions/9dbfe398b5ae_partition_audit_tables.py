@@ -0,0 +1,162 @@
+"""monthly range partitioning for audit tables
+
+Revision ID: 9dbfe398b5ae
+Revises: a6c27234548f
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Callable, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9dbfe398b5ae'
+down_revision: Union[str, Sequence[str], None] = 'a6c27234548f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PREMAKE_MONTHS = 2
+
+# added by this revision for per-document time-window reads
+NEW_INDEXES = {"idx_audit_logs_doc_time"}
+
+# table: (partition key, indexes, foreign keys)
+TABLES = {
+    "audit_logs": (
+        "created_at",
+        {
+            "ix_audit_logs_event_type": ["event_type"],
+            "idx_audit_logs_doc_time": ["document_id", "created_at"],
+        },
+        [
+            ("document_id", "documents", "CASCADE"),
+            ("performed_by", "users", None),
+        ],
+    ),
+    "qr_physical_scan_logs": (
+        "scanned_at",
+        {
+            "ix_qr_physical_scan_logs_id": ["id"],
+            "ix_qr_physical_scan_logs_document_id": ["document_id"],
+            "ix_qr_physical_scan_logs_scanned_at": ["scanned_at"],
+        },
+        [("document_id", "qr_physical_documents", "CASCADE")],
+    ),
+    "qr_physical_audit_logs": (
+        "created_at",
+        {
+            "ix_qr_physical_audit_logs_id": ["id"],
+            "ix_qr_physical_audit_logs_document_id": ["document_id"],
+            "ix_qr_physical_audit_logs_created_at": ["created_at"],
+            "idx_qr_physical_audit_doc_time": ["document_id", "created_at"],
+        },
+        [("document_id", "qr_physical_documents", "CASCADE")],
+    ),
+    "routing_audit_logs": (
+        "created_at",
+        {
+            "ix_routing_audit_logs_routing_id": ["routing_id"],
+        },
+        [("routing_id", "document_routings", "CASCADE")],
+    ),
+}
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _swap_table(
+    table: str,
+    create_sql: str,
+    before_copy: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    Rename `table` aside, create its replacement with `create_sql`
+    (which reads the old one as {old}), copy rows, hand the id sequence
+    over and drop the old table.
+    """
+    old = f"{table}_old"
+    bind = op.get_bind()
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(create_sql.format(old=old))
+
+    if before_copy:
+        before_copy()
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+
+    seq = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": old}
+    ).scalar()
+    if seq:
+        op.execute(f"ALTER SEQUENCE {seq} OWNED BY {table}.id")
+
+    op.execute(f"DROP TABLE {old}")
+
+
+def _finish(table: str, pk: Sequence[str], new_indexes: bool) -> None:
+    _, indexes, fks = TABLES[table]
+
+    op.create_primary_key(f"{table}_pkey", table, list(pk))
+    for name, columns in indexes.items():
+        if name in NEW_INDEXES and not new_indexes:
+            continue
+        op.create_index(name, table, columns)
+    for column, target, ondelete in fks:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey",
+            table,
+            target,
+            [column],
+            ["id"],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+
+    for table, (column, _, _) in TABLES.items():
+        oldest = bind.execute(sa.text(f"SELECT MIN({column}) FROM {table}")).scalar()
+        first = oldest.date().replace(day=1) if oldest else this_month
+        first = min(first, this_month)
+
+        def make_partitions(table=table, first=first):
+            op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+            month = first
+            while month <= _add_months(this_month, PREMAKE_MONTHS):
+                end = _add_months(month, 1)
+                op.execute(
+                    f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+                )
+                month = end
+
+        _swap_table(
+            table,
+            f"CREATE TABLE {table} "
+            f"(LIKE {{old}} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({column})",
+            before_copy=make_partitions,
+        )
+        _finish(table, ["id", column], new_indexes=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema. Archived (dropped) partitions are not restored."""
+    for table in TABLES:
+        _swap_table(
+            table,
+            f"CREATE TABLE {table} "
+            f"(LIKE {{old}} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        )
+        _finish(table, ["id"], new_indexes=False)
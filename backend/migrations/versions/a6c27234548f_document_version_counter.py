@@ -0,0 +1,72 @@
+"""per-document version counter
+
+Revision ID: a6c27234548f
+Revises: 460e83b00149
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c27234548f'
+down_revision: Union[str, Sequence[str], None] = '460e83b00149'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "documents",
+        sa.Column("version_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    bind = op.get_bind()
+    constraints = {
+        c["name"] for c in sa.inspect(bind).get_unique_constraints("document_versions")
+    }
+
+    if "uq_document_version" not in constraints:
+        # databases created before the constraint may hold duplicate numbers
+        # from racing COUNT(*) saves: renumber in history order first
+        op.execute(
+            """
+            UPDATE document_versions v
+            SET version_number = r.rn
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY document_id ORDER BY version_number, id
+                ) AS rn
+                FROM document_versions
+            ) r
+            WHERE r.id = v.id AND v.version_number <> r.rn
+            """
+        )
+        op.create_unique_constraint(
+            "uq_document_version",
+            "document_versions",
+            ["document_id", "version_number"],
+        )
+
+    op.execute(
+        """
+        UPDATE documents d
+        SET version_count = v.n
+        FROM (
+            SELECT document_id, MAX(version_number) AS n
+            FROM document_versions
+            GROUP BY document_id
+        ) v
+        WHERE v.document_id = d.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # uq_document_version is part of the base schema and stays
+    op.drop_column("documents", "version_count")
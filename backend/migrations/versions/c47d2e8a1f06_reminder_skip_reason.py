@@ -0,0 +1,31 @@
+"""reminder history skip reason
+
+Revision ID: c47d2e8a1f06
+Revises: 5c1e7b9a04d3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d2e8a1f06'
+down_revision: Union[str, Sequence[str], None] = '5c1e7b9a04d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "routing_reminder_history",
+        sa.Column("skip_reason", sa.String(13), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("routing_reminder_history", "skip_reason")
@@ -0,0 +1,40 @@
+"""drop routing_reminders.trigger_date
+
+Revision ID: e81b4c2d6a90
+Revises: c47d2e8a1f06
+Create Date: 2026-10-19 11:00:00.000000
+
+The scheduler selects due rows from routing_reminder_history
+(idx_reminder_history_due); nothing reads the copy on the reminder.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b4c2d6a90'
+down_revision: Union[str, Sequence[str], None] = 'c47d2e8a1f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_routing_reminders_trigger_date", table_name="routing_reminders")
+    op.drop_column("routing_reminders", "trigger_date")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "routing_reminders",
+        sa.Column("trigger_date", sa.Date(), nullable=True),
+    )
+    op.create_index(
+        "ix_routing_reminders_trigger_date",
+        "routing_reminders",
+        ["trigger_date"],
+    )
@@ -0,0 +1,186 @@
+"""
+Benchmark extract_deadlines_from_text against the implementation it
+replaced (kept inline below as old_extract_deadlines_from_text).
+
+Run from backend/:
+    python scripts/bench_deadline_extraction.py
+    python scripts/bench_deadline_extraction.py --repeat 10 --seed 7
+
+For each synthetic corpus it prints the best-of-N time of both versions
+and whether they extract the same dates (labels are not compared: the
+old version gave every date the same document-wide label).
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ai_routing.models import DeadlineLabel  # noqa: E402
+from app.ai_routing.services import extract_deadlines_from_text  # noqa: E402
+
+
+# =====================================================
+# PREVIOUS IMPLEMENTATION (verbatim)
+# =====================================================
+def old_extract_deadlines_from_text(text: str) -> List[dict]:
+    results: List[dict] = []
+
+    if not text:
+        return results
+
+    text_lower = text.lower()
+
+    patterns = [
+        (r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b", ["%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y"]),
+        (r"\b(\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})\b", ["%d %b %Y", "%d %B %Y"]),
+        (r"\b([A-Za-z]{3,9}\s+\d{1,2},\s*\d{4})\b", ["%b %d, %Y", "%B %d, %Y"]),
+    ]
+
+    for pattern, formats in patterns:
+        for match in re.findall(pattern, text):
+            for fmt in formats:
+                try:
+                    parsed = datetime.strptime(
+                        match.replace("-", "/"), fmt
+                    ).date()
+
+                    label = DeadlineLabel.DUE
+
+                    if "submit" in text_lower or "submission" in text_lower:
+                        label = DeadlineLabel.SUBMISSION
+                    elif "expire" in text_lower or "expiry" in text_lower:
+                        label = DeadlineLabel.EXPIRY
+                    elif "renew" in text_lower:
+                        label = DeadlineLabel.RENEWAL
+                    elif "hearing" in text_lower:
+                        label = DeadlineLabel.HEARING
+
+                    results.append({
+                        "deadline_date": parsed,
+                        "label": label,
+                        "confidence": 0.9 if "%Y" in fmt else 0.7,
+                    })
+                    break
+
+                except ValueError:
+                    continue
+
+    return results
+
+
+# =====================================================
+# CORPORA
+# =====================================================
+WORDS = (
+    "the of and to in a is that for it as was with be by on not he this are "
+    "or his from at which but have an they you were her all she there would "
+    "their we him been has when who will more no if out so said what up its "
+    "about into than them can only other new some could time these two may"
+).split()
+
+KEYWORDS = ["submit by", "expires on", "renewal due", "hearing on", "due date"]
+
+# (short, full) per month; no "Sept": the old parser rejected it, which
+# would skew the parity check
+MONTH_NAMES = [
+    ("Jan", "January"), ("Feb", "February"), ("Mar", "March"),
+    ("Apr", "April"), ("May", "May"), ("Jun", "June"),
+    ("Jul", "July"), ("Aug", "August"), ("Sep", "September"),
+    ("Oct", "October"), ("Nov", "November"), ("Dec", "December"),
+]
+
+
+def _random_date(rng: random.Random) -> str:
+    day = rng.randint(1, 28)
+    month = rng.randint(1, 12)
+    year = rng.randint(2020, 2035)
+    style = rng.randrange(4)
+
+    if style == 0:
+        return f"{day:02d}/{month:02d}/{year}"
+    if style == 1:
+        return f"{day}-{month}-{year}"
+
+    name = rng.choice(MONTH_NAMES[month - 1])
+    if style == 2:
+        return f"{day} {name} {year}"
+    return f"{name} {day}, {year}"
+
+
+def prose_corpus(rng: random.Random, size: int = 1_200_000, dates: int = 20) -> str:
+    words: List[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+
+    for _ in range(dates):
+        words.insert(rng.randrange(len(words)), _random_date(rng))
+
+    return " ".join(words)
+
+
+def dated_corpus(rng: random.Random, dates: int = 20_000) -> str:
+    lines = []
+    for _ in range(dates):
+        filler = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+        lines.append(f"{filler} {rng.choice(KEYWORDS)} {_random_date(rng)}.")
+    return "\n".join(lines)
+
+
+# =====================================================
+# RUN
+# =====================================================
+def best_time(fn: Callable[[str], list], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def dates_of(results: List[dict]) -> Counter:
+    return Counter(r["deadline_date"] for r in results)
+
+
+def main(argv=None) -> Dict[str, dict]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    corpora = {
+        "~1.2 MB prose, few dates": prose_corpus(rng),
+        "20k dates with keywords": dated_corpus(rng),
+    }
+
+    report = {}
+    for name, text in corpora.items():
+        old = best_time(old_extract_deadlines_from_text, text, args.repeat)
+        new = best_time(extract_deadlines_from_text, text, args.repeat)
+        same = dates_of(old_extract_deadlines_from_text(text)) == dates_of(
+            extract_deadlines_from_text(text)
+        )
+
+        report[name] = {"old": old, "new": new, "same_dates": same}
+        print(
+            f"{name:<28} old {old:.3f}s  new {new:.3f}s  "
+            f"({old / new:.2f}x)  same dates: {same}"
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
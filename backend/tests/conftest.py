@@ -0,0 +1,93 @@
+"""
+Database tests run against a real Postgres (the models use partitioned
+tables, tsvector columns and SKIP LOCKED): set TEST_DATABASE_URL to a
+database the tests may create a throwaway schema in. Without it those
+tests are skipped.
+"""
+
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import List
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+# keep render-cache files out of the working tree
+os.environ.setdefault("RENDER_CACHE_DIR", tempfile.mkdtemp(prefix="render-cache-"))
+
+from app.database import Base  # noqa: E402
+
+# every model module, so create_all() sees the whole schema
+from app.auth import models as auth_models  # noqa: F401
+from app.document import D_models  # noqa: F401
+from app.ai_routing import models as ai_routing_models  # noqa: F401
+from app.qr_tracking import models as qr_models  # noqa: F401
+from app.doccode import models as doccode_models  # noqa: F401
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+
+    admin = create_engine(TEST_DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={schema}"},
+    )
+    Base.metadata.create_all(engine)
+
+    yield engine
+
+    engine.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """A session whose work (commits included) is rolled back afterwards."""
+    conn = engine.connect()
+    outer = conn.begin()
+    session = Session(bind=conn, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    session.close()
+    outer.rollback()
+    conn.close()
+
+
+@pytest.fixture
+def count_queries(engine):
+    """
+    with count_queries() as statements:
+        ...
+    collects every SQL statement sent while the block runs.
+    """
+
+    @contextmanager
+    def counter():
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
@@ -0,0 +1,69 @@
+import base64
+import os
+from email.message import EmailMessage
+
+from app.attachment_cache import AttachmentCache, attach_cached
+
+
+def write(path, data: bytes) -> str:
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_second_read_is_a_hit_until_the_file_changes(tmp_path):
+    cache = AttachmentCache(max_bytes=10_000, max_item_bytes=10_000)
+    path = write(tmp_path / "a.pdf", b"first")
+
+    cache.encoded(path, cache.key_for(path))
+    cache.encoded(path, cache.key_for(path))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    write(tmp_path / "a.pdf", b"second version")
+    body = cache.encoded(path, cache.key_for(path))
+
+    assert base64.b64decode(body) == b"second version"
+    assert cache.misses == 2
+
+
+def test_large_files_are_encoded_but_not_cached(tmp_path):
+    cache = AttachmentCache(max_bytes=10_000, max_item_bytes=8)
+    path = write(tmp_path / "big.pdf", b"x" * 100)
+
+    body = cache.encoded(path, cache.key_for(path))
+
+    assert base64.b64decode(body) == b"x" * 100
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted_first(tmp_path):
+    paths = [write(tmp_path / f"{n}.pdf", b"y" * 30) for n in "abc"]
+    # room for two encoded bodies
+    cache = AttachmentCache(max_bytes=100, max_item_bytes=100)
+
+    a, b, c = (cache.key_for(p) for p in paths)
+    cache.encoded(paths[0], a)
+    cache.encoded(paths[1], b)
+    cache.encoded(paths[0], a)  # a is now the most recent
+    cache.encoded(paths[2], c)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= 100
+
+    cache.encoded(paths[0], a)
+    assert cache.hits == 2  # a survived, b was evicted
+
+
+def test_attach_cached_adds_a_decodable_part(tmp_path):
+    cache = AttachmentCache(max_bytes=10_000, max_item_bytes=10_000)
+    path = write(tmp_path / "report.pdf", b"%PDF-1.4 data")
+    msg = EmailMessage()
+    msg.set_content("see attached")
+
+    assert attach_cached(msg, cache, path, subtype="pdf")
+    assert not attach_cached(msg, cache, os.path.join(tmp_path, "missing.pdf"))
+
+    (part,) = list(msg.iter_attachments())
+    assert msg.get_content_type() == "multipart/mixed"
+    assert part.get_filename() == "report.pdf"
+    assert part.get_content_type() == "application/pdf"
+    assert part.get_payload(decode=True) == b"%PDF-1.4 data"
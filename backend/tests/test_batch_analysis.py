@@ -0,0 +1,163 @@
+from datetime import date, datetime, timezone
+
+import docx
+
+from app.auth.models import User
+from app.ai_routing.batch_analysis import reanalyze_routings, select_routings
+from app.ai_routing.models import (
+    AIDecisionFlag,
+    DeadlineLabel,
+    DocumentRouting,
+    ReminderChannel,
+    ReminderDirection,
+    ReminderHistory,
+    ReminderStatus,
+    ReminderUnit,
+    RoutingDeadline,
+    RoutingReminder,
+    RoutingSource,
+)
+from app.ai_routing.routes import analyze_with_ai
+from app.ai_routing.schemas import AIAnalyzeRequest
+
+
+def write_notice(tmp_path, text="The last date for submission is 25 December 2030."):
+    path = tmp_path / "notice.docx"
+    document = docx.Document()
+    document.add_paragraph(text)
+    document.save(path)
+    return path
+
+
+def add_routing(db, tmp_path, created_at=None) -> DocumentRouting:
+    path = write_notice(tmp_path)
+
+    owner = User(full_name="Owner", email="owner@example.com", password_hash="x")
+    routing = DocumentRouting(
+        routing_id="ROUTE-BATCH",
+        user=owner,
+        document_name="notice.docx",
+        file_type="docx",
+        ai_file_path=str(path),
+        source_type=RoutingSource.AI,
+        ai_flag=AIDecisionFlag.DATE_MISSING,
+        created_at=created_at or datetime.now(timezone.utc),
+    )
+    db.add(routing)
+    db.flush()
+    return routing
+
+
+def test_rerun_replaces_ai_deadlines_and_keeps_human_ones(db, tmp_path):
+    routing = add_routing(db, tmp_path)
+    db.add(RoutingDeadline(
+        routing_id=routing.id,
+        source=RoutingSource.HUMAN,
+        label=DeadlineLabel.DUE,
+        deadline_date=date(2030, 12, 1),
+        ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+    ))
+    db.flush()
+
+    for _ in range(3):
+        summary = reanalyze_routings(db, [routing.id], workers=1)
+        assert summary["analyzed"] == 1
+
+    deadlines = db.query(RoutingDeadline).filter_by(routing_id=routing.id).all()
+    by_source = sorted((d.source, d.deadline_date) for d in deadlines)
+
+    assert by_source == [
+        (RoutingSource.AI, date(2030, 12, 25)),
+        (RoutingSource.HUMAN, date(2030, 12, 1)),
+    ]
+
+
+def test_created_to_includes_the_whole_day(db, tmp_path):
+    routing = add_routing(
+        db,
+        tmp_path,
+        created_at=datetime(2026, 10, 18, 15, 30, tzinfo=timezone.utc),
+    )
+
+    assert select_routings(db, created_to=date(2026, 10, 18)) == [routing.id]
+    assert select_routings(db, created_from=date(2026, 10, 18)) == [routing.id]
+    assert select_routings(db, created_to=date(2026, 10, 17)) == []
+
+
+def add_reminder(db, routing, deadline_date) -> RoutingReminder:
+    deadline = RoutingDeadline(
+        routing_id=routing.id,
+        source=RoutingSource.AI,
+        label=DeadlineLabel.SUBMISSION,
+        deadline_date=deadline_date,
+        ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+    )
+    reminder = RoutingReminder(
+        routing_id=routing.id,
+        deadline=deadline,
+        trigger_value=2,
+        trigger_unit=ReminderUnit.DAY,
+        direction=ReminderDirection.BEFORE,
+        active=True,
+    )
+    db.add(ReminderHistory(
+        reminder=reminder,
+        routing_id=routing.id,
+        submitted_on=deadline_date,
+        trigger_date=deadline_date,
+        status=ReminderStatus.PENDING,
+        channel=ReminderChannel.EMAIL,
+    ))
+    db.flush()
+    return reminder
+
+
+def ai_deadlines(db, routing):
+    return db.query(RoutingDeadline).filter_by(
+        routing_id=routing.id, source=RoutingSource.AI
+    ).all()
+
+
+def test_rerun_keeps_reminders_and_moves_them_to_the_new_date(db, tmp_path):
+    routing = add_routing(db, tmp_path)
+    reminder = add_reminder(db, routing, date(2030, 12, 20))
+    reminder_id = reminder.id
+
+    reanalyze_routings(db, [routing.id], workers=1)
+    analyze_with_ai(
+        AIAnalyzeRequest(routing_id=routing.routing_id),
+        db=db,
+        user=routing.user,
+    )
+    db.expire_all()
+
+    (deadline,) = ai_deadlines(db, routing)
+    assert deadline.deadline_date == date(2030, 12, 25)
+
+    reminder = db.get(RoutingReminder, reminder_id)
+    assert reminder.deadline_id == deadline.id
+
+    (history,) = reminder.history
+    assert history.status == ReminderStatus.PENDING
+    assert history.submitted_on == date(2030, 12, 25)
+    assert history.trigger_date == date(2030, 12, 23)
+
+
+def test_no_date_found_keeps_deadlines_that_have_reminders(db, tmp_path):
+    routing = add_routing(db, tmp_path)
+    reminder = add_reminder(db, routing, date(2030, 12, 20))
+    db.add(RoutingDeadline(
+        routing_id=routing.id,
+        source=RoutingSource.AI,
+        label=DeadlineLabel.DUE,
+        deadline_date=date(2030, 11, 1),
+        ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+    ))
+    db.flush()
+
+    write_notice(tmp_path, "No dates in this one.")
+    reanalyze_routings(db, [routing.id], workers=1)
+    db.expire_all()
+
+    assert [d.id for d in ai_deadlines(db, routing)] == [reminder.deadline_id]
+    assert db.get(RoutingReminder, reminder.id) is not None
@@ -0,0 +1,41 @@
+import pytest
+
+from app.auth.models import User
+from app.document.D_models import Document
+from app.document.document_routes import list_documents
+
+
+def add_documents(db, count: int) -> User:
+    owner = User(
+        full_name="Owner",
+        email=f"owner-{count}@example.com",
+        password_hash="x",
+    )
+    db.add(owner)
+    db.flush()
+
+    for i in range(count):
+        db.add(Document(
+            tracking_id=f"T{count}-{i}",
+            file_name=f"doc-{i}",
+            file_type="txt",
+            stored_file_name=f"doc-{i}.txt",
+            content="",
+            owner_id=owner.id,
+            shared_open_count=i,
+        ))
+
+    db.flush()
+    return owner
+
+
+@pytest.mark.parametrize("documents", [1, 50])
+def test_list_documents_is_one_query(db, count_queries, documents):
+    owner = add_documents(db, documents)
+
+    with count_queries() as statements:
+        listed = list_documents(db=db, current_user=owner)
+
+    assert len(statements) == 1
+    assert len(listed) == documents
+    assert sorted(d["total_opens"] for d in listed) == list(range(documents))
@@ -0,0 +1,135 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from app.ai_routing import email_dispatcher
+from app.ai_routing.email_dispatcher import deliver, dispatch_emails
+from app.ai_routing.models import EmailOutbox, OutboxStatus
+from app.ai_routing.outbox import apply_delivery_results, claim_batch, enqueue_email
+
+TODAY = date(2026, 10, 18)
+
+
+def result(job, success, deferred=False, transient=None):
+    attempts = [] if deferred else [{
+        "attempt": 1,
+        "success": success,
+        "transient": None if success else transient,
+        "error": None if success else "boom",
+        "duration_ms": 5,
+        "attempted_at": datetime.now(timezone.utc),
+    }]
+    return {
+        "key": job["key"],
+        "claim": job["claim"],
+        "success": success,
+        "deferred": deferred,
+        "attempts": attempts,
+    }
+
+
+def queued_row(db) -> EmailOutbox:
+    row = enqueue_email(db, to="a@example.com", subject="s", text_body="t")
+    db.commit()
+    return row
+
+
+def expire_lease(db, row):
+    row.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+
+
+def test_expired_lease_is_reclaimed_with_a_new_token(db):
+    row = queued_row(db)
+
+    (first,) = claim_batch(db)
+    assert claim_batch(db) == []  # leased
+
+    expire_lease(db, row)
+    (second,) = claim_batch(db)
+
+    assert second["key"] == first["key"]
+    assert second["claim"] == first["claim"] + 1
+
+
+def test_stale_result_cannot_overwrite_the_new_owner(db):
+    row = queued_row(db)
+    (first,) = claim_batch(db)
+    expire_lease(db, row)
+    (second,) = claim_batch(db)
+
+    # the first worker finishes late with a permanent failure
+    apply_delivery_results(db, [result(first, False, transient=False)], TODAY)
+    db.commit()
+    db.refresh(row)
+    assert row.status == OutboxStatus.SENDING
+
+    apply_delivery_results(db, [result(second, True)], TODAY)
+    db.commit()
+    db.refresh(row)
+    assert row.status == OutboxStatus.SENT
+
+    apply_delivery_results(db, [result(first, False, transient=False)], TODAY)
+    db.commit()
+    db.refresh(row)
+    assert row.status == OutboxStatus.SENT
+
+
+def test_deferred_job_goes_back_to_pending(db):
+    row = queued_row(db)
+    (job,) = claim_batch(db)
+
+    apply_delivery_results(db, [result(job, False, deferred=True)], TODAY)
+    db.commit()
+    db.refresh(row)
+
+    assert row.status == OutboxStatus.PENDING
+    assert row.locked_until is None
+    assert [j["key"] for j in claim_batch(db)] == [row.id]
+
+
+# =====================================================
+# SEND BUDGET (NO DATABASE)
+# =====================================================
+def job(key):
+    return {
+        "key": key,
+        "claim": 1,
+        "to": "a@example.com",
+        "subject": "s",
+        "text_body": "t",
+        "html_body": None,
+        "attachment_path": None,
+        "attachment_paths": [],
+    }
+
+
+def test_no_attempt_starts_after_the_deadline():
+    sent = []
+
+    results = dispatch_emails(
+        [job(1), job(2)],
+        send=lambda **kw: sent.append(kw),
+        deadline=time.monotonic() - 1,
+    )
+
+    assert sent == []
+    assert all(r["deferred"] and not r["attempts"] for r in results)
+
+
+def test_retry_is_deferred_when_backoff_would_cross_the_deadline(monkeypatch):
+    monkeypatch.setattr(email_dispatcher, "backoff_delay", lambda attempt: 10.0)
+
+    def send(**kw):
+        raise TimeoutError("slow server")
+
+    outcome = deliver(
+        job(1),
+        send=send,
+        max_attempts=4,
+        sleep=lambda s: None,
+        deadline=time.monotonic() + 5,
+    )
+
+    assert outcome["deferred"]
+    assert not outcome["success"]
+    assert len(outcome["attempts"]) == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from app.ai_routing.keyword_automaton import KeywordAutomaton
+from app.ai_routing.models import DocumentCategory
+from app.ai_routing.services import CATEGORY_KEYWORDS, classify_document
+
+
+def old_classify_document(text: str) -> DocumentCategory:
+    # the substring scorer KeywordAutomaton replaced (precedence order)
+    if not text:
+        return DocumentCategory.OTHER
+
+    text_lower = text.lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(k in text_lower for k in keywords):
+            return category
+
+    return DocumentCategory.OTHER
+
+
+@pytest.mark.parametrize("text", [
+    "Both agreements are attached for signature.",
+    "The contracts were renewed last year.",
+    "The parties hereby agree to the following.",
+    "Please read the Terms and Conditions carefully.",
+    "The court heard the plaintiffs on Monday.",
+    "Defendants were represented by counsel.",
+    "Sections 4 and 5 of the Companies Acts apply.",
+    "Local laws govern this matter.",
+    "The report was submitted on time.",
+    "Submissions close on 12 March.",
+    "She applied online; applications are under review.",
+    "Filing fees are payable in advance.",
+    "Invoices must be paid within 30 days.",
+    "The amount due is shown below.",
+    "All taxes are included.",
+    "Updated policies and guidelines are enclosed.",
+    "The procedures follow the compliance framework.",
+    "Notices were served to all tenants.",
+    "You are hereby informed of the change.",
+    "Quarterly review meeting at 4 pm.",
+    "",
+])
+def test_matches_old_scorer_on_inflected_forms(text):
+    assert classify_document(text) == old_classify_document(text)
+
+
+def test_keyword_inside_another_word_does_not_match():
+    # the old scorer found "act" in "contract" and "action"
+    automaton = KeywordAutomaton({"legal": ["act"], "agreement": ["contract"]})
+
+    assert automaton.count("contract action") == {"legal": 0, "agreement": 1}
+
+
+def test_counts_every_occurrence():
+    automaton = KeywordAutomaton({"invoice": ["invoice", "amount due"]})
+
+    text = "Invoice 12: amount  due 500. Invoices 13 and 14 follow."
+    assert automaton.count(text) == {"invoice": 3}
@@ -0,0 +1,68 @@
+import io
+
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import A4
+
+from app.document.pdf_stream import (
+    PDF_LEADING,
+    PDF_MARGIN,
+    _font,
+    _text_width,
+    _wrap,
+    stream_pdf,
+)
+
+
+def render(lines):
+    chunks = list(stream_pdf(lines))
+    return PdfReader(io.BytesIO(b"".join(chunks))), chunks
+
+
+def font_metrics():
+    ttf = _font()[0]
+    return ttf.charWidths, ttf.defaultWidth or 0
+
+
+def test_empty_document_is_one_blank_page():
+    reader, _ = render([])
+    assert len(reader.pages) == 1
+
+
+def test_pages_are_emitted_one_chunk_each():
+    # rows_per_page for A4 at the module's margins and leading
+    rows_per_page = int((A4[1] - 2 * PDF_MARGIN) // PDF_LEADING)
+    lines = [f"line {i}" for i in range(rows_per_page * 2 + 1)]
+
+    reader, chunks = render(lines)
+
+    assert len(reader.pages) == 3
+    # header, one chunk per page, trailer
+    assert len(chunks) == 1 + 3 + 1
+    assert "line 0" in reader.pages[0].extract_text()
+    assert f"line {rows_per_page * 2}" in reader.pages[2].extract_text()
+
+
+def test_text_round_trips_through_to_unicode():
+    reader, _ = render(["Invoice due 2026-10-19", "देय तिथि"])
+    text = reader.pages[0].extract_text()
+
+    assert "Invoice due 2026-10-19" in text
+    assert "देय" in text
+
+
+def test_wrap_keeps_rows_within_the_width():
+    widths, default = font_metrics()
+    max_width = 100.0
+    line = "alpha beta gamma delta " + "x" * 60
+
+    rows = _wrap(line, max_width, widths, default)
+
+    assert len(rows) > 1
+    assert all(_text_width(row, widths, default) <= max_width for row in rows)
+    # nothing lost: words only split at spaces or inside an overlong word
+    assert "".join(rows).replace(" ", "") == line.replace(" ", "")
+
+
+def test_wrap_leaves_short_lines_alone():
+    widths, default = font_metrics()
+    assert _wrap("short\t", 500.0, widths, default) == ["short"]
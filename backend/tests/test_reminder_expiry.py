@@ -0,0 +1,109 @@
+from datetime import date, datetime, timedelta
+
+from app.auth.models import User
+from app.ai_routing.models import (
+    AIDecisionFlag,
+    DeadlineLabel,
+    DocumentRouting,
+    ReminderChannel,
+    ReminderHistory,
+    ReminderSkipReason,
+    ReminderStatus,
+    ReminderUnit,
+    RoutingDeadline,
+    RoutingReminder,
+    RoutingSource,
+)
+from app.ai_routing.reminder_worker import (
+    REMINDER_CATCHUP_DAYS,
+    TIMEZONE,
+    expire_missed_reminders,
+    load_due_reminders,
+)
+from app.analytics import queries
+from app.analytics.services import get_system_health
+
+TODAY = date(2026, 10, 18)
+
+
+def add_pending(db, trigger_date: date) -> ReminderHistory:
+    routing = DocumentRouting(
+        routing_id=f"RT-EXP-{trigger_date}",
+        user=User(
+            full_name="Owner",
+            email=f"owner-{trigger_date}@example.com",
+            password_hash="x",
+        ),
+        document_name="Document",
+        file_type="pdf",
+        source_type=RoutingSource.HUMAN,
+        ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+    )
+    deadline = RoutingDeadline(
+        routing=routing,
+        source=RoutingSource.HUMAN,
+        label=DeadlineLabel.DUE,
+        deadline_date=trigger_date + timedelta(days=3),
+        ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+    )
+    history = ReminderHistory(
+        reminder=RoutingReminder(
+            routing=routing,
+            deadline=deadline,
+            trigger_unit=ReminderUnit.DAY,
+            active=True,
+        ),
+        routing=routing,
+        submitted_on=deadline.deadline_date,
+        trigger_date=trigger_date,
+        status=ReminderStatus.PENDING,
+        channel=ReminderChannel.EMAIL,
+    )
+    db.add(history)
+    db.flush()
+    return history
+
+
+def test_rows_outside_the_catch_up_window_are_skipped_as_expired(db):
+    window_start = TODAY - timedelta(days=REMINDER_CATCHUP_DAYS)
+    expired = add_pending(db, window_start - timedelta(days=1))
+    oldest_due = add_pending(db, window_start)
+
+    assert queries.overdue_pending_reminders(db, TODAY) == 2
+
+    assert expire_missed_reminders(db, TODAY) == 1
+    db.expire_all()
+
+    assert expired.status == ReminderStatus.SKIPPED
+    assert expired.skip_reason == ReminderSkipReason.EXPIRED
+    # the edge of the window is still delivered
+    assert oldest_due.status == ReminderStatus.PENDING
+    assert oldest_due.skip_reason is None
+    due, _ = load_due_reminders(db, TODAY)
+    assert [h.id for h in due] == [oldest_due.id]
+
+    # idempotent: nothing PENDING is left outside the window
+    assert expire_missed_reminders(db, TODAY) == 0
+    assert queries.overdue_pending_reminders(db, TODAY) == 1
+    assert queries.expired_reminders(db) == 1
+
+
+def test_system_health_reports_expired_and_overdue_reminders(db):
+    # the health check reads the real clock
+    today = datetime.now(TIMEZONE).date()
+    add_pending(db, today - timedelta(days=REMINDER_CATCHUP_DAYS + 5))
+
+    def scheduler_health():
+        services = get_system_health(db)["services"]
+        return next(s for s in services if s["service"] == "Scheduler")
+
+    # PENDING outside the window means the sweep has not run
+    scheduler = scheduler_health()
+    assert scheduler["status"] == "FAIL"
+    assert scheduler["detail"].startswith("1 overdue pending, 0 expired")
+
+    expire_missed_reminders(db, today)
+
+    scheduler = scheduler_health()
+    assert scheduler["status"] == "OK"
+    assert scheduler["detail"].startswith("0 overdue pending, 1 expired")
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.auth.models import User
+from app.ai_routing.models import (
+    AIDecisionFlag,
+    DeadlineLabel,
+    DocumentRouting,
+    ReminderChannel,
+    ReminderHistory,
+    ReminderStatus,
+    ReminderUnit,
+    RoutingDeadline,
+    RoutingEmailRecipient,
+    RoutingReminder,
+    RoutingSource,
+)
+from app.ai_routing.reminder_worker import load_due_reminders, process_reminder_batch
+
+TODAY = date(2026, 10, 18)
+
+
+def add_due_reminders(db, count: int):
+    # a separate owner per routing: owner lookups must batch too
+    for i in range(count):
+        owner = User(
+            full_name=f"Owner {i}",
+            email=f"owner{i}-{count}@example.com",
+            password_hash="x",
+        )
+        routing = DocumentRouting(
+            routing_id=f"RT-{count}-{i}",
+            user=owner,
+            document_name=f"Document {i}",
+            file_type="pdf",
+            source_type=RoutingSource.HUMAN,
+            ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+            email_recipients=[
+                RoutingEmailRecipient(email=f"cc{i}a@example.com"),
+                RoutingEmailRecipient(email=f"cc{i}b@example.com"),
+            ],
+        )
+        deadline = RoutingDeadline(
+            routing=routing,
+            source=RoutingSource.HUMAN,
+            label=DeadlineLabel.DUE,
+            deadline_date=TODAY + timedelta(days=3),
+            ai_flag=AIDecisionFlag.DEADLINE_FOUND,
+        )
+        reminder = RoutingReminder(
+            routing=routing,
+            deadline=deadline,
+            trigger_unit=ReminderUnit.DAY,
+            active=True,
+        )
+        db.add(ReminderHistory(
+            reminder=reminder,
+            routing=routing,
+            submitted_on=TODAY + timedelta(days=3),
+            trigger_date=TODAY,
+            status=ReminderStatus.PENDING,
+            channel=ReminderChannel.EMAIL,
+        ))
+
+    db.flush()
+    # nothing already in the identity map may hide a lazy load
+    db.expire_all()
+
+
+def tick_statements(db, count_queries, reminders: int):
+    add_due_reminders(db, reminders)
+
+    with count_queries() as statements:
+        due, owner_emails = load_due_reminders(db, TODAY)
+        queued = process_reminder_batch(db, due, owner_emails, TODAY)
+
+    assert len(due) == reminders
+    assert queued == reminders
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.parametrize("reminders", [25, 100])
+def test_tick_select_count_does_not_grow_with_reminders(db, count_queries, reminders):
+    # the first tick leaves its row QUEUED, so the second loads only its own
+    baseline = tick_statements(db, count_queries, 1)
+
+    assert len(tick_statements(db, count_queries, reminders)) == len(baseline)
+
+
+def test_load_due_reminders_is_three_queries(db, count_queries):
+    add_due_reminders(db, 10)
+
+    with count_queries() as statements:
+        due, owner_emails = load_due_reminders(db, TODAY)
+        # touch everything the batch reads
+        for history in due:
+            history.reminder.deadline.deadline_date
+            [c.email for c in history.reminder.routing.email_recipients]
+
+    assert len(due) == 10
+    assert len(owner_emails) == 10
+    assert len(statements) == 3
@@ -0,0 +1,40 @@
+import os
+
+from app.document.render_cache import RENDERER_VERSIONS, RenderCache, render_key
+
+
+def write_pdf(out: str):
+    with open(out, "wb") as f:
+        f.write(b"%PDF")
+
+
+def test_directory_is_created_on_first_write(tmp_path):
+    directory = tmp_path / "renders"
+    cache = RenderCache(str(directory), max_bytes=1024)
+
+    assert not directory.exists()
+    assert cache.lookup(render_key(1, 1, "pdf")) is None
+    assert cache.stats()["files"] == 0
+
+    cache.get_or_render(render_key(1, 1, "pdf"), write_pdf)
+    assert cache.stats()["files"] == 1
+
+
+def test_new_renderer_version_misses_old_files(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path), max_bytes=1024)
+    renders = []
+
+    def render(out):
+        renders.append(out)
+        write_pdf(out)
+
+    old = cache.get_or_render(render_key(7, 3, "pdf"), render)
+    assert cache.get_or_render(render_key(7, 3, "pdf"), render) == old
+    assert len(renders) == 1
+
+    monkeypatch.setitem(RENDERER_VERSIONS, "pdf", RENDERER_VERSIONS["pdf"] + 1)
+    new = cache.get_or_render(render_key(7, 3, "pdf"), render)
+
+    assert new != old
+    assert len(renders) == 2
+    assert os.path.basename(new) == f"7-v3-r{RENDERER_VERSIONS['pdf']}.pdf"
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+from app.ai_routing.models import EmailOutbox, OutboxStatus, SchedulerTick
+from app.ai_routing.scheduler_metrics import SchedulerMetrics, TickTimer
+from app.analytics.services import get_scheduler_metrics, get_system_health
+
+
+def add_tick(db, minutes_ago: int, error=None, pid=4242):
+    db.add(SchedulerTick(
+        started_at=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        duration_ms=1500,
+        pid=pid,
+        scanned=10,
+        queued=8,
+        error=error,
+    ))
+    db.flush()
+
+
+def scheduler_status(db) -> str:
+    services = get_system_health(db)["services"]
+    return next(s["status"] for s in services if s["service"] == "Scheduler")
+
+
+def test_cluster_metrics_come_from_every_process_ticks(db):
+    # two leaders in turn, neither of them this process
+    add_tick(db, 90, pid=1)
+    add_tick(db, 30, error="OperationalError: gone", pid=2)
+    # outside the window: only "last successful" may see it
+    add_tick(db, 60 * 48, pid=1)
+    db.add(EmailOutbox(
+        recipient="a@example.com",
+        subject="s",
+        text_body="b",
+        status=OutboxStatus.SENT,
+        sent_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+    ))
+    db.flush()
+
+    cluster = get_scheduler_metrics(db)["cluster"]
+
+    assert cluster["ticks_total"] == 2
+    assert cluster["ticks_failed"] == 1
+    assert cluster["last_tick_pid"] == 2
+    assert cluster["last_tick_error"] == "OperationalError: gone"
+    assert cluster["last_tick_duration_seconds"] == 1.5
+    assert cluster["last_successful_tick_at"] < cluster["last_tick_at"]
+    assert cluster["reminders_scanned_total"] == 20
+    assert cluster["reminders_skipped_total"] == 4
+    assert cluster["emails_sent_total"] == 1
+
+
+def test_health_sees_a_failed_tick_from_another_process(db):
+    add_tick(db, 30, error="OperationalError: gone", pid=2)
+    assert scheduler_status(db) == "FAIL"
+
+    # the retry succeeded
+    add_tick(db, 25, pid=2)
+    assert scheduler_status(db) == "OK"
+
+
+def test_tick_timer_keeps_the_exception_for_persisting():
+    metrics = SchedulerMetrics()
+
+    try:
+        with TickTimer(metrics) as tick:
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert tick.error == "RuntimeError: boom"
+    assert tick.started_at is not None
+    assert metrics.last_tick_failed
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+from app.auth.models import OCRHistory, User
+from app.document.D_models import Document, DocumentAccess
+from app.search.services import search
+
+
+def add_user(db, name: str) -> User:
+    user = User(full_name=name, email=f"{name}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def add_document(db, owner: User, name: str, content: str, **fields) -> Document:
+    document = Document(
+        tracking_id=f"T-{name}",
+        file_name=name,
+        file_type="txt",
+        stored_file_name=f"{name}.txt",
+        content=content,
+        owner_id=owner.id,
+        **fields,
+    )
+    db.add(document)
+    db.flush()
+    return document
+
+
+def hit_ids(result, kind: str = "document"):
+    return {hit["id"] for hit in result["results"] if hit["type"] == kind}
+
+
+def test_only_readable_documents_are_found(db):
+    owner = add_user(db, "owner")
+    reader = add_user(db, "reader")
+
+    own = add_document(db, reader, "own", "quarterly invoice for review")
+    shared = add_document(db, owner, "shared", "invoice shared with reader")
+    revoked = add_document(db, owner, "revoked", "invoice no longer shared")
+    deleted = add_document(db, reader, "deleted", "deleted invoice", is_deleted=True)
+    add_document(db, owner, "private", "private invoice")
+
+    db.add_all([
+        DocumentAccess(
+            document_id=shared.id,
+            user_id=reader.id,
+            permission="view",
+            granted_by=owner.id,
+        ),
+        DocumentAccess(
+            document_id=revoked.id,
+            user_id=reader.id,
+            permission="view",
+            granted_by=owner.id,
+            revoked_at=datetime.now(timezone.utc),
+        ),
+    ])
+    # someone else's OCR text is never visible either
+    db.add(OCRHistory(filename="scan", extracted_text="invoice scan", user_id=owner.id))
+    db.flush()
+
+    result = search(db, reader.id, "invoice")
+
+    assert hit_ids(result) == {own.id, shared.id}
+    assert deleted.id not in hit_ids(result)
+    assert hit_ids(result, "ocr") == set()
+
+
+def test_pages_report_has_more_until_the_last(db):
+    owner = add_user(db, "pager")
+    for i in range(5):
+        add_document(db, owner, f"contract-{i}", "contract renewal terms")
+
+    pages = [search(db, owner.id, "contract", page=p, page_size=2) for p in (1, 2, 3)]
+
+    assert [p["has_more"] for p in pages] == [True, True, False]
+    assert [len(p["results"]) for p in pages] == [2, 2, 1]
+    # stable order: no document is on two pages
+    assert len(set().union(*(hit_ids(p) for p in pages))) == 5
+
+
+def test_snippet_escapes_text_and_marks_matches(db):
+    owner = add_user(db, "escaper")
+    # ts_headline drops what its parser reads as tags, but passes a
+    # bare "<", "&" or quote through as-is
+    add_document(
+        db, owner, "page",
+        'payment due if 5 < 7 & "fees" > 2 <script>alert(1)</script>',
+    )
+
+    (hit,) = search(db, owner.id, "payment")["results"]
+    snippet = hit["snippet"]
+
+    assert "<mark>payment</mark>" in snippet
+    assert "5 &lt; 7 &amp; &quot;fees" in snippet
+    # the only markup left is ours
+    unmarked = snippet.replace("<mark>", "").replace("</mark>", "")
+    assert "<" not in unmarked and ">" not in unmarked
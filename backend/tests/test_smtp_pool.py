@@ -0,0 +1,128 @@
+import queue
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from app import smtp_pool
+from app.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTP:
+    """Records what the pool does with each connection."""
+
+    opened = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        self.noop_code = 250
+        self.fail_next = None
+        FakeSMTP.opened.append(self)
+
+    def ehlo(self):
+        pass
+
+    def starttls(self, context=None):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def noop(self):
+        return (self.noop_code, b"")
+
+    def send_message(self, msg):
+        if self.fail_next:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        self.sent.append(msg["Subject"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.opened = []
+    monkeypatch.setattr(smtp_pool.smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def message(subject: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg.set_content("body")
+    return msg
+
+
+def test_connection_is_reused_between_sends(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587)
+
+    pool.send(message("a"))
+    pool.send(message("b"))
+
+    assert len(fake_smtp.opened) == 1
+    assert fake_smtp.opened[0].sent == ["a", "b"]
+
+
+def test_connection_is_retired_after_max_messages(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587, max_messages=2)
+
+    for subject in "abc":
+        pool.send(message(subject))
+
+    first, second = fake_smtp.opened
+    assert first.sent == ["a", "b"] and first.closed
+    assert second.sent == ["c"] and not second.closed
+
+
+def test_dropped_connection_is_retried_once_on_a_new_one(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587)
+    pool.send(message("a"))
+    fake_smtp.opened[0].fail_next = smtplib.SMTPServerDisconnected()
+
+    pool.send(message("b"))
+
+    stale, fresh = fake_smtp.opened
+    assert stale.closed
+    assert fresh.sent == ["b"]
+    assert pool._open == 1
+
+
+def test_idle_connection_failing_noop_is_replaced(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587, healthcheck_after=0)
+    pool.send(message("a"))
+    fake_smtp.opened[0].noop_code = 421
+
+    pool.send(message("b"))
+
+    assert fake_smtp.opened[0].closed
+    assert fake_smtp.opened[1].sent == ["b"]
+
+
+def test_refused_recipients_keep_the_session(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587)
+    pool.send(message("a"))
+    fake_smtp.opened[0].fail_next = smtplib.SMTPRecipientsRefused({})
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(message("b"))
+    pool.send(message("c"))
+
+    assert len(fake_smtp.opened) == 1
+    assert fake_smtp.opened[0].sent == ["a", "c"]
+
+
+def test_exhausted_pool_waits_at_most_acquire_timeout(fake_smtp):
+    pool = SMTPConnectionPool("smtp.example.com", 587, size=1, acquire_timeout=0.01)
+    held = pool._acquire()
+
+    with pytest.raises(queue.Empty):
+        pool._acquire()
+
+    pool._release(held)
+    assert pool._acquire() is held